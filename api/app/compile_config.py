@@ -0,0 +1,24 @@
+"""Compile data/*.yaml into the binary config snapshot used for fast cold starts.
+
+Usage:
+    python -m app.compile_config
+"""
+
+import logging
+import sys
+
+from app.config_loader import compile_config_artifact
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+
+def main() -> int:
+    path = compile_config_artifact()
+    if path is None:
+        return 1
+    print(f"Compiled config snapshot: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
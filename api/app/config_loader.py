@@ -1,10 +1,20 @@
 """Configuration loader for YAML files with caching."""
 
+import asyncio
+import dataclasses
+import hashlib
+import json
 import logging
+import os
+import pickle
+import platform
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+import pydantic
 import yaml
 
 from app.deps import get_settings
@@ -12,8 +22,45 @@ from app.models.domain import AdLimit, AssetSpec, Taxonomies
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache
-_cache: dict[str, tuple[Any, datetime]] = {}
+CONFIG_FILES = ("ad_limits.yaml", "asset_specs.yaml", "taxonomies.yaml")
+
+# Compiled snapshot written next to the YAML files. Changes to the shape of
+# ConfigSnapshot or the domain models invalidate it automatically (see
+# _models_signature); bump the format version for any other format change.
+ARTIFACT_FILE = ".config_snapshot.pickle"
+ARTIFACT_FORMAT_VERSION = 1
+
+DEFAULT_TONE_HINT = "Clear and engaging."
+DEFAULT_AUDIENCE_HINT = "Tailor to their needs and aspirations."
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Validated configuration with lookup indexes, built once per load.
+
+    Snapshots are never mutated; a reload builds a new one and swaps it in.
+    The lists and dicts are shared between requests and must be treated as
+    read-only.
+    """
+
+    ad_limits: list[AdLimit]
+    asset_specs: list[AssetSpec]
+    taxonomies: Taxonomies
+    ad_limits_index: dict[tuple[str, Optional[str]], AdLimit]
+    asset_specs_by_channel: dict[str, list[AssetSpec]]
+    social_channels: frozenset[str]
+    tone_hints: dict[str, str]
+    audience_hints: dict[str, str]
+    subtype_hints: dict[str, str]
+    loaded_at: datetime
+
+
+# Current snapshot (replaced atomically on reload)
+_snapshot: Optional[ConfigSnapshot] = None
+
+# Resolved data directory, looked up once instead of on every load
+_data_path: Optional[Path] = None
 
 
 def _get_data_path() -> Path:
@@ -53,114 +100,374 @@ def _get_data_path() -> Path:
     )
 
 
-def _load_yaml(file_path: str) -> Any:
-    """Load and parse YAML file with caching."""
-    settings = get_settings()
-    cache_key = f"yaml:{file_path}"
-
-    # Check cache
-    if cache_key in _cache:
-        data, cached_at = _cache[cache_key]
-        ttl = timedelta(seconds=settings.config_cache_ttl_seconds)
-        if datetime.now() - cached_at < ttl:
-            logger.debug(f"Cache hit for {file_path}")
-            return data
-        else:
-            logger.debug(f"Cache expired for {file_path}")
-            del _cache[cache_key]
+def _data_dir() -> Path:
+    """Get the data directory, resolving it on first use."""
+    global _data_path
+    if _data_path is None:
+        _data_path = _get_data_path()
+    return _data_path
 
-    # Load from file
-    full_path = _get_data_path() / file_path
-    logger.info(f"Loading YAML from {full_path}")
 
+def _read_config_file(file_path: str) -> bytes:
+    """Read a raw config file from the data directory."""
+    full_path = _data_dir() / file_path
     try:
-        with open(full_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-
-        # Cache it
-        _cache[cache_key] = (data, datetime.now())
-        return data
-
+        return full_path.read_bytes()
     except FileNotFoundError:
         logger.error(f"YAML file not found: {full_path}")
         raise
+
+
+def _parse_yaml(file_path: str, raw: bytes) -> Any:
+    """Parse raw YAML read from `file_path`."""
+    logger.info(f"Parsing YAML from {_data_dir() / file_path}")
+    try:
+        return yaml.safe_load(raw)
     except yaml.YAMLError as e:
-        logger.error(f"Error parsing YAML file {full_path}: {e}")
+        logger.error(f"Error parsing YAML file {_data_dir() / file_path}: {e}")
         raise
 
 
+def build_snapshot(
+    raw_ad_limits: list[dict],
+    raw_asset_specs: list[dict],
+    raw_taxonomies: dict,
+) -> ConfigSnapshot:
+    """Validate raw YAML data and build a snapshot with its lookup indexes."""
+    ad_limits = [AdLimit(**item) for item in raw_ad_limits]
+    asset_specs = [AssetSpec(**item) for item in raw_asset_specs]
+    taxonomies = Taxonomies(**raw_taxonomies)
+
+    # First entry wins for duplicate (channel, subtype) pairs, as with the old linear scan
+    ad_limits_index: dict[tuple[str, Optional[str]], AdLimit] = {}
+    for limit in ad_limits:
+        ad_limits_index.setdefault((limit.channel, limit.subtype), limit)
+
+    asset_specs_by_channel: dict[str, list[AssetSpec]] = {}
+    for spec in asset_specs:
+        asset_specs_by_channel.setdefault(spec.channel.lower(), []).append(spec)
+
+    return ConfigSnapshot(
+        ad_limits=ad_limits,
+        asset_specs=asset_specs,
+        taxonomies=taxonomies,
+        ad_limits_index=ad_limits_index,
+        asset_specs_by_channel=asset_specs_by_channel,
+        social_channels=frozenset(taxonomies.social_channels),
+        tone_hints=dict(taxonomies.tone_hints or {}),
+        audience_hints=dict(taxonomies.audience_hints or {}),
+        subtype_hints=dict(taxonomies.subtype_hints or {}),
+        loaded_at=datetime.now(),
+    )
+
+
+@lru_cache
+def _models_signature() -> str:
+    """Shape of everything pickled in the artifact: each model's JSON schema and the snapshot's fields."""
+    schemas = {model.__name__: model.model_json_schema() for model in (AdLimit, AssetSpec, Taxonomies)}
+    snapshot_fields = [(field.name, str(field.type)) for field in dataclasses.fields(ConfigSnapshot)]
+    return json.dumps({"models": schemas, "snapshot": snapshot_fields}, sort_keys=True, default=str)
+
+
+def _artifact_fingerprint(sources: dict[str, bytes]) -> str:
+    """Checksum of the YAML sources plus everything that affects the pickled format."""
+    digest = hashlib.sha256()
+    digest.update(
+        f"{ARTIFACT_FORMAT_VERSION}|{platform.python_version()}|{pydantic.VERSION}".encode("utf-8")
+    )
+    digest.update(_models_signature().encode("utf-8"))
+    for file_name in CONFIG_FILES:
+        digest.update(file_name.encode("utf-8"))
+        digest.update(hashlib.sha256(sources[file_name]).digest())
+    return digest.hexdigest()
+
+
+def _build_snapshot_from_sources(sources: dict[str, bytes]) -> ConfigSnapshot:
+    """Parse and validate raw YAML sources into a snapshot."""
+    return build_snapshot(
+        _parse_yaml("ad_limits.yaml", sources["ad_limits.yaml"]),
+        _parse_yaml("asset_specs.yaml", sources["asset_specs.yaml"]),
+        _parse_yaml("taxonomies.yaml", sources["taxonomies.yaml"]),
+    )
+
+
+def _load_artifact(fingerprint: str) -> Optional[ConfigSnapshot]:
+    """Load the compiled snapshot if it exists and matches `fingerprint`."""
+    path = _data_dir() / ARTIFACT_FILE
+    try:
+        with open(path, "rb") as f:
+            stored_fingerprint, snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable config artifact {path}: {e}")
+        return None
+
+    if stored_fingerprint != fingerprint or not isinstance(snapshot, ConfigSnapshot):
+        logger.info("Config artifact is stale, falling back to YAML")
+        return None
+
+    logger.info(f"Loaded compiled config artifact from {path}")
+    return dataclasses.replace(snapshot, loaded_at=datetime.now())
+
+
+def _write_artifact(fingerprint: str, snapshot: ConfigSnapshot) -> Optional[Path]:
+    """Write the compiled snapshot next to the YAML files (best effort)."""
+    path = _data_dir() / ARTIFACT_FILE
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((fingerprint, snapshot), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # The artifact only speeds up cold starts; never let it break config loading
+        logger.warning(f"Could not write config artifact {path}: {e}")
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+    logger.info(f"Wrote compiled config artifact to {path}")
+    return path
+
+
+def load_snapshot(use_artifact: Optional[bool] = None, write_artifact: bool = False) -> ConfigSnapshot:
+    """
+    Read all config files and build a new snapshot (does not publish it).
+
+    With the compiled artifact enabled, a pickled snapshot whose checksum
+    matches the current YAML is loaded instead of parsing and validating it.
+    A stale or missing artifact falls back to the YAML; it is only rewritten
+    when `write_artifact` is set (at startup), never from request workers
+    or config reloads.
+    """
+    if use_artifact is None:
+        use_artifact = get_settings().config_artifact_enabled
+
+    sources = {file_name: _read_config_file(file_name) for file_name in CONFIG_FILES}
+    if not use_artifact:
+        return _build_snapshot_from_sources(sources)
+
+    fingerprint = _artifact_fingerprint(sources)
+    snapshot = _load_artifact(fingerprint)
+    if snapshot is None:
+        snapshot = _build_snapshot_from_sources(sources)
+        if write_artifact:
+            _write_artifact(fingerprint, snapshot)
+    return snapshot
+
+
+def compile_config_artifact() -> Optional[Path]:
+    """Compile the data directory into the snapshot artifact (build/startup step)."""
+    sources = {file_name: _read_config_file(file_name) for file_name in CONFIG_FILES}
+    return _write_artifact(_artifact_fingerprint(sources), _build_snapshot_from_sources(sources))
+
+
+def publish_snapshot(snapshot: ConfigSnapshot) -> None:
+    """Make `snapshot` the current configuration."""
+    global _snapshot
+    _snapshot = snapshot
+    logger.info(
+        f"Config snapshot loaded: {len(snapshot.ad_limits)} ad limits, "
+        f"{len(snapshot.asset_specs)} asset specs"
+    )
+
+
+def get_snapshot() -> ConfigSnapshot:
+    """
+    Get the current config snapshot.
+
+    While the config watcher is running the snapshot is kept current in the
+    background and returned as-is. Otherwise it is rebuilt once the cache TTL
+    expires.
+    """
+    snapshot = _snapshot
+
+    if snapshot is not None:
+        if _watcher is not None and _watcher.running:
+            return snapshot
+        ttl = timedelta(seconds=get_settings().config_cache_ttl_seconds)
+        if datetime.now() - snapshot.loaded_at < ttl:
+            return snapshot
+        logger.debug("Config snapshot expired")
+
+    snapshot = load_snapshot()
+    publish_snapshot(snapshot)
+    return snapshot
+
+
 def clear_cache() -> int:
-    """Clear all cached configuration data and return number of entries cleared."""
-    global _cache
-    count = len(_cache)
-    _cache.clear()
+    """Drop the cached config snapshot and return the number of config files it held."""
+    global _snapshot
+    count = len(CONFIG_FILES) if _snapshot is not None else 0
+    _snapshot = None
     logger.info(f"Configuration cache cleared: {count} entries")
     return count
 
 
+FileSignature = tuple[int, int, int]
+
+
+def _file_signatures() -> dict[str, Optional[FileSignature]]:
+    """Get (inode, mtime_ns, size) for each config file, or None if it is missing."""
+    signatures: dict[str, Optional[FileSignature]] = {}
+    for file_name in CONFIG_FILES:
+        try:
+            stat = os.stat(_data_dir() / file_name)
+            signatures[file_name] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signatures[file_name] = None
+    return signatures
+
+
+class ConfigWatcher:
+    """
+    Background task that republishes the config snapshot when YAML files change.
+
+    Polls each file's inode, mtime and size (cheap stat calls, and works with
+    editors and deploy tools that replace files). Changed files are re-parsed
+    in a worker thread, off the request path. If parsing or validation fails,
+    the last good snapshot stays live.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._signatures: dict[str, Optional[FileSignature]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """
+        Load the initial snapshot and start watching for changes.
+
+        A config that fails to load does not stop the app from starting: the
+        error is logged, requests load the config lazily (and fail loudly) and
+        the watcher keeps retrying until a good version is published.
+        """
+        signatures = await asyncio.to_thread(_file_signatures)
+        try:
+            publish_snapshot(await asyncio.to_thread(load_snapshot, write_artifact=True))
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Initial config load failed, will retry on the next change: {e}", exc_info=True)
+        else:
+            self._signatures = signatures
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Watching config files every {self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        """Stop watching."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Config watcher error: {e}", exc_info=True)
+
+    async def check(self) -> bool:
+        """Reload the snapshot if any config file changed. Returns True if reloaded."""
+        signatures = await asyncio.to_thread(_file_signatures)
+        if signatures == self._signatures:
+            return False
+
+        changed = [name for name in CONFIG_FILES if signatures.get(name) != self._signatures.get(name)]
+        logger.info(f"Config files changed: {', '.join(changed)}")
+
+        try:
+            snapshot = await asyncio.to_thread(load_snapshot)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Config reload failed, keeping last good config: {e}")
+            return False
+
+        publish_snapshot(snapshot)
+        # Only now: a failed reload is retried on the next poll
+        self._signatures = signatures
+        self.reloads += 1
+        return True
+
+
+_watcher: Optional[ConfigWatcher] = None
+
+
+async def start_config_watcher() -> Optional[ConfigWatcher]:
+    """Start the config watcher if enabled in settings (called from the app lifespan)."""
+    global _watcher
+    settings = get_settings()
+    if not settings.config_watch_enabled:
+        return None
+
+    _watcher = ConfigWatcher(settings.config_watch_interval_seconds)
+    await _watcher.start()
+    return _watcher
+
+
+async def stop_config_watcher() -> None:
+    """Stop the config watcher on shutdown."""
+    global _watcher
+    if _watcher is not None:
+        await _watcher.stop()
+        _watcher = None
+
+
 def load_ad_limits() -> list[AdLimit]:
-    """Load ad limits from YAML."""
-    raw_data = _load_yaml("ad_limits.yaml")
-    return [AdLimit(**item) for item in raw_data]
+    """Load ad limits from YAML (shared, read-only list)."""
+    return get_snapshot().ad_limits
 
 
 def load_asset_specs() -> list[AssetSpec]:
-    """Load asset specs from YAML."""
-    raw_data = _load_yaml("asset_specs.yaml")
-    return [AssetSpec(**item) for item in raw_data]
+    """Load asset specs from YAML (shared, read-only list)."""
+    return get_snapshot().asset_specs
 
 
 def load_taxonomies() -> Taxonomies:
     """Load taxonomies from YAML."""
-    raw_data = _load_yaml("taxonomies.yaml")
-    return Taxonomies(**raw_data)
+    return get_snapshot().taxonomies
 
 
 def get_ad_limits_for_channel(channel: str, subtype: Optional[str] = None) -> Optional[AdLimit]:
     """Get ad limits for a specific channel and optional subtype."""
-    limits = load_ad_limits()
-
-    # Try exact match first
-    for limit in limits:
-        if limit.channel == channel and limit.subtype == subtype:
-            return limit
-
-    # Fall back to channel without subtype
-    for limit in limits:
-        if limit.channel == channel and limit.subtype is None:
-            return limit
+    index = get_snapshot().ad_limits_index
 
-    return None
+    # Try exact match first, then fall back to channel without subtype
+    return index.get((channel, subtype)) or index.get((channel, None))
 
 
 def get_asset_specs_for_channel(channel: str) -> list[AssetSpec]:
-    """Get asset specs for a specific channel."""
-    specs = load_asset_specs()
-    return [spec for spec in specs if spec.channel == channel]
+    """Get asset specs for a specific channel (case-insensitive, shared read-only list)."""
+    return get_snapshot().asset_specs_by_channel.get(channel.lower(), [])
 
 
 def is_emoji_allowed_for_channel(channel: str) -> bool:
     """Check if emojis are allowed for a channel."""
-    taxonomies = load_taxonomies()
-    return channel in taxonomies.social_channels
+    return channel in get_snapshot().social_channels
 
 
 def get_tone_hint(tone: str) -> str:
     """Get style hint for a tone of voice from taxonomies."""
-    taxonomies = load_taxonomies()
-    hints = taxonomies.tone_hints if hasattr(taxonomies, 'tone_hints') else {}
-    return hints.get(tone, "Clear and engaging.")
+    return get_snapshot().tone_hints.get(tone, DEFAULT_TONE_HINT)
 
 
 def get_audience_hint(audience: str) -> str:
     """Get style hint for target audience from taxonomies."""
-    taxonomies = load_taxonomies()
-    hints = taxonomies.audience_hints if hasattr(taxonomies, 'audience_hints') else {}
-    return hints.get(audience, "Tailor to their needs and aspirations.")
+    return get_snapshot().audience_hints.get(audience, DEFAULT_AUDIENCE_HINT)
 
 
 def get_subtype_hint(subtype: str) -> str:
     """Get contextual hint for subtype/communication type from taxonomies."""
-    taxonomies = load_taxonomies()
-    hints = taxonomies.subtype_hints if hasattr(taxonomies, 'subtype_hints') else {}
-    return hints.get(subtype, "")
+    return get_snapshot().subtype_hints.get(subtype, "")
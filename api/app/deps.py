@@ -1,8 +1,14 @@
 """Dependencies and configuration for FastAPI application."""
 
 from functools import lru_cache
+from typing import TYPE_CHECKING, Literal
+
+from fastapi import Request
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+if TYPE_CHECKING:
+    from app.services.llm_client import LLMClientManager
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -13,6 +19,41 @@ class Settings(BaseSettings):
     model_generation_mini: str = "gpt-4o-mini"
     request_timeout_seconds: int = 20
 
+    # LLM client pool (shared across all OpenAI call sites)
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry_seconds: float = 30.0
+    llm_http2: bool = True
+    llm_max_concurrency_per_model: int = 16
+
+    # LLM rate limits per model; calls beyond the budget queue locally (0 disables)
+    llm_requests_per_minute: int = 500
+    llm_tokens_per_minute: int = 300000
+    llm_mini_requests_per_minute: int = 500  # Applies to model_generation_mini
+    llm_mini_tokens_per_minute: int = 2000000
+    llm_completion_token_estimate: int = 800  # Budgeted per call until real usage is known
+    llm_max_retries: int = 3  # Retries for 429/5xx/connection errors, with jittered backoff
+    llm_backoff_base_seconds: float = 0.5
+    llm_backoff_max_seconds: float = 30.0
+
+    # LLM response cache (generation reads it only with cache="prefer";
+    # USP extraction and landing page analysis prefer it unless cache="bypass")
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_path: str = ""  # SQLite file to persist entries across restarts (empty = memory only)
+    llm_cache_disk_max_entries: int = 10000
+
+    # Circuit breakers for Firecrawl and OpenAI (fail fast while a dependency is degraded)
+    breaker_enabled: bool = True
+    breaker_window_seconds: float = 60.0
+    breaker_min_calls: int = 5
+    breaker_failure_rate: float = 0.5
+    breaker_slow_call_seconds: float = 15.0
+    breaker_slow_call_rate: float = 0.8
+    breaker_open_seconds: float = 30.0
+    breaker_half_open_probes: int = 1
+
     # CORS
     cors_allow_origins: str = "http://localhost:3000"
 
@@ -22,13 +63,60 @@ class Settings(BaseSettings):
     # Scraping
     scrape_timeout_seconds: int = 25
     user_agent: str = "RH-Edu-Ads-Bot/1.0"
+    scrape_hedge_enabled: bool = True
+    scrape_hedge_delay_seconds: float = 5.0  # 0 starts selectolax alongside Firecrawl
+    scrape_cache_enabled: bool = True
+    scrape_cache_max_entries: int = 256
+    scrape_cache_ttl_seconds: int = 600
+    scrape_max_bytes: int = 3_000_000  # Direct fetches stop reading the body at this size
+    scrape_stop_after_main: bool = True  # Stop reading once </main> (or </body>) has arrived
+    # Shared scraping client (connections are pooled across scrapes)
+    scrape_max_connections: int = 50
+    scrape_max_keepalive_connections: int = 20
+    scrape_keepalive_expiry_seconds: float = 30.0
+    scrape_http2: bool = True
+    scrape_dns_cache_ttl_seconds: float = 300.0  # 0 disables the in-process DNS cache
+    scrape_max_concurrency_per_host: int = 4  # Concurrent fetches per site, so one CMS isn't hammered
+    scrape_firecrawl_max_concurrency: int = 16
 
     # Logging
     log_sqlite_url: str = ""
     log_level: str = "INFO"
 
+    # Landing page analysis
+    # "per_category": one LLM call per category; "combined": one call for all categories
+    analysis_engine: Literal["per_category", "combined"] = "per_category"
+    analysis_category_timeout_seconds: float = 20.0
+
+    # Copy generation
+    generation_repair_enabled: bool = True  # Shorten over-limit fields after generation
+    generation_repair_budget_seconds: float = 5.0
+    campaign_max_concurrent_targets: int = 4  # Targets generated at once by /v1/generate-campaign
+
+    # Request deadlines (overridable per request with deadline_ms or X-Request-Deadline-Ms)
+    request_deadline_seconds: float = 45.0
+    request_deadline_max_seconds: float = 120.0  # Also the budget for background jobs
+    deadline_scrape_min_seconds: float = 3.0  # Don't start an optional scrape with less left than this
+    deadline_generation_reserve_seconds: float = 15.0  # Held back from scraping for generation
+    deadline_extra_options_min_seconds: float = 10.0  # Below this, generate a single option
+    deadline_llm_min_seconds: float = 3.0  # Below this, skip optional LLM calls (repair, analysis)
+
+    # Background jobs
+    jobs_workers: int = 4
+    jobs_max_queued: int = 100
+    jobs_result_ttl_seconds: int = 3600
+    jobs_store: Literal["sqlite", "memory"] = "sqlite"
+    jobs_sqlite_path: str = "jobs.sqlite3"
+    jobs_callback_timeout_seconds: float = 10.0
+    # Comma-separated callback hosts (".example.com" matches subdomains); empty allows any public host
+    jobs_callback_allowed_hosts: str = ""
+    jobs_lease_seconds: float = 60.0  # Unfinished jobs not renewed for this long are failed
+
     # Cache
-    config_cache_ttl_seconds: int = 600
+    config_cache_ttl_seconds: int = 600  # Only used when the config watcher is disabled
+    config_watch_enabled: bool = True
+    config_watch_interval_seconds: float = 1.0
+    config_artifact_enabled: bool = True  # Load/write the compiled snapshot in the data directory
 
     # Debug
     debug: bool = False
@@ -40,8 +128,23 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_allow_origins.split(",")]
 
+    @property
+    def jobs_callback_allowed_hosts_list(self) -> list[str]:
+        """Parse callback host allowlist from comma-separated string."""
+        return [host.strip().lower() for host in self.jobs_callback_allowed_hosts.split(",") if host.strip()]
+
 
 @lru_cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
+
+
+def get_llm(request: Request) -> "LLMClientManager":
+    """Get the shared LLM client manager created in the app lifespan."""
+    llm = getattr(request.app.state, "llm", None)
+    if llm is None:
+        from app.services.llm_client import get_llm_manager
+
+        llm = get_llm_manager()
+    return llm
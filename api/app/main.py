@@ -6,8 +6,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.config_loader import start_config_watcher, stop_config_watcher
 from app.deps import get_settings
-from app.routes import generate, shorten, optimize, specs, limits, health, config, analyze_usps, debug
+from app.services.jobs import start_job_manager, stop_job_manager
+from app.services.llm_cache import close_llm_cache
+from app.services.llm_client import close_llm_manager, init_llm_manager
+from app.services.scrape_client import close_scrape_client, init_scrape_client
+from app.routes import generate, shorten, optimize, specs, limits, health, config, analyze_usps, debug, jobs
 
 # Configure logging
 logging.basicConfig(
@@ -24,8 +29,17 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting RH Edu Ads API v{app.version}")
     logger.info(f"Using model: {settings.model_generation}")
     logger.info(f"CORS origins: {settings.cors_origins_list}")
+    app.state.llm = init_llm_manager(settings)
+    init_scrape_client(settings)
+    await start_config_watcher()
+    await start_job_manager(jobs.JOB_HANDLERS)
     yield
     logger.info("Shutting down RH Edu Ads API")
+    await stop_job_manager()
+    await stop_config_watcher()
+    await close_llm_manager()
+    await close_scrape_client()
+    await close_llm_cache()
 
 
 # Create FastAPI app
@@ -52,6 +66,7 @@ app.include_router(generate.router, prefix="/v1", tags=["generation"])
 app.include_router(shorten.router, prefix="/v1", tags=["generation"])
 app.include_router(analyze_usps.router, prefix="/v1", tags=["generation"])
 app.include_router(optimize.router, prefix="/v1", tags=["optimization"])
+app.include_router(jobs.router, prefix="/v1", tags=["jobs"])
 app.include_router(specs.router, prefix="/v1", tags=["config"])
 app.include_router(limits.router, prefix="/v1", tags=["config"])
 app.include_router(config.router, prefix="/admin", tags=["admin"])
@@ -77,12 +92,19 @@ async def root():
         "endpoints": {
             "health": "/health",
             "generate": "POST /v1/generate-copy",
+            "generate_stream": "POST /v1/generate-copy/stream",
+            "generate_campaign": "POST /v1/generate-campaign",
             "analyze_usps": "POST /v1/analyze-usps",
             "shorten": "POST /v1/shorten",
+            "shorten_batch": "POST /v1/shorten/batch",
             "optimize": "POST /v1/optimize-landing",
+            "jobs": "POST /v1/jobs, GET|DELETE /v1/jobs/{job_id}",
             "specs": "GET /v1/asset-specs",
             "limits": "GET /v1/ad-limits",
             "reload": "POST /admin/reload-config",
+            "scrape_cache": "GET /admin/scrape-cache",
+            "llm_cache": "GET|DELETE /admin/llm-cache",
+            "llm_scheduler": "GET /admin/llm-scheduler",
             "debug_filesystem": "GET /debug/filesystem",
             "debug_env": "GET /debug/env",
             "debug_config": "GET /debug/config-loader",
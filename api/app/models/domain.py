@@ -50,3 +50,4 @@ class Taxonomies(BaseModel):
     subtypes: list[str]
     tone_hints: Optional[dict[str, str]] = {}
     audience_hints: Optional[dict[str, str]] = {}
+    subtype_hints: Optional[dict[str, str]] = {}
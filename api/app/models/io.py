@@ -9,12 +9,14 @@ from pydantic import BaseModel, Field, HttpUrl
 # Copy Generation Models
 # ============================================================================
 
+# "prefer": answer from the LLM response and scrape caches when possible;
+# "bypass": always call the model and scrape the landing page afresh
+CacheMode = Literal["bypass", "prefer"]
 
-class GenerateRequest(BaseModel):
-    """Request to generate ad copy."""
 
-    channel: str = Field(..., description="Advertising channel")
-    subtype: str = Field(..., description="Type of communication")
+class CopyBrief(BaseModel):
+    """The creative brief shared by single and campaign generation requests."""
+
     university: str = Field(..., description="University name")
     tone: str = Field(..., description="Tone of voice")
     audience: str = Field(..., description="Target audience")
@@ -24,6 +26,16 @@ class GenerateRequest(BaseModel):
     creativity: int = Field(5, description="Creativity level (3=conservative, 5=balanced, 7=creative)")
     open_day_date: Optional[str] = Field(None, description="Optional open day date for contextual copy")
     course_name: Optional[str] = Field(None, description="Optional course name for subject-specific ads")
+    num_options: int = Field(3, ge=1, le=5, description="Number of copy options to generate")
+    deadline_ms: Optional[int] = Field(None, gt=0, description="Latency budget in milliseconds (server default if omitted)")
+    cache: Optional[CacheMode] = Field(None, description="LLM response cache use (generation bypasses it by default)")
+
+
+class GenerateRequest(CopyBrief):
+    """Request to generate ad copy."""
+
+    channel: str = Field(..., description="Advertising channel")
+    subtype: str = Field(..., description="Type of communication")
 
 
 class GeneratedField(BaseModel):
@@ -60,10 +72,33 @@ class GenerateResponse(BaseModel):
 
     options: list[GeneratedOption]
     warnings: list[Warning] = Field(default_factory=list)
-    source: str = Field("openai", description="Generation source")
+    source: str = Field("openai", description="Generation source: openai, cache, or openai+cache")
     model_used: str
     scraped_context: Optional[str] = None
     timings: dict[str, float] = Field(default_factory=dict)
+    skipped_stages: list[str] = Field(default_factory=list, description="Optional stages skipped to meet the deadline")
+
+
+class CampaignTarget(BaseModel):
+    """One channel/subtype to generate copy for within a campaign."""
+
+    channel: str = Field(..., description="Advertising channel")
+    subtype: str = Field(..., description="Type of communication")
+    num_options: Optional[int] = Field(None, ge=1, le=5, description="Overrides the brief's num_options")
+
+
+class GenerateCampaignRequest(CopyBrief):
+    """Request to generate copy for many channel/subtype targets from one brief."""
+
+    targets: list[CampaignTarget] = Field(..., min_length=1, max_length=50, description="Targets to generate")
+
+
+class CampaignTargetResult(GenerateResponse):
+    """Generated copy for one campaign target."""
+
+    target: int = Field(..., description="Index of the target in the request")
+    channel: str
+    subtype: str
 
 
 # ============================================================================
@@ -87,7 +122,29 @@ class ShortenResponse(BaseModel):
     shortened: str
     original_length: int
     shortened_length: int
-    method: str = Field("llm", description="Shortening method used")
+    method: str = Field(
+        "llm",
+        description="Shortening method used: none, compact, abbreviate, filler, clause or llm",
+    )
+
+
+class ShortenBatchRequest(BaseModel):
+    """Request to shorten several texts at once."""
+
+    items: list[ShortenRequest] = Field(..., min_length=1, max_length=50, description="Texts to shorten")
+
+
+class ShortenBatchItem(ShortenResponse):
+    """Shortening result for one batch item."""
+
+    time_ms: float = Field(0, description="Time spent shortening this item")
+
+
+class ShortenBatchResponse(BaseModel):
+    """Response with shortened texts in request order."""
+
+    results: list[ShortenBatchItem]
+    timings: dict[str, float] = Field(default_factory=dict)
 
 
 # ============================================================================
@@ -108,6 +165,8 @@ class OptimizeRequest(BaseModel):
 
     url: HttpUrl = Field(..., description="Landing page URL")
     objective: ObjectiveType = Field(..., description="Page objective")
+    deadline_ms: Optional[int] = Field(None, gt=0, description="Latency budget in milliseconds (server default if omitted)")
+    cache: Optional[CacheMode] = Field(None, description="LLM response cache use (analysis prefers it by default)")
 
 
 class CategoryScore(BaseModel):
@@ -157,6 +216,10 @@ class OptimizeResponse(BaseModel):
     summary: PageSummary
     scraped_at: datetime
     analysis_time_ms: int
+    analysis_mode: Literal["llm", "cached", "deterministic"] = Field(
+        "llm", description="How the LLM categories were scored (cached/deterministic while OpenAI is unavailable)"
+    )
+    skipped_stages: list[str] = Field(default_factory=list, description="Optional stages skipped to meet the deadline")
 
 
 # ============================================================================
@@ -179,12 +242,26 @@ class SpecsResponse(BaseModel):
     specs: list[dict[str, Any]]
 
 
+class CircuitBreakerState(BaseModel):
+    """State of one dependency's circuit breaker."""
+
+    name: str
+    state: Literal["closed", "open", "half_open"]
+    calls: int
+    failure_rate: float
+    slow_call_rate: float
+    retry_in_seconds: float
+    rejected: int
+    times_opened: int
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
 
     status: str = "ok"
     model: str
     version: str = "0.1.0"
+    circuit_breakers: list[CircuitBreakerState] = Field(default_factory=list)
 
 
 class ReloadResponse(BaseModel):
@@ -193,3 +270,71 @@ class ReloadResponse(BaseModel):
     success: bool
     message: str
     cleared_entries: int = 0
+
+
+class ScrapeCacheStatsResponse(BaseModel):
+    """Scrape cache statistics."""
+
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    revalidations: int
+    evictions: int
+
+
+class LLMCacheStatsResponse(BaseModel):
+    """LLM response cache statistics."""
+
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    persistent: bool
+
+
+class LLMModelSchedulerStats(BaseModel):
+    """Rate limiter state for one model."""
+
+    model: str
+    queued: int
+    in_flight: int
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    available_requests: Optional[int] = None
+    available_tokens: Optional[int] = None
+    paused_seconds: float = 0
+    throttled: int = 0
+
+
+class LLMSchedulerStatsResponse(BaseModel):
+    """LLM rate limiter state for every model used so far."""
+
+    models: list[LLMModelSchedulerStats]
+
+
+# ============================================================================
+# Job Models
+# ============================================================================
+
+
+class JobSubmitRequest(BaseModel):
+    """Request to run generation or analysis as a background job."""
+
+    kind: Literal["generate-copy", "optimize-landing"] = Field(..., description="Which endpoint to run")
+    payload: dict[str, Any] = Field(..., description="Request body for that endpoint")
+    callback_url: Optional[HttpUrl] = Field(None, description="URL to POST the finished job to")
+
+
+class JobResponse(BaseModel):
+    """Status of a background job, with its result once finished."""
+
+    job_id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
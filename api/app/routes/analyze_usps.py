@@ -3,11 +3,15 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, HttpUrl
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field, HttpUrl
 
+from app.deps import get_llm
+from app.models.io import CacheMode
 from app.services.scrape import scrape_landing_page, format_scraped_summary
 from app.services.llm import extract_usps_from_content
+from app.services.llm_cache import llm_cache_mode
+from app.services.llm_client import LLMClientManager
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -16,6 +20,7 @@ router = APIRouter()
 class AnalyzeUSPsRequest(BaseModel):
     """Request to analyze landing page and extract USPs."""
     url: HttpUrl
+    cache: Optional[CacheMode] = Field(None, description="LLM response cache use (prefers it by default)")
 
 
 class AnalyzeUSPsResponse(BaseModel):
@@ -25,7 +30,10 @@ class AnalyzeUSPsResponse(BaseModel):
 
 
 @router.post("/analyze-usps", response_model=AnalyzeUSPsResponse)
-async def analyze_usps(request: AnalyzeUSPsRequest) -> AnalyzeUSPsResponse:
+async def analyze_usps(
+    request: AnalyzeUSPsRequest,
+    llm: LLMClientManager = Depends(get_llm),
+) -> AnalyzeUSPsResponse:
     """
     Analyze a landing page and extract 3-5 key USPs.
 
@@ -51,7 +59,8 @@ async def analyze_usps(request: AnalyzeUSPsRequest) -> AnalyzeUSPsResponse:
         formatted_content = format_scraped_summary(scraped_content)
 
         # Extract USPs using LLM
-        usps = await extract_usps_from_content(formatted_content)
+        with llm_cache_mode(request.cache):
+            usps = await extract_usps_from_content(formatted_content, llm=llm)
 
         logger.info(f"Extracted {len(usps)} USPs from landing page")
 
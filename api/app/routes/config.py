@@ -2,10 +2,14 @@
 
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.config_loader import clear_cache
-from app.models.io import ReloadResponse
+from app.deps import get_llm
+from app.models.io import LLMCacheStatsResponse, LLMSchedulerStatsResponse, ReloadResponse, ScrapeCacheStatsResponse
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_client import LLMClientManager
+from app.services.scrape_cache import get_scrape_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -42,3 +46,53 @@ async def reload_config() -> ReloadResponse:
             message=f"Failed to clear cache: {str(e)}",
             cleared_entries=0
         )
+
+
+@router.get("/scrape-cache", response_model=ScrapeCacheStatsResponse)
+async def scrape_cache_stats() -> ScrapeCacheStatsResponse:
+    """
+    Get scrape cache hit/miss counters and current size.
+
+    Returns:
+        ScrapeCacheStatsResponse with cache statistics
+    """
+    return ScrapeCacheStatsResponse(**get_scrape_cache().stats())
+
+
+@router.get("/llm-cache", response_model=LLMCacheStatsResponse)
+async def llm_cache_stats() -> LLMCacheStatsResponse:
+    """
+    Get LLM response cache hit/miss counters and current size.
+
+    Returns:
+        LLMCacheStatsResponse with cache statistics
+    """
+    return LLMCacheStatsResponse(**get_llm_cache().stats())
+
+
+@router.delete("/llm-cache", response_model=ReloadResponse)
+async def clear_llm_cache() -> ReloadResponse:
+    """
+    Drop every cached LLM response (e.g. after a prompt change).
+
+    Returns:
+        ReloadResponse with the number of cleared entries
+    """
+    cleared_count = await get_llm_cache().clear()
+    logger.info(f"LLM response cache cleared: {cleared_count} entries")
+    return ReloadResponse(
+        success=True,
+        message=f"LLM response cache cleared. {cleared_count} entries removed.",
+        cleared_entries=cleared_count
+    )
+
+
+@router.get("/llm-scheduler", response_model=LLMSchedulerStatsResponse)
+async def llm_scheduler_stats(llm: LLMClientManager = Depends(get_llm)) -> LLMSchedulerStatsResponse:
+    """
+    Get per-model LLM queue depth, in-flight calls and remaining rate budget.
+
+    Returns:
+        LLMSchedulerStatsResponse with one entry per model used since startup
+    """
+    return LLMSchedulerStatsResponse(models=llm.scheduler_stats())
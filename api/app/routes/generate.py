@@ -1,32 +1,206 @@
 """Ad copy generation endpoints."""
 
+import asyncio
+import json
 import logging
 import time
-from typing import Optional
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from app.config_loader import get_audience_hint, get_tone_hint, get_subtype_hint
-from app.models.io import GenerateRequest, GenerateResponse, GeneratedOption
-from app.services.limits import get_limits_for_channel, validate_generated_fields
-from app.services.llm import generate_copy_with_openai
-from app.services.scrape import format_scraped_summary, scrape_landing_page
+from app.deps import get_llm, get_settings
+from app.models.domain import FieldLimit
+from app.models.io import (
+    CampaignTargetResult,
+    CopyBrief,
+    GenerateCampaignRequest,
+    GenerateRequest,
+    GenerateResponse,
+    GeneratedOption,
+    Warning,
+)
+from app.services.deadline import (
+    DeadlineExceeded,
+    deadline_scope,
+    has_budget,
+    remaining,
+    resolve_budget,
+    skip_stage,
+    stage_timeout,
+)
+from app.services.limits import get_limits_for_channel, repair_over_limit_fields, validate_generated_fields
+from app.services.llm import generate_copy_with_openai, generation_source, stream_copy_with_openai
+from app.services.llm_cache import llm_cache_mode
+from app.services.llm_client import LLMClientManager
+from app.services.scrape import ScrapedContent, format_scraped_summary, scrape_landing_page
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _get_field_limits(channel: str, subtype: str) -> list[FieldLimit]:
+    """Resolve field limits for a channel/subtype, or raise a 400."""
+    field_limits = get_limits_for_channel(channel, subtype)
+    if not field_limits:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No field limits found for channel '{channel}' and subtype '{subtype}'"
+        )
+    return field_limits
+
+
+async def _scrape_context(landing_url: str) -> tuple[Optional[str], ScrapedContent]:
+    """
+    Scrape the landing page and summarise it for the generation prompt.
+
+    The scrape is optional context, so under a deadline it only gets the
+    budget left after deadline_generation_reserve_seconds is held back for
+    generation.
+    """
+    logger.info(f"Scraping landing page: {landing_url}")
+
+    left = remaining()
+    reserve = get_settings().deadline_generation_reserve_seconds
+    with deadline_scope(max(0.0, left - reserve)) if left is not None else nullcontext():
+        scraped_content = await scrape_landing_page(landing_url)
+    if scraped_content.error:
+        logger.warning(f"Failed to scrape landing page: {scraped_content.error}")
+        return None, scraped_content
+
+    logger.info(f"Scraped {scraped_content.word_count} words from landing page")
+    return format_scraped_summary(scraped_content), scraped_content
+
+
+def _options_within_deadline(num_options: int) -> int:
+    """Number of options to generate: just one when the deadline is close."""
+    if num_options > 1 and not has_budget(get_settings().deadline_extra_options_min_seconds):
+        skip_stage("extra_options")
+        return 1
+    return num_options
+
+
+async def _repair_options(
+    options: list[GeneratedOption],
+    warnings: list[Warning],
+    llm: LLMClientManager,
+    timings: dict[str, int],
+) -> list[Warning]:
+    """Shorten just the over-limit fields instead of regenerating the ad, if the deadline allows."""
+    settings = get_settings()
+    if not warnings or not settings.generation_repair_enabled:
+        return warnings
+    if not has_budget(settings.deadline_llm_min_seconds):
+        skip_stage("repair")
+        return warnings
+
+    repair_start = time.time()
+    warnings = await repair_over_limit_fields(
+        options,
+        llm=llm,
+        budget_seconds=stage_timeout(settings.generation_repair_budget_seconds),
+    )
+    timings["repair_ms"] = timings.get("repair_ms", 0) + int((time.time() - repair_start) * 1000)
+    return warnings
+
+
+async def _generate_validated_options(
+    brief: CopyBrief,
+    channel: str,
+    subtype: str,
+    field_limits: list[FieldLimit],
+    scraped_context: Optional[str],
+    tone_hint: str,
+    audience_hint: str,
+    subtype_hint: str,
+    num_options: int,
+    llm: LLMClientManager,
+) -> tuple[list[GeneratedOption], list[Warning], str, str, dict[str, int]]:
+    """
+    Generate options for one channel/subtype, validate them and repair over-limit fields.
+
+    Close to the request deadline only one option is generated ("extra_options")
+    and over-limit fields are left for the client to fix ("repair").
+
+    Returns:
+        Tuple of (validated options, warnings, model_used, source, timings)
+    """
+    timings = {}
+
+    # Generate copy options
+    generation_start = time.time()
+    raw_options, model_used, source = await generate_copy_with_openai(
+        channel=channel,
+        subtype=subtype,
+        university=brief.university,
+        tone=brief.tone,
+        audience=brief.audience,
+        usps=brief.usps,
+        fields=field_limits,
+        tone_hint=tone_hint,
+        audience_hint=audience_hint,
+        subtype_hint=subtype_hint,
+        emojis_allowed=brief.emojis_allowed,
+        scraped_context=scraped_context,
+        num_options=_options_within_deadline(num_options),
+        creativity=brief.creativity,
+        open_day_date=brief.open_day_date,
+        course_name=brief.course_name,
+        llm=llm,
+    )
+    timings["generation_ms"] = int((time.time() - generation_start) * 1000)
+
+    # Validate and format each option
+    validated_options = []
+    all_warnings = []
+
+    for idx, raw_option in enumerate(raw_options):
+        validated_fields, warnings = validate_generated_fields(raw_option, field_limits)
+        all_warnings.extend(warnings)
+
+        validated_options.append(GeneratedOption(
+            option=idx + 1,
+            fields=validated_fields
+        ))
+
+    all_warnings = await _repair_options(validated_options, all_warnings, llm, timings)
+
+    return validated_options, all_warnings, model_used, source, timings
+
+
 @router.post("/generate-copy", response_model=GenerateResponse)
-async def generate_copy(request: GenerateRequest) -> GenerateResponse:
+async def generate_copy(
+    request: GenerateRequest,
+    llm: LLMClientManager = Depends(get_llm),
+    x_request_deadline_ms: Optional[int] = Header(None),
+) -> GenerateResponse:
     """
     Generate ad copy for the specified channel and requirements.
 
+    The request runs under a deadline (deadline_ms, else the
+    X-Request-Deadline-Ms header, else REQUEST_DEADLINE_SECONDS). Optional
+    stages that would not fit are skipped and listed in skipped_stages.
+
     Args:
         request: GenerateRequest with channel, subtype, university, tone, audience, etc.
+        x_request_deadline_ms: Latency budget header, used when deadline_ms is not set
 
     Returns:
-        GenerateResponse with 3 copy options, warnings, and metadata
+        GenerateResponse with the requested copy options (3 by default), warnings, and metadata
     """
+    with (
+        deadline_scope(resolve_budget(request.deadline_ms, x_request_deadline_ms)) as skipped_stages,
+        llm_cache_mode(request.cache),
+    ):
+        response = await _generate_copy(request, llm)
+        response.skipped_stages = list(skipped_stages)
+        return response
+
+
+async def _generate_copy(request: GenerateRequest, llm: LLMClientManager) -> GenerateResponse:
+    """Generate ad copy (see generate_copy)."""
     start_time = time.time()
     timings = {}
 
@@ -34,12 +208,7 @@ async def generate_copy(request: GenerateRequest) -> GenerateResponse:
 
     try:
         # Get field limits for this channel
-        field_limits = get_limits_for_channel(request.channel, request.subtype)
-        if not field_limits:
-            raise HTTPException(
-                status_code=400,
-                detail=f"No field limits found for channel '{request.channel}' and subtype '{request.subtype}'"
-            )
+        field_limits = _get_field_limits(request.channel, request.subtype)
 
         # Get tone, audience, and subtype hints
         tone_hint = get_tone_hint(request.tone)
@@ -50,51 +219,22 @@ async def generate_copy(request: GenerateRequest) -> GenerateResponse:
         scraped_context: Optional[str] = None
         if request.landing_url:
             scrape_start = time.time()
-            logger.info(f"Scraping landing page: {request.landing_url}")
-
-            scraped_content = await scrape_landing_page(str(request.landing_url))
-            if not scraped_content.error:
-                scraped_context = format_scraped_summary(scraped_content)
-                logger.info(f"Scraped {scraped_content.word_count} words from landing page")
-            else:
-                logger.warning(f"Failed to scrape landing page: {scraped_content.error}")
-
+            scraped_context, _ = await _scrape_context(str(request.landing_url))
             timings["scrape_ms"] = int((time.time() - scrape_start) * 1000)
 
-        # Generate copy options
-        generation_start = time.time()
-        raw_options, model_used = await generate_copy_with_openai(
+        validated_options, all_warnings, model_used, source, generation_timings = await _generate_validated_options(
+            brief=request,
             channel=request.channel,
             subtype=request.subtype,
-            university=request.university,
-            tone=request.tone,
-            audience=request.audience,
-            usps=request.usps,
-            fields=field_limits,
+            field_limits=field_limits,
+            scraped_context=scraped_context,
             tone_hint=tone_hint,
             audience_hint=audience_hint,
             subtype_hint=subtype_hint,
-            emojis_allowed=request.emojis_allowed,
-            scraped_context=scraped_context,
-            num_options=1,
-            creativity=request.creativity,
-            open_day_date=request.open_day_date,
-            course_name=request.course_name,
+            num_options=request.num_options,
+            llm=llm,
         )
-        timings["generation_ms"] = int((time.time() - generation_start) * 1000)
-
-        # Validate and format each option
-        validated_options = []
-        all_warnings = []
-
-        for idx, raw_option in enumerate(raw_options):
-            validated_fields, warnings = validate_generated_fields(raw_option, field_limits)
-            all_warnings.extend(warnings)
-
-            validated_options.append(GeneratedOption(
-                option=idx + 1,
-                fields=validated_fields
-            ))
+        timings.update(generation_timings)
 
         timings["total_ms"] = int((time.time() - start_time) * 1000)
 
@@ -103,12 +243,354 @@ async def generate_copy(request: GenerateRequest) -> GenerateResponse:
         return GenerateResponse(
             options=validated_options,
             warnings=all_warnings,
-            source="openai",
+            source=source,
             model_used=model_used,
             scraped_context=scraped_context,
             timings=timings,
         )
 
+    except DeadlineExceeded as e:
+        logger.warning(f"Deadline exceeded generating copy: {e}")
+        raise HTTPException(status_code=504, detail=f"Failed to generate copy: {str(e)}")
     except Exception as e:
         logger.error(f"Error generating copy: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to generate copy: {str(e)}")
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/generate-copy/stream")
+async def generate_copy_stream(
+    request: GenerateRequest,
+    tokens: bool = Query(True, description="Also stream each option's JSON as it is generated"),
+    llm: LLMClientManager = Depends(get_llm),
+    x_request_deadline_ms: Optional[int] = Header(None),
+) -> StreamingResponse:
+    """
+    Generate ad copy, streaming progress as Server-Sent Events.
+
+    Events, in order:
+        limits: field limits resolved for the channel/subtype
+        scrape: landing page scraped (only when landing_url is given)
+        delta: raw JSON text of an option as it streams (when tokens=true)
+        option: a validated option, as soon as its LLM call completes
+        option_error: an option that failed after its retries
+        done: model used, all warnings, timings and skipped_stages
+        error: generation failed; no further events follow
+
+    The deadline works as for /generate-copy.
+
+    Args:
+        request: GenerateRequest with channel, subtype, university, tone, audience, etc.
+        tokens: Whether to stream delta events
+        x_request_deadline_ms: Latency budget header, used when deadline_ms is not set
+
+    Returns:
+        text/event-stream response
+    """
+    logger.info(f"Streaming copy for {request.channel} - {request.subtype}")
+
+    # Resolve limits up front so a bad channel/subtype is a normal 400
+    field_limits = _get_field_limits(request.channel, request.subtype)
+    budget = resolve_budget(request.deadline_ms, x_request_deadline_ms)
+
+    async def events() -> AsyncIterator[str]:
+        with deadline_scope(budget) as skipped_stages, llm_cache_mode(request.cache):
+            start_time = time.time()
+            timings = {}
+
+            yield _sse("limits", {
+                "channel": request.channel,
+                "subtype": request.subtype,
+                "fields": [field.model_dump() for field in field_limits],
+            })
+
+            try:
+                scraped_context: Optional[str] = None
+                if request.landing_url:
+                    scrape_start = time.time()
+                    scraped_context, scraped_content = await _scrape_context(str(request.landing_url))
+                    timings["scrape_ms"] = int((time.time() - scrape_start) * 1000)
+
+                    yield _sse("scrape", {
+                        "word_count": scraped_content.word_count,
+                        "error": scraped_content.error,
+                        "scraped_context": scraped_context,
+                        "scrape_ms": timings["scrape_ms"],
+                    })
+
+                generation_start = time.time()
+                settings = get_settings()
+                all_warnings = []
+                completed = cached = 0
+
+                # Generation runs in its own task and each option's repair in another, so
+                # shortening one option's fields never holds up the options still streaming
+                results: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+                repairs: set[asyncio.Task] = set()
+
+                async def repair_option(payload: dict[str, Any]) -> None:
+                    validated_fields, warnings = validate_generated_fields(payload["data"], field_limits)
+                    option = GeneratedOption(option=payload["option"], fields=validated_fields)
+                    warnings = await _repair_options([option], warnings, llm, timings)
+                    results.put_nowait(("option", (option, warnings, payload["cached"])))
+
+                async def generate() -> None:
+                    try:
+                        async for event, payload in stream_copy_with_openai(
+                            channel=request.channel,
+                            subtype=request.subtype,
+                            university=request.university,
+                            tone=request.tone,
+                            audience=request.audience,
+                            usps=request.usps,
+                            fields=field_limits,
+                            tone_hint=get_tone_hint(request.tone),
+                            audience_hint=get_audience_hint(request.audience),
+                            subtype_hint=get_subtype_hint(request.subtype),
+                            emojis_allowed=request.emojis_allowed,
+                            scraped_context=scraped_context,
+                            num_options=_options_within_deadline(request.num_options),
+                            creativity=request.creativity,
+                            open_day_date=request.open_day_date,
+                            course_name=request.course_name,
+                            stream_tokens=tokens,
+                            llm=llm,
+                        ):
+                            if event == "option":
+                                task = asyncio.create_task(repair_option(payload))
+                                repairs.add(task)
+                            else:
+                                results.put_nowait((event, payload))
+                        await asyncio.gather(*repairs)
+                    except Exception as e:
+                        results.put_nowait(("failed", e))
+                    else:
+                        results.put_nowait(("finished", None))
+
+                producer = asyncio.create_task(generate())
+                try:
+                    while True:
+                        event, payload = await results.get()
+                        if event == "finished":
+                            break
+                        if event == "failed":
+                            raise payload
+                        if event != "option":
+                            yield _sse(event, payload)
+                            continue
+
+                        option, warnings, option_cached = payload
+                        all_warnings.extend(warnings)
+                        completed += 1
+                        cached += option_cached
+                        yield _sse("option", {
+                            **option.model_dump(),
+                            "cached": option_cached,
+                            "warnings": [warning.model_dump() for warning in warnings],
+                            "elapsed_ms": int((time.time() - start_time) * 1000),
+                        })
+                finally:
+                    for task in (producer, *repairs):
+                        task.cancel()
+
+                timings["generation_ms"] = int((time.time() - generation_start) * 1000)
+                timings["total_ms"] = int((time.time() - start_time) * 1000)
+
+                if not completed:
+                    raise RuntimeError("All options failed to generate")
+
+                logger.info(f"Streamed {completed} options in {timings['total_ms']}ms")
+
+                yield _sse("done", {
+                    "source": generation_source(cached, completed),
+                    "model_used": settings.model_generation,
+                    "options": completed,
+                    "warnings": [warning.model_dump() for warning in all_warnings],
+                    "timings": timings,
+                    "skipped_stages": list(skipped_stages),
+                })
+
+            except Exception as e:
+                logger.error(f"Error streaming copy: {e}", exc_info=True)
+                yield _sse("error", {"detail": f"Failed to generate copy: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/generate-campaign")
+async def generate_campaign(
+    request: GenerateCampaignRequest,
+    llm: LLMClientManager = Depends(get_llm),
+    x_request_deadline_ms: Optional[int] = Header(None),
+) -> StreamingResponse:
+    """
+    Generate copy for many channel/subtype targets from one brief, streamed as Server-Sent Events.
+
+    The landing page is scraped once and limits/hints are resolved once for the
+    whole campaign; targets are then generated concurrently (up to
+    CAMPAIGN_MAX_CONCURRENT_TARGETS at a time).
+
+    Events, in order:
+        targets: resolved targets with their field limits (and any invalid targets)
+        scrape: landing page scraped (only when landing_url is given)
+        target: a finished target's options, warnings and timings, in completion order
+        target_error: a target that could not be generated
+        done: counts, total timings and skipped_stages
+
+    The whole campaign shares one deadline (as for /generate-copy); stages
+    skipped for any target are reported once, in the done event.
+
+    Args:
+        request: GenerateCampaignRequest with the brief and a list of targets
+        x_request_deadline_ms: Latency budget header, used when deadline_ms is not set
+
+    Returns:
+        text/event-stream response
+    """
+    settings = get_settings()
+    budget = resolve_budget(request.deadline_ms, x_request_deadline_ms)
+    logger.info(f"Generating campaign for {request.university} with {len(request.targets)} targets")
+
+    # Resolve everything that doesn't depend on the model once, up front
+    tone_hint = get_tone_hint(request.tone)
+    audience_hint = get_audience_hint(request.audience)
+    subtype_hints = {target.subtype: get_subtype_hint(target.subtype) for target in request.targets}
+
+    target_limits: dict[int, list[FieldLimit]] = {}
+    invalid_targets = []
+    for idx, target in enumerate(request.targets):
+        field_limits = get_limits_for_channel(target.channel, target.subtype)
+        if field_limits:
+            target_limits[idx] = field_limits
+        else:
+            invalid_targets.append({
+                "target": idx,
+                "channel": target.channel,
+                "subtype": target.subtype,
+                "error": f"No field limits found for channel '{target.channel}' and subtype '{target.subtype}'",
+            })
+
+    if not target_limits:
+        raise HTTPException(status_code=400, detail="No field limits found for any campaign target")
+
+    async def events() -> AsyncIterator[str]:
+        with deadline_scope(budget) as skipped_stages, llm_cache_mode(request.cache):
+            start_time = time.time()
+            timings = {}
+
+            yield _sse("targets", {
+                "targets": [
+                    {
+                        "target": idx,
+                        "channel": request.targets[idx].channel,
+                        "subtype": request.targets[idx].subtype,
+                        "fields": [field.model_dump() for field in field_limits],
+                    }
+                    for idx, field_limits in target_limits.items()
+                ],
+                "invalid": invalid_targets,
+            })
+            for invalid in invalid_targets:
+                yield _sse("target_error", invalid)
+
+            scraped_context: Optional[str] = None
+            if request.landing_url:
+                scrape_start = time.time()
+                try:
+                    scraped_context, scraped_content = await _scrape_context(str(request.landing_url))
+                    scrape_error = scraped_content.error
+                    word_count = scraped_content.word_count
+                except Exception as e:
+                    logger.error(f"Error scraping campaign landing page: {e}", exc_info=True)
+                    scrape_error, word_count = str(e), 0
+                timings["scrape_ms"] = int((time.time() - scrape_start) * 1000)
+
+                yield _sse("scrape", {
+                    "word_count": word_count,
+                    "error": scrape_error,
+                    "scraped_context": scraped_context,
+                    "scrape_ms": timings["scrape_ms"],
+                })
+
+            semaphore = asyncio.Semaphore(settings.campaign_max_concurrent_targets)
+            results: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue()
+
+            async def run_target(idx: int, field_limits: list[FieldLimit]) -> None:
+                target = request.targets[idx]
+                async with semaphore:
+                    target_start = time.time()
+                    try:
+                        options, warnings, model_used, source, target_timings = await _generate_validated_options(
+                            brief=request,
+                            channel=target.channel,
+                            subtype=target.subtype,
+                            field_limits=field_limits,
+                            scraped_context=scraped_context,
+                            tone_hint=tone_hint,
+                            audience_hint=audience_hint,
+                            subtype_hint=subtype_hints[target.subtype],
+                            num_options=target.num_options or request.num_options,
+                            llm=llm,
+                        )
+                    except Exception as e:
+                        logger.error(f"Error generating campaign target {idx} ({target.channel} - {target.subtype}): {e}")
+                        results.put_nowait(("target_error", {
+                            "target": idx,
+                            "channel": target.channel,
+                            "subtype": target.subtype,
+                            "error": f"Failed to generate copy: {str(e)}",
+                        }))
+                        return
+
+                    target_timings["total_ms"] = int((time.time() - target_start) * 1000)
+                    result = CampaignTargetResult(
+                        target=idx,
+                        channel=target.channel,
+                        subtype=target.subtype,
+                        options=options,
+                        warnings=warnings,
+                        source=source,
+                        model_used=model_used,
+                        timings=target_timings,
+                    )
+                    results.put_nowait(("target", result.model_dump()))
+
+            tasks = [
+                asyncio.create_task(run_target(idx, field_limits))
+                for idx, field_limits in target_limits.items()
+            ]
+            succeeded = 0
+            try:
+                for _ in tasks:
+                    event, payload = await results.get()
+                    if event == "target":
+                        succeeded += 1
+                    yield _sse(event, payload)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            timings["total_ms"] = int((time.time() - start_time) * 1000)
+            logger.info(f"Generated {succeeded}/{len(request.targets)} campaign targets in {timings['total_ms']}ms")
+
+            yield _sse("done", {
+                "targets": len(request.targets),
+                "succeeded": succeeded,
+                "failed": len(request.targets) - succeeded,
+                "timings": timings,
+                "skipped_stages": list(skipped_stages),
+            })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -6,6 +6,7 @@ from fastapi import APIRouter
 
 from app.deps import get_settings
 from app.models.io import HealthResponse
+from app.services.circuit_breaker import breaker_stats
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -16,12 +17,15 @@ async def health_check() -> HealthResponse:
     """
     Health check endpoint.
 
-    Returns service status and configuration info.
+    Returns service status and configuration info. Status is "degraded" while
+    any dependency's circuit breaker is open or half-open.
     """
     settings = get_settings()
+    breakers = breaker_stats()
 
     return HealthResponse(
-        status="ok",
+        status="degraded" if any(breaker["state"] != "closed" for breaker in breakers) else "ok",
         model=settings.model_generation,
-        version="0.1.0"
+        version="0.1.0",
+        circuit_breakers=breakers,
     )
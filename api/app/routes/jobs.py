@@ -0,0 +1,143 @@
+"""Background job endpoints for long-running generation and analysis."""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import ValidationError
+
+from app.deps import get_settings
+from app.models.io import GenerateRequest, JobResponse, JobSubmitRequest, OptimizeRequest
+from app.routes.generate import generate_copy
+from app.routes.optimize import optimize_landing_page
+from app.services.jobs import CallbackURLError, Job, JobManager, JobQueueFullError, get_job_manager
+from app.services.llm_client import get_llm_manager
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _job_deadline_ms() -> int:
+    """Jobs have no waiting client, so unless the payload sets deadline_ms they get the maximum budget."""
+    return int(get_settings().request_deadline_max_seconds * 1000)
+
+
+async def run_generate_copy(payload: dict[str, Any]) -> dict[str, Any]:
+    """Run /v1/generate-copy for a job."""
+    response = await generate_copy(
+        GenerateRequest.model_validate(payload),
+        llm=get_llm_manager(),
+        x_request_deadline_ms=_job_deadline_ms(),
+    )
+    return response.model_dump(mode="json")
+
+
+async def run_optimize_landing(payload: dict[str, Any]) -> dict[str, Any]:
+    """Run /v1/optimize-landing for a job."""
+    response = await optimize_landing_page(
+        OptimizeRequest.model_validate(payload),
+        llm=get_llm_manager(),
+        x_request_deadline_ms=_job_deadline_ms(),
+    )
+    return response.model_dump(mode="json")
+
+
+JOB_HANDLERS = {
+    "generate-copy": run_generate_copy,
+    "optimize-landing": run_optimize_landing,
+}
+
+JOB_REQUEST_MODELS = {
+    "generate-copy": GenerateRequest,
+    "optimize-landing": OptimizeRequest,
+}
+
+
+def _timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        created_at=_timestamp(job.created_at),
+        started_at=_timestamp(job.started_at),
+        finished_at=_timestamp(job.finished_at),
+        result=job.result,
+        error=job.error,
+    )
+
+
+def _require_manager() -> JobManager:
+    manager = get_job_manager()
+    if manager is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    return manager
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(request: JobSubmitRequest) -> JobResponse:
+    """
+    Queue a generation or landing page analysis to run in the background.
+
+    The payload is validated against the target endpoint's request body before
+    the job is accepted. Poll GET /v1/jobs/{job_id} for the result, or pass a
+    callback_url to have the finished job POSTed to you.
+
+    Args:
+        request: JobSubmitRequest with kind, payload and optional callback_url
+
+    Returns:
+        JobResponse for the queued job
+    """
+    manager = _require_manager()
+
+    try:
+        payload = JOB_REQUEST_MODELS[request.kind].model_validate(request.payload).model_dump(mode="json")
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    try:
+        job = await manager.submit(
+            request.kind,
+            payload,
+            callback_url=str(request.callback_url) if request.callback_url else None,
+        )
+    except CallbackURLError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> JobResponse:
+    """
+    Get a job's status, and its result once it has finished.
+
+    Returns:
+        JobResponse (404 if the job is unknown or its result has expired)
+    """
+    job = await _require_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return _job_response(job)
+
+
+@router.delete("/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str) -> JobResponse:
+    """
+    Cancel a queued or running job. Finished jobs are returned unchanged.
+
+    Returns:
+        JobResponse with the job's status after cancellation
+    """
+    job = await _require_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    logger.info(f"Cancel requested for job {job_id} (status: {job.status})")
+    return _job_response(job)
@@ -3,11 +3,16 @@
 import logging
 import time
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 
+from app.deps import get_llm
 from app.models.io import OptimizeRequest, OptimizeResponse
 from app.services.analyse import calculate_overall_score
+from app.services.deadline import deadline_scope, resolve_budget
+from app.services.llm_cache import llm_cache_mode
+from app.services.llm_client import LLMClientManager
 from app.services.scrape import scrape_landing_page
 
 logger = logging.getLogger(__name__)
@@ -15,7 +20,11 @@ router = APIRouter()
 
 
 @router.post("/optimize-landing", response_model=OptimizeResponse)
-async def optimize_landing_page(request: OptimizeRequest) -> OptimizeResponse:
+async def optimize_landing_page(
+    request: OptimizeRequest,
+    llm: LLMClientManager = Depends(get_llm),
+    x_request_deadline_ms: Optional[int] = Header(None),
+) -> OptimizeResponse:
     """
     Analyze and optimize a landing page for education marketing.
 
@@ -24,12 +33,34 @@ async def optimize_landing_page(request: OptimizeRequest) -> OptimizeResponse:
     - User Experience (20pts)
     - CTA Effectiveness (20pts)
 
+    The request runs under a deadline (deadline_ms, else the
+    X-Request-Deadline-Ms header, else REQUEST_DEADLINE_SECONDS). The scrape
+    is required, so running out of budget for it is a 504; LLM scoring that
+    would not fit falls back to rule-based scores ("llm_analysis" in
+    skipped_stages).
+
     Args:
         request: OptimizeRequest with URL and objective
+        x_request_deadline_ms: Latency budget header, used when deadline_ms is not set
 
     Returns:
         OptimizeResponse with overall score, category scores, issues, and recommendations
     """
+    with (
+        deadline_scope(resolve_budget(request.deadline_ms, x_request_deadline_ms)) as skipped_stages,
+        llm_cache_mode(request.cache),
+    ):
+        response = await _optimize_landing_page(request, llm, skipped_stages)
+        response.skipped_stages = list(skipped_stages)
+        return response
+
+
+async def _optimize_landing_page(
+    request: OptimizeRequest,
+    llm: LLMClientManager,
+    skipped_stages: list[str],
+) -> OptimizeResponse:
+    """Analyze a landing page (see optimize_landing_page)."""
     start_time = datetime.now()
     logger.info(f"Analyzing landing page: {request.url} (objective: {request.objective})")
 
@@ -38,6 +69,11 @@ async def optimize_landing_page(request: OptimizeRequest) -> OptimizeResponse:
         scrape_start = time.time()
         content = await scrape_landing_page(str(request.url), use_firecrawl=True)
 
+        if "scrape" in skipped_stages:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Failed to scrape landing page: {content.error}"
+            )
         if content.error:
             raise HTTPException(
                 status_code=400,
@@ -52,7 +88,8 @@ async def optimize_landing_page(request: OptimizeRequest) -> OptimizeResponse:
         response = await calculate_overall_score(
             content=content,
             objective=request.objective,
-            analysis_start_time=analysis_start
+            analysis_start_time=analysis_start,
+            llm=llm,
         )
 
         # Update URL in response (was placeholder)
@@ -1,22 +1,30 @@
 """Text shortening endpoints."""
 
 import logging
+import time
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from app.models.io import ShortenRequest, ShortenResponse
-from app.services.shorten import shorten_copy
+from app.deps import get_llm
+from app.models.io import ShortenBatchRequest, ShortenBatchResponse, ShortenRequest, ShortenResponse
+from app.services.llm_client import LLMClientManager
+from app.services.shorten import shorten_copy, shorten_copy_batch
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
 @router.post("/shorten", response_model=ShortenResponse)
-async def shorten_text(request: ShortenRequest) -> ShortenResponse:
+async def shorten_text(
+    request: ShortenRequest,
+    llm: LLMClientManager = Depends(get_llm),
+) -> ShortenResponse:
     """
     Shorten text to fit within character limit while preserving meaning.
 
-    Uses LLM to intelligently reduce text length while maintaining:
+    Tries cheap local rules first (compaction, abbreviations, filler and
+    clause removal) and only uses the LLM when they cannot fit the limit.
+    The LLM intelligently reduces text length while maintaining:
     - Core message and value proposition
     - Tone and voice
     - Call-to-action (if requested)
@@ -44,11 +52,12 @@ async def shorten_text(request: ShortenRequest) -> ShortenResponse:
             )
 
         # Shorten the text
-        shortened = await shorten_copy(
+        shortened, method = await shorten_copy(
             text=request.text,
             max_chars=request.max_chars,
             keep_cta=request.keep_cta,
             remove_emojis=request.remove_emojis,
+            llm=llm,
         )
 
         shortened_length = len(shortened)
@@ -60,9 +69,42 @@ async def shorten_text(request: ShortenRequest) -> ShortenResponse:
             shortened=shortened,
             original_length=original_length,
             shortened_length=shortened_length,
-            method="llm"
+            method=method
         )
 
     except Exception as e:
         logger.error(f"Error shortening text: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to shorten text: {str(e)}")
+
+
+@router.post("/shorten/batch", response_model=ShortenBatchResponse)
+async def shorten_text_batch(
+    request: ShortenBatchRequest,
+    llm: LLMClientManager = Depends(get_llm),
+) -> ShortenBatchResponse:
+    """
+    Shorten several texts in one request (e.g. every over-limit field of an ad).
+
+    Each item is tried with the local rules first; the remaining items are
+    shortened together in a single LLM call.
+
+    Args:
+        request: ShortenBatchRequest with the items to shorten
+
+    Returns:
+        ShortenBatchResponse with per-item results (in request order) and timings
+    """
+    logger.info(f"Batch shortening {len(request.items)} texts")
+    start_time = time.time()
+
+    try:
+        results = await shorten_copy_batch(request.items, llm=llm)
+
+        timings = {"total_ms": int((time.time() - start_time) * 1000)}
+        logger.info(f"Batch shortened {len(results)} texts in {timings['total_ms']}ms")
+
+        return ShortenBatchResponse(results=results, timings=timings)
+
+    except Exception as e:
+        logger.error(f"Error batch shortening text: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to shorten text: {str(e)}")
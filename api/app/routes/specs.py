@@ -4,7 +4,7 @@ import logging
 
 from fastapi import APIRouter, HTTPException, Query
 
-from app.config_loader import load_asset_specs
+from app.config_loader import get_asset_specs_for_channel
 from app.models.io import SpecsResponse
 
 logger = logging.getLogger(__name__)
@@ -30,15 +30,8 @@ async def get_asset_specs(
     logger.info(f"Fetching asset specs for channel: {channel}")
 
     try:
-        all_specs = load_asset_specs()
-
-        # Filter specs for the requested channel (case-insensitive)
-        channel_lower = channel.lower()
-        filtered_specs = [
-            spec
-            for spec in all_specs
-            if spec.channel.lower() == channel_lower
-        ]
+        # Specs for the requested channel (case-insensitive)
+        filtered_specs = get_asset_specs_for_channel(channel)
 
         if not filtered_specs:
             raise HTTPException(
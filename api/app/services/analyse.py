@@ -1,12 +1,12 @@
 """Landing page analysis and scoring engine."""
 
+import asyncio
 import json
 import logging
 import re
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
-
-from openai import AsyncOpenAI
+from typing import Awaitable, Optional
 
 from app.deps import get_settings
 from app.models.io import (
@@ -16,10 +16,54 @@ from app.models.io import (
     OptimizeResponse,
     PageSummary,
 )
+from app.services.circuit_breaker import is_available
+from app.services.deadline import has_budget, skip_stage, stage_timeout
+from app.services.keywords import KeywordIndex
+from app.services.llm_cache import cached_response, completion_cache_key, current_cache_mode, store_response
+from app.services.llm_client import LLMClientManager, get_llm_manager
+from app.services.llm_scheduler import Priority
 from app.services.scrape import ScrapedContent
+from app.services.singleflight import SingleFlight, hash_key
 
 logger = logging.getLogger(__name__)
 
+_analysis_flight: SingleFlight[dict] = SingleFlight("landing_page_analysis")
+
+# Last good LLM scores per page/objective, served while OpenAI's circuit is open
+_LAST_GOOD_MAX_ENTRIES = 128
+_last_good_scores: "OrderedDict[str, tuple[dict[str, CategoryScore], list[Issue]]]" = OrderedDict()
+
+# What students need to find quickly for each page objective
+OBJECTIVE_REQUIREMENTS = {
+    "Open Day Registration": "Event date, time, and location should be clear and prominent. What to expect at the open day.",
+    "Pre-Clearing Enquiry Form": "Course availability and next steps should be obvious. Why enquire now.",
+    "Drive Applications": "Course benefits and application deadline should be clear. Why apply to this course.",
+    "Course Information": "Course content, entry requirements, and what makes it unique should be visible."
+}
+
+# Which CTAs to look for on each page objective
+OBJECTIVE_CTA_GUIDANCE = {
+    "Open Day Registration": "For open day pages, look for 'Book Now' or 'Register' buttons prominently placed.",
+    "Pre-Clearing Enquiry Form": "For clearing enquiries, look for 'Enquire Now' or contact forms.",
+    "Drive Applications": "For application pages, 'Apply Now' buttons should be prominent and high on the page.",
+    "Course Information": "For course info pages, look for 'Learn More', 'Download Prospectus' or 'Find Out More' buttons."
+}
+
+# Keywords the rule-based heuristics look for in the (lower-cased) page text
+COURSE_KEYWORDS = ("course", "program", "degree", "modules", "curriculum", "syllabus", "year")
+ENTRY_KEYWORDS = ("entry", "requirements", "ucas", "points", "grades", "qualification", "a-level", "btec")
+CAMPUS_KEYWORDS = ("campus", "accommodation", "facilities", "library", "sports", "societies", "student life", "location")
+CAREER_KEYWORDS = ("career", "employment", "graduate", "job", "salary", "employer", "placement", "internship")
+VIDEO_KEYWORDS = ("video", "youtube", "vimeo")
+TESTIMONIAL_KEYWORDS = ("testimonial", "review")
+RANKING_KEYWORDS = ("ranked", "ranking")
+
+_DATE_PATTERN = re.compile(
+    r"\b20\d{2}\b"  # Years like 2024, 2025
+    r"|\b(?:january|february|march|april|may|june|july|august|september|october|november|december)\b"
+    r"|\bdeadline\b|\bopen day\b|\bstart date\b"
+)
+
 
 def calculate_letter_grade(percentage: int) -> str:
     """Convert percentage to letter grade."""
@@ -35,17 +79,21 @@ def calculate_letter_grade(percentage: int) -> str:
         return "F"
 
 
-async def analyze_with_llm(prompt: str, max_score: int = 10) -> dict:
-    """
-    Analyze content using LLM with structured JSON output.
+def _page_keywords(content: ScrapedContent) -> KeywordIndex:
+    """Keyword lookups over the page text, shared by every heuristic that scores it."""
+    if content.keywords is None:
+        content.keywords = KeywordIndex(content.markdown_lower)
+    return content.keywords
 
-    Returns:
-        dict with 'score' (0-max_score) and 'issues' (list of dicts with title, description, suggestion)
-    """
-    settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
 
-    json_schema = {
+def _has_video(content: ScrapedContent) -> bool:
+    """Check whether the page mentions embedded video content."""
+    return _page_keywords(content).any(VIDEO_KEYWORDS)
+
+
+def _analysis_result_schema(max_score: int) -> dict:
+    """JSON schema for a single category's LLM analysis result (score + issues)."""
+    return {
         "type": "object",
         "properties": {
             "score": {
@@ -84,8 +132,58 @@ async def analyze_with_llm(prompt: str, max_score: int = 10) -> dict:
         "additionalProperties": False
     }
 
+
+def _fallback_analysis_result(max_score: int) -> dict:
+    """Neutral 50% analysis result used when the LLM call fails."""
+    return {
+        "score": max_score // 2,  # 50% score as fallback
+        "issues": [{
+            "title": "Analysis unavailable",
+            "description": "Unable to perform detailed analysis due to technical error",
+            "suggestion": "Please try again or contact support if the issue persists"
+        }]
+    }
+
+
+async def analyze_with_llm(
+    prompt: str,
+    max_score: int = 10,
+    llm: Optional[LLMClientManager] = None,
+) -> dict:
+    """
+    Analyze content using LLM with structured JSON output.
+
+    Returns:
+        dict with 'score' (0-max_score) and 'issues' (list of dicts with title, description, suggestion)
+
+    Concurrent identical analyses share a single LLM call, and results are
+    served from the LLM response cache unless the request asked for
+    cache="bypass". Fallback results are never cached.
+    """
+    settings = get_settings()
+    key = hash_key(settings.model_generation_mini, prompt, max_score, current_cache_mode("prefer"))
+    return await _analysis_flight.do(key, lambda: _analyze_with_llm(prompt, max_score, llm))
+
+
+async def _analyze_with_llm(
+    prompt: str,
+    max_score: int,
+    llm: Optional[LLMClientManager] = None,
+) -> dict:
+    """Run one structured-output analysis call (see analyze_with_llm)."""
+    settings = get_settings()
+    llm = llm or get_llm_manager()
+
+    json_schema = _analysis_result_schema(max_score)
+
+    cache_key = completion_cache_key(settings.model_generation_mini, 0.3, None, prompt, json_schema)
+    cached = await cached_response(cache_key, default_mode="prefer")
+    if cached is not None:
+        return cached
+
     try:
-        response = await client.chat.completions.create(
+        response = await llm.chat_completion(
+            priority=Priority.BACKGROUND,  # Interactive generation goes first under load
             model=settings.model_generation_mini,  # Use mini for speed
             messages=[
                 {"role": "user", "content": prompt}
@@ -110,22 +208,164 @@ async def analyze_with_llm(prompt: str, max_score: int = 10) -> dict:
         # Ensure score is within bounds
         result["score"] = max(0, min(max_score, result["score"]))
 
+        await store_response(cache_key, result)
         return result
 
     except Exception as e:
         logger.error(f"Error in LLM analysis: {e}")
         # Return default values on error
-        return {
-            "score": max_score // 2,  # 50% score as fallback
-            "issues": [{
-                "title": "Analysis unavailable",
-                "description": "Unable to perform detailed analysis due to technical error",
-                "suggestion": "Please try again or contact support if the issue persists"
-            }]
-        }
+        return _fallback_analysis_result(max_score)
+
+
+# Keys used by the combined analysis engine for each LLM-scored category
+COMBINED_ANALYSIS_CATEGORIES = ("content_clarity", "page_usability", "conversion_elements")
+
+
+async def analyze_all_categories_with_llm(
+    content: ScrapedContent,
+    objective: ObjectiveType,
+    llm: Optional[LLMClientManager] = None,
+) -> dict[str, dict]:
+    """
+    Analyze content clarity, usability and conversion in a single LLM call.
+
+    The shared page context (headings, content, CTAs) is sent once and the
+    structured output returns one score/issues result per category, in the
+    same shape analyze_with_llm returns for a single category.
 
+    Returns:
+        dict keyed by category ('content_clarity', 'page_usability',
+        'conversion_elements') with 'score' (0-10) and 'issues'
 
-async def score_content_clarity(content: ScrapedContent, objective: ObjectiveType) -> tuple[CategoryScore, list[Issue]]:
+    Like analyze_with_llm, concurrent identical analyses share a single LLM
+    call and results are served from the LLM response cache unless the
+    request asked for cache="bypass". Fallback results are never cached.
+    """
+    settings = get_settings()
+
+    h1_text = content.h1[0] if content.h1 else "No main heading found"
+    h2_text = ", ".join(content.h2[:8]) if content.h2 else "No subheadings found"
+    paragraphs_text = " ".join(content.paragraphs[:3]) if content.paragraphs else "No content found"
+    if len(paragraphs_text) > 1000:
+        paragraphs_text = paragraphs_text[:1000] + "..."
+    structure_summary = f"{len(content.h1)} main heading(s), {len(content.h2)} subheadings, {len(content.paragraphs)} content sections"
+    ctas_text = ", ".join(content.ctas[:8]) if content.ctas else "No action buttons detected"
+
+    requirement_text = OBJECTIVE_REQUIREMENTS.get(objective, "Key information for this page type")
+    guidance = OBJECTIVE_CTA_GUIDANCE.get(objective, "Check for clear action buttons")
+
+    prompt = f"""You are evaluating a university landing page for {objective}.
+
+Page content:
+Main Heading: {h1_text}
+Subheadings: {h2_text}
+Content: {paragraphs_text}
+Structure: {structure_summary}
+Buttons/CTAs found: {ctas_text}
+Forms on page: {len(content.forms)}
+Video present: {'Yes' if _has_video(content) else 'No'}
+
+Rate the page in three categories, each on a simple 0-10 scale:
+
+content_clarity - Is the content clear and easy to understand?
+For this page type, students need to quickly find: {requirement_text}
+- Is the main message clear within 3 seconds?
+- Can you easily find the important information?
+- Is the language simple and jargon-free?
+- Does it focus on student benefits, not just facts?
+
+page_usability - How easy is the page to use?
+- Is important information at the top of the page?
+- Can you quickly scan and find what you need?
+- Is the content broken up with clear sections?
+- Does the layout look organized (not cluttered)?
+
+conversion_elements - What actions can students take?
+{guidance}
+- Are there clear action buttons students can click?
+- Are the buttons easy to find (high up on page)?
+- Are there multiple ways to convert (forms, videos, buttons)?
+- Do button labels clearly say what happens when you click?
+Bonus points for embedded forms, videos and multiple clear CTAs.
+
+For each category provide:
+1. Score (0-10, where 10 is excellent)
+2. List 2-3 specific issues with actionable suggestions
+
+For each issue, provide:
+- title: Short, specific title (e.g., "Unclear value proposition", "Content too dense", "Weak call-to-action")
+- description: Clear explanation of what the problem is and why it matters to students
+- suggestion: Specific action the marketing team can take to fix it (must be different from description)
+
+Use plain language that non-technical marketing teams can understand and act on. Avoid technical terms like "HTML semantics" or "DOM structure"."""
+
+    key = hash_key(settings.model_generation_mini, prompt, COMBINED_ANALYSIS_CATEGORIES, current_cache_mode("prefer"))
+    return await _analysis_flight.do(key, lambda: _analyze_all_categories_with_llm(prompt, llm))
+
+
+async def _analyze_all_categories_with_llm(
+    prompt: str,
+    llm: Optional[LLMClientManager] = None,
+) -> dict[str, dict]:
+    """Run the combined structured-output analysis call (see analyze_all_categories_with_llm)."""
+    settings = get_settings()
+    llm = llm or get_llm_manager()
+
+    category_schema = _analysis_result_schema(10)
+    json_schema = {
+        "type": "object",
+        "properties": {category: category_schema for category in COMBINED_ANALYSIS_CATEGORIES},
+        "required": list(COMBINED_ANALYSIS_CATEGORIES),
+        "additionalProperties": False
+    }
+
+    cache_key = completion_cache_key(settings.model_generation_mini, 0.3, None, prompt, json_schema)
+    cached = await cached_response(cache_key, default_mode="prefer")
+    if cached is not None:
+        return cached
+
+    try:
+        response = await llm.chat_completion(
+            priority=Priority.BACKGROUND,  # Interactive generation goes first under load
+            model=settings.model_generation_mini,  # Use mini for speed
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "landing_page_combined_analysis",
+                    "strict": True,
+                    "schema": json_schema
+                }
+            },
+            temperature=0.3  # Low temperature for consistent analysis
+        )
+
+        response_content = response.choices[0].message.content
+        if not response_content:
+            raise ValueError("Empty response from OpenAI")
+
+        results = json.loads(response_content)
+
+        # Ensure scores are within bounds
+        for category in COMBINED_ANALYSIS_CATEGORIES:
+            results[category]["score"] = max(0, min(10, results[category]["score"]))
+
+        await store_response(cache_key, results)
+        return results
+
+    except Exception as e:
+        logger.error(f"Error in combined LLM analysis: {e}")
+        return {category: _fallback_analysis_result(10) for category in COMBINED_ANALYSIS_CATEGORIES}
+
+
+async def score_content_clarity(
+    content: ScrapedContent,
+    objective: ObjectiveType,
+    llm: Optional[LLMClientManager] = None,
+    result: Optional[dict] = None,
+) -> tuple[CategoryScore, list[Issue]]:
     """
     Score content clarity and messaging (25 points max).
 
@@ -146,15 +386,7 @@ async def score_content_clarity(content: ScrapedContent, objective: ObjectiveTyp
     if len(paragraphs_text) > 1000:
         paragraphs_text = paragraphs_text[:1000] + "..."
 
-    # Objective-specific requirements
-    objective_requirements = {
-        "Open Day Registration": "Event date, time, and location should be clear and prominent. What to expect at the open day.",
-        "Pre-Clearing Enquiry Form": "Course availability and next steps should be obvious. Why enquire now.",
-        "Drive Applications": "Course benefits and application deadline should be clear. Why apply to this course.",
-        "Course Information": "Course content, entry requirements, and what makes it unique should be visible."
-    }
-
-    requirement_text = objective_requirements.get(objective, "Key information for this page type")
+    requirement_text = OBJECTIVE_REQUIREMENTS.get(objective, "Key information for this page type")
 
     prompt = f"""You are evaluating a university landing page for {objective}.
 
@@ -183,8 +415,9 @@ For each issue, provide:
 
 Use plain language that non-technical marketing teams can understand and act on."""
 
-    # Get LLM analysis
-    result = await analyze_with_llm(prompt, max_score=10)
+    # Get LLM analysis (unless already provided by the combined analysis engine)
+    if result is None:
+        result = await analyze_with_llm(prompt, max_score=10, llm=llm)
 
     # Scale score to 25 points
     score = int((result["score"] / 10) * max_score)
@@ -218,7 +451,12 @@ Use plain language that non-technical marketing teams can understand and act on.
     ), issues
 
 
-async def score_page_usability(content: ScrapedContent, objective: ObjectiveType) -> tuple[CategoryScore, list[Issue]]:
+async def score_page_usability(
+    content: ScrapedContent,
+    objective: ObjectiveType,
+    llm: Optional[LLMClientManager] = None,
+    result: Optional[dict] = None,
+) -> tuple[CategoryScore, list[Issue]]:
     """
     Score page layout and usability (25 points max).
 
@@ -260,8 +498,9 @@ For each issue, provide:
 
 Use plain language that non-technical marketing teams can understand and act on. Avoid technical terms like "HTML semantics" or "DOM structure"."""
 
-    # Get LLM analysis
-    result = await analyze_with_llm(prompt, max_score=10)
+    # Get LLM analysis (unless already provided by the combined analysis engine)
+    if result is None:
+        result = await analyze_with_llm(prompt, max_score=10, llm=llm)
 
     # Scale score to 25 points
     score = int((result["score"] / 10) * max_score)
@@ -295,7 +534,12 @@ Use plain language that non-technical marketing teams can understand and act on.
     ), issues
 
 
-async def score_conversion_elements(content: ScrapedContent, objective: ObjectiveType) -> tuple[CategoryScore, list[Issue]]:
+async def score_conversion_elements(
+    content: ScrapedContent,
+    objective: ObjectiveType,
+    llm: Optional[LLMClientManager] = None,
+    result: Optional[dict] = None,
+) -> tuple[CategoryScore, list[Issue]]:
     """
     Score conversion elements (buttons, forms, videos) (25 points max).
 
@@ -316,16 +560,16 @@ async def score_conversion_elements(content: ScrapedContent, objective: Objectiv
     }
 
     expected_ctas = objective_cta_requirements.get(objective, [])
-    ctas_lower = [cta.lower() for cta in content.ctas] if content.ctas else []
+    cta_hits = KeywordIndex("\n".join(cta.lower() for cta in content.ctas))
 
     # Check for recommended buttons (bonus points)
-    has_apply_now = any("apply" in cta for cta in ctas_lower)
-    has_book_open_day = any("book" in cta or "open day" in cta for cta in ctas_lower)
-    has_download_prospectus = any("download" in cta or "prospectus" in cta for cta in ctas_lower)
+    has_apply_now = "apply" in cta_hits
+    has_book_open_day = cta_hits.any(("book", "open day"))
+    has_download_prospectus = cta_hits.any(("download", "prospectus"))
 
     # Count forms and videos as conversion elements
     has_form = len(content.forms) > 0
-    has_video = "video" in (content.markdown or "").lower() or "youtube" in (content.markdown or "").lower() or "vimeo" in (content.markdown or "").lower()
+    has_video = _has_video(content)
 
     # Prepare content context
     full_content = ""
@@ -337,15 +581,7 @@ async def score_conversion_elements(content: ScrapedContent, objective: Objectiv
     full_content += f"Forms on page: {len(content.forms)}\n"
     full_content += f"Video present: {'Yes' if has_video else 'No'}\n"
 
-    # Create objective-specific guidance
-    objective_guidance = {
-        "Open Day Registration": "For open day pages, look for 'Book Now' or 'Register' buttons prominently placed.",
-        "Pre-Clearing Enquiry Form": "For clearing enquiries, look for 'Enquire Now' or contact forms.",
-        "Drive Applications": "For application pages, 'Apply Now' buttons should be prominent and high on the page.",
-        "Course Information": "For course info pages, look for 'Learn More', 'Download Prospectus' or 'Find Out More' buttons."
-    }
-
-    guidance = objective_guidance.get(objective, "Check for clear action buttons")
+    guidance = OBJECTIVE_CTA_GUIDANCE.get(objective, "Check for clear action buttons")
 
     prompt = f"""You are evaluating conversion elements on a university {objective} page.
 
@@ -376,8 +612,9 @@ For each issue, provide:
 
 Use plain language that non-technical marketing teams can understand and act on."""
 
-    # Get LLM analysis
-    result = await analyze_with_llm(prompt, max_score=10)
+    # Get LLM analysis (unless already provided by the combined analysis engine)
+    if result is None:
+        result = await analyze_with_llm(prompt, max_score=10, llm=llm)
 
     # Scale score to 25 points
     score = int((result["score"] / 10) * max_score)
@@ -594,11 +831,10 @@ def score_education_specific(content: ScrapedContent, objective: ObjectiveType)
     score = 0
     issues = []
     max_score = 15
-    markdown_lower = (content.markdown or "").lower()
+    keywords = _page_keywords(content)
 
     # Course/program details
-    course_keywords = ["course", "program", "degree", "modules", "curriculum", "syllabus", "year"]
-    course_mentions = sum(1 for keyword in course_keywords if keyword in markdown_lower)
+    course_mentions = keywords.distinct(COURSE_KEYWORDS)
 
     if course_mentions >= 4:
         score += 5
@@ -615,8 +851,7 @@ def score_education_specific(content: ScrapedContent, objective: ObjectiveType)
         ))
 
     # Entry requirements
-    entry_keywords = ["entry", "requirements", "ucas", "points", "grades", "qualification", "a-level", "btec"]
-    if any(keyword in markdown_lower for keyword in entry_keywords):
+    if keywords.any(ENTRY_KEYWORDS):
         score += 3
     else:
         issues.append(Issue(
@@ -629,14 +864,7 @@ def score_education_specific(content: ScrapedContent, objective: ObjectiveType)
         ))
 
     # Dates and deadlines
-    date_patterns = [
-        r"\b20\d{2}\b",  # Years like 2024, 2025
-        r"\b(january|february|march|april|may|june|july|august|september|october|november|december)\b",
-        r"\bdeadline\b",
-        r"\bopen day\b",
-        r"\bstart date\b",
-    ]
-    has_dates = any(re.search(pattern, markdown_lower) for pattern in date_patterns)
+    has_dates = _DATE_PATTERN.search(content.markdown_lower) is not None
 
     if has_dates:
         score += 3
@@ -661,8 +889,7 @@ def score_education_specific(content: ScrapedContent, objective: ObjectiveType)
             ))
 
     # Student life/campus info
-    campus_keywords = ["campus", "accommodation", "facilities", "library", "sports", "societies", "student life", "location"]
-    campus_mentions = sum(1 for keyword in campus_keywords if keyword in markdown_lower)
+    campus_mentions = keywords.distinct(CAMPUS_KEYWORDS)
 
     if campus_mentions >= 2:
         score += 2
@@ -670,8 +897,7 @@ def score_education_specific(content: ScrapedContent, objective: ObjectiveType)
         score += 1
 
     # Career outcomes
-    career_keywords = ["career", "employment", "graduate", "job", "salary", "employer", "placement", "internship"]
-    career_mentions = sum(1 for keyword in career_keywords if keyword in markdown_lower)
+    career_mentions = keywords.distinct(CAREER_KEYWORDS)
 
     if career_mentions >= 2:
         score += 2
@@ -811,22 +1037,106 @@ def extract_quick_wins(all_issues: list[Issue]) -> list[str]:
 
 def create_page_summary(content: ScrapedContent) -> PageSummary:
     """Create a summary of the page content."""
+    keywords = _page_keywords(content)
     return PageSummary(
         title=content.title,
         h1=content.h1[0] if content.h1 else None,
         meta_description=content.meta_description,
         cta_count=len(content.ctas),
         form_count=len(content.forms),
-        has_testimonials="testimonial" in (content.markdown or "").lower() or "review" in (content.markdown or "").lower(),
-        has_rankings="ranked" in (content.markdown or "").lower() or "ranking" in (content.markdown or "").lower(),
+        has_testimonials=keywords.any(TESTIMONIAL_KEYWORDS),
+        has_rankings=keywords.any(RANKING_KEYWORDS),
         word_count=content.word_count
     )
 
 
+async def _score_category_with_fallback(
+    scorer: Awaitable[tuple[CategoryScore, list[Issue]]],
+    category: str,
+    timeout: float,
+    max_score: int = 25,
+) -> tuple[CategoryScore, list[Issue]]:
+    """
+    Run a category scorer with a timeout, falling back to a neutral 50% score.
+
+    The fallback mirrors the one analyze_with_llm returns on errors, so a slow or
+    failing category does not hold up or break the other categories.
+    """
+    try:
+        return await asyncio.wait_for(scorer, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"{category} scoring timed out after {timeout:.1f}s, using fallback score")
+    except Exception as e:
+        logger.error(f"{category} scoring failed: {e}", exc_info=True)
+
+    score = max_score // 2
+    percentage = int((score / max_score) * 100)
+    return CategoryScore(
+        score=score,
+        max=max_score,
+        grade=calculate_letter_grade(percentage),
+        percentage=percentage
+    ), [
+        Issue(category=category, severity="medium", **issue_data)
+        for issue_data in _fallback_analysis_result(10)["issues"]
+    ]
+
+
+def _page_key(content: ScrapedContent, objective: ObjectiveType) -> str:
+    """Key identifying a scraped page's content for a given objective."""
+    return hash_key(objective, content.title, content.markdown, content.h1, content.paragraphs, content.word_count)
+
+
+def _remember_scores(key: str, scores: dict[str, CategoryScore], issues: list[Issue]) -> None:
+    _last_good_scores[key] = (scores, issues)
+    _last_good_scores.move_to_end(key)
+    while len(_last_good_scores) > _LAST_GOOD_MAX_ENTRIES:
+        _last_good_scores.popitem(last=False)
+
+
+def _deterministic_scores(
+    content: ScrapedContent,
+    objective: ObjectiveType,
+) -> tuple[dict[str, CategoryScore], list[Issue]]:
+    """
+    Score the LLM categories from the rule-based technical SEO and
+    education-specific checks, for when OpenAI is unavailable.
+
+    Each category gets the combined percentage of the two rule-based scorers.
+    """
+    seo_score, seo_issues = score_technical_seo(content)
+    education_score, education_issues = score_education_specific(content, objective)
+
+    max_score = 25
+    ratio = (seo_score.score + education_score.score) / (seo_score.max + education_score.max)
+    score = round(max_score * ratio)
+    percentage = int((score / max_score) * 100)
+    category_score = CategoryScore(
+        score=score,
+        max=max_score,
+        grade=calculate_letter_grade(percentage),
+        percentage=percentage
+    )
+
+    issues = [
+        Issue(
+            category="Analysis",
+            severity="low",
+            title="AI analysis temporarily unavailable",
+            description="Scores are based on automated technical and content checks only.",
+            suggestion="Re-run the analysis later for detailed copy, usability and conversion feedback"
+        ),
+        *seo_issues,
+        *education_issues,
+    ]
+    return {category: category_score for category in COMBINED_ANALYSIS_CATEGORIES}, issues
+
+
 async def calculate_overall_score(
     content: ScrapedContent,
     objective: ObjectiveType,
-    analysis_start_time: datetime
+    analysis_start_time: datetime,
+    llm: Optional[LLMClientManager] = None,
 ) -> OptimizeResponse:
     """
     Calculate overall landing page score across 3 UX-focused categories.
@@ -837,19 +1147,39 @@ async def calculate_overall_score(
     - Conversion Elements: 25 points
     Total: 75 points → scaled to 0-100
 
-    Returns comprehensive OptimizeResponse with scores, issues, and recommendations.
-    """
-    all_issues = []
+    The three categories are scored concurrently, each with its own timeout
+    (analysis_category_timeout_seconds) and fallback score. With
+    analysis_engine="combined" a single shared LLM call scores all three
+    instead, still within each category's timeout.
 
-    # Score each category (3 categories, 25 points each)
-    content_score, content_issues = await score_content_clarity(content, objective)
-    all_issues.extend(content_issues)
+    While OpenAI's circuit breaker is open no LLM calls are made: the last good
+    scores for the same page are reused if known, otherwise the rule-based
+    checks are used (see _deterministic_scores). The same happens when less
+    than deadline_llm_min_seconds of the request deadline is left, and the
+    category timeouts are shortened to the remaining budget.
 
-    usability_score, usability_issues = await score_page_usability(content, objective)
-    all_issues.extend(usability_issues)
+    Returns comprehensive OptimizeResponse with scores, issues, and recommendations.
+    """
+    settings = get_settings()
+    page_key = _page_key(content, objective)
+
+    openai_available = is_available("openai")
+    if not openai_available or not has_budget(settings.deadline_llm_min_seconds):
+        if openai_available:
+            skip_stage("llm_analysis")
+        cached = _last_good_scores.get(page_key)
+        analysis_mode = "cached" if cached is not None else "deterministic"
+        scores, all_issues = cached or _deterministic_scores(content, objective)
+        logger.warning(f"LLM analysis unavailable, using {analysis_mode} landing page scores")
+    else:
+        analysis_mode = "llm"
+        scores, all_issues = await _score_llm_categories(content, objective, llm)
+        if not any(issue.title == "Analysis unavailable" for issue in all_issues):
+            _remember_scores(page_key, scores, all_issues)
 
-    conversion_score, conversion_issues = await score_conversion_elements(content, objective)
-    all_issues.extend(conversion_issues)
+    content_score = scores["content_clarity"]
+    usability_score = scores["page_usability"]
+    conversion_score = scores["conversion_elements"]
 
     # Calculate overall score (out of 75 points)
     overall_score = (
@@ -887,5 +1217,66 @@ async def calculate_overall_score(
         quick_wins=quick_wins,
         summary=summary,
         scraped_at=datetime.now(),
-        analysis_time_ms=analysis_time_ms
+        analysis_time_ms=analysis_time_ms,
+        analysis_mode=analysis_mode,
     )
+
+
+async def _score_llm_categories(
+    content: ScrapedContent,
+    objective: ObjectiveType,
+    llm: Optional[LLMClientManager] = None,
+) -> tuple[dict[str, CategoryScore], list[Issue]]:
+    """Score the three LLM-backed categories (see calculate_overall_score)."""
+    settings = get_settings()
+    all_issues = []
+    timeout = stage_timeout(settings.analysis_category_timeout_seconds)
+
+    # In combined mode one shared LLM call scores all three categories; each
+    # category waits on it within its own timeout, as it would on its own call.
+    combined: Optional[asyncio.Task] = None
+    if settings.analysis_engine == "combined":
+        combined = asyncio.create_task(analyze_all_categories_with_llm(content, objective, llm=llm))
+
+    async def score(scorer, key: str) -> tuple[CategoryScore, list[Issue]]:
+        # Shielded so one category timing out doesn't cancel the call for the others
+        result = (await asyncio.shield(combined))[key] if combined is not None else None
+        return await scorer(content, objective, llm=llm, result=result)
+
+    # Score each category concurrently (3 categories, 25 points each).
+    # Results are merged in a fixed order so issues and quick wins stay deterministic.
+    try:
+        (
+            (content_score, content_issues),
+            (usability_score, usability_issues),
+            (conversion_score, conversion_issues),
+        ) = await asyncio.gather(
+            _score_category_with_fallback(
+                score(score_content_clarity, "content_clarity"),
+                category="Content Clarity",
+                timeout=timeout,
+            ),
+            _score_category_with_fallback(
+                score(score_page_usability, "page_usability"),
+                category="Page Usability",
+                timeout=timeout,
+            ),
+            _score_category_with_fallback(
+                score(score_conversion_elements, "conversion_elements"),
+                category="Conversion Elements",
+                timeout=timeout,
+            ),
+        )
+    finally:
+        if combined is not None:
+            combined.cancel()
+    all_issues.extend(content_issues)
+    all_issues.extend(usability_issues)
+    all_issues.extend(conversion_issues)
+
+    scores = {
+        "content_clarity": content_score,
+        "page_usability": usability_score,
+        "conversion_elements": conversion_score,
+    }
+    return scores, all_issues
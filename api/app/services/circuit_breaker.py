@@ -0,0 +1,195 @@
+"""Circuit breakers that fail fast while an upstream dependency is degraded."""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Optional
+
+from app.deps import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is unavailable (circuit open, retrying in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for one dependency.
+
+    Closed: calls go through and their outcome and latency are recorded. Once
+    the window holds at least `min_calls` calls and the failure rate or slow
+    call rate crosses its threshold, the breaker opens.
+
+    Open: calls are refused immediately for `open_seconds`, so callers fall
+    back instead of waiting out timeouts.
+
+    Half-open: after the cool-down up to `half_open_probes` calls are let
+    through; a healthy probe closes the breaker, a failed or slow one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float,
+        min_calls: int,
+        failure_rate_threshold: float,
+        slow_call_seconds: float,
+        slow_call_rate_threshold: float,
+        open_seconds: float,
+        half_open_probes: int = 1,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = "closed"  # closed | open | half_open
+        self._calls: deque[tuple[float, bool, bool]] = deque()  # (finished_at, failed, slow)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _rates(self) -> tuple[float, float]:
+        if not self._calls:
+            return 0.0, 0.0
+        failures = sum(1 for _, failed, _ in self._calls if failed)
+        slow = sum(1 for _, _, is_slow in self._calls if is_slow)
+        return failures / len(self._calls), slow / len(self._calls)
+
+    def _open(self, now: float, reason: str) -> None:
+        self.state = "open"
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self.times_opened += 1
+        logger.warning(f"Circuit for {self.name} opened: {reason}")
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker starts probing (0 unless open)."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now (claims a probe slot when half-open)."""
+        if self.state == "open":
+            if self.retry_in() > 0:
+                self.rejected += 1
+                return False
+            self.state = "half_open"
+            logger.info(f"Circuit for {self.name} half-open, probing")
+
+        if self.state == "half_open":
+            if self._probes_in_flight >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+
+        return True
+
+    def before_call(self) -> None:
+        """Claim permission for a call, or raise CircuitOpenError."""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def record(self, success: bool, duration: float) -> None:
+        """Record the outcome of a call that allow()/before_call() let through."""
+        now = time.monotonic()
+        slow = duration >= self.slow_call_seconds
+
+        if self.state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if success and not slow:
+                self.state = "closed"
+                self._calls.clear()
+                logger.info(f"Circuit for {self.name} closed after a healthy probe")
+            else:
+                self._open(now, "probe failed" if not success else f"probe took {duration:.1f}s")
+            return
+
+        if self.state == "open":
+            return  # A call from before the breaker opened
+
+        self._calls.append((now, not success, slow))
+        self._trim(now)
+        if len(self._calls) < self.min_calls:
+            return
+
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.failure_rate_threshold:
+            self._open(now, f"{failure_rate:.0%} of the last {len(self._calls)} calls failed")
+        elif slow_rate >= self.slow_call_rate_threshold:
+            self._open(now, f"{slow_rate:.0%} of the last {len(self._calls)} calls took over {self.slow_call_seconds}s")
+
+    def release(self) -> None:
+        """Give back a call slot without recording an outcome (e.g. the call was cancelled)."""
+        if self.state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open" and self.retry_in() > 0
+
+    def stats(self) -> dict[str, Any]:
+        self._trim(time.monotonic())
+        failure_rate, slow_rate = self._rates()
+        return {
+            "name": self.name,
+            "state": self.state,
+            "calls": len(self._calls),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str, settings: Optional[Settings] = None) -> Optional[CircuitBreaker]:
+    """Get the process-wide breaker for a dependency (None when breakers are disabled)."""
+    settings = settings or get_settings()
+    if not settings.breaker_enabled:
+        return None
+
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(
+            name,
+            window_seconds=settings.breaker_window_seconds,
+            min_calls=settings.breaker_min_calls,
+            failure_rate_threshold=settings.breaker_failure_rate,
+            slow_call_seconds=settings.breaker_slow_call_seconds,
+            slow_call_rate_threshold=settings.breaker_slow_call_rate,
+            open_seconds=settings.breaker_open_seconds,
+            half_open_probes=settings.breaker_half_open_probes,
+        )
+    return breaker
+
+
+def is_available(name: str) -> bool:
+    """False while the named dependency's breaker is open (without claiming a call)."""
+    breaker = get_breaker(name)
+    return breaker is None or not breaker.is_open
+
+
+def breaker_stats() -> list[dict[str, Any]]:
+    """State of every breaker created so far."""
+    return [breaker.stats() for _, breaker in sorted(_breakers.items())]
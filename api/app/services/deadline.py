@@ -0,0 +1,132 @@
+"""Per-request latency budgets carried through the call stack in context variables."""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+from app.deps import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_skipped: ContextVar[Optional[list[str]]] = ContextVar("skipped_stages", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's latency budget ran out before a stage could finish."""
+
+
+def resolve_budget(*candidates_ms: Optional[int]) -> float:
+    """
+    Pick the request budget in seconds: the first given candidate (request
+    field, then header) or the server default, capped at the server maximum.
+    """
+    settings = get_settings()
+    budget = next(
+        (ms / 1000 for ms in candidates_ms if ms is not None and ms > 0),
+        settings.request_deadline_seconds,
+    )
+    return min(budget, settings.request_deadline_max_seconds)
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[list[str]]:
+    """
+    Run the block (and tasks it starts) under a deadline `seconds` from now.
+
+    A nested scope can only shorten an outer deadline. Yields the list that
+    collects stages skipped for lack of budget.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+
+    skipped = _skipped.get()
+    if skipped is None:
+        skipped = []
+
+    deadline_token = _deadline.set(deadline)
+    skipped_token = _skipped.set(skipped)
+    try:
+        yield skipped
+    finally:
+        _deadline.reset(deadline_token)
+        _skipped.reset(skipped_token)
+
+
+def detached_context() -> Context:
+    """
+    A copy of the current context for work shared between requests.
+
+    The work gets its own deadline (REQUEST_DEADLINE_MAX_SECONDS from now)
+    instead of that of the request that happened to start it, and does not
+    report skipped stages to that request. Other context (cache mode, LLM
+    priority) is kept.
+    """
+    context = copy_context()
+    context.run(_deadline.set, time.monotonic() + get_settings().request_deadline_max_seconds)
+    context.run(_skipped.set, None)
+    return context
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget (None when there is no deadline)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def stage_timeout(default: float) -> float:
+    """A stage's own timeout, shortened to the remaining budget."""
+    left = remaining()
+    return default if left is None else min(default, left)
+
+
+def has_budget(min_seconds: float) -> bool:
+    """Whether at least `min_seconds` of the budget is left (always True without a deadline)."""
+    left = remaining()
+    return left is None or left >= min_seconds
+
+
+def skip_stage(stage: str) -> None:
+    """Record that an optional stage was skipped to stay within the deadline."""
+    logger.info(f"Skipping {stage}: {remaining() or 0:.1f}s of request budget left")
+    skipped = _skipped.get()
+    if skipped is not None and stage not in skipped:
+        skipped.append(stage)
+
+
+async def within_deadline(awaitable: Awaitable[T], default_timeout: Optional[float] = None) -> T:
+    """
+    Await `awaitable` within the remaining budget (and `default_timeout`, if given).
+
+    Raises DeadlineExceeded when the request budget, rather than the stage's
+    own timeout, cuts it short.
+    """
+    left = remaining()
+    if left is None:
+        if default_timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout=default_timeout)
+
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        elif isinstance(awaitable, asyncio.Future):
+            awaitable.cancel()
+        raise DeadlineExceeded("Request deadline exceeded")
+
+    timeout = left if default_timeout is None else min(left, default_timeout)
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    except asyncio.TimeoutError:
+        if timeout < (default_timeout or float("inf")):
+            raise DeadlineExceeded("Request deadline exceeded")
+        raise
@@ -0,0 +1,188 @@
+"""Single-pass extraction of page structure from parsed HTML."""
+
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from selectolax.parser import HTMLParser, Node
+
+from app.services.keywords import contains_any
+
+if TYPE_CHECKING:
+    from app.services.scrape import ScrapedContent
+
+# Keywords that mark a button or link as a call to action
+CTA_KEYWORDS = (
+    "register",
+    "apply",
+    "book",
+    "enquire",
+    "download",
+    "sign up",
+    "get started",
+    "learn more",
+    "find out",
+    "discover",
+    "explore",
+    "join",
+    "visit",
+    "open day",
+    "prospectus",
+    "contact",
+    "get in touch",
+)
+
+# Elements whose text is not page copy
+_NON_CONTENT_TAGS = ["script", "style", "noscript", "template"]
+_CTA_CLASS_SELECTOR = ".cta, .btn, .button"
+_FORM_FIELD_TAGS = {"input", "textarea", "select"}
+_MAX_PARAGRAPHS = 5
+# Images and links are only collected from page content, not the site chrome around it
+_MAIN_CONTAINERS = ("main", "[role=main]")
+_CHROME_CONTAINERS = ("nav", "aside", "footer", "[role=navigation]", "[role=contentinfo]")
+_SCOPED_TAGS = ("img", "a")
+
+
+def is_cta_text(text: str) -> bool:
+    """Whether button or link text reads like a call to action."""
+    return contains_any(text.lower(), CTA_KEYWORDS)
+
+
+def cta_texts(texts: Iterable[str]) -> list[str]:
+    """The distinct texts that read like calls to action, in order."""
+    seen: set[str] = set()
+    ctas = []
+    for text in texts:
+        if text and text not in seen and is_cta_text(text):
+            seen.add(text)
+            ctas.append(text)
+    return ctas
+
+
+def _descendant_ids(tree: HTMLParser, containers: Iterable[str]) -> set[int]:
+    """Ids of the images and links inside any of `containers` (one selector match)."""
+    selector = ", ".join(f"{container} {tag}" for container in containers for tag in _SCOPED_TAGS)
+    return {node.mem_id for node in tree.css(selector)}
+
+
+def _content_ids(tree: HTMLParser) -> set[int]:
+    """
+    Ids of the images and links that belong to the page content.
+
+    That is everything inside <main> (or role=main) when the page has one,
+    otherwise everything outside the site header. Navigation, sidebars and
+    footers never count.
+    """
+    chrome = list(_CHROME_CONTAINERS)
+    if tree.css_first(", ".join(_MAIN_CONTAINERS)) is not None:
+        allowed = _descendant_ids(tree, _MAIN_CONTAINERS)
+    else:
+        allowed = {node.mem_id for node in tree.css(", ".join(_SCOPED_TAGS))}
+        chrome += ["header", "[role=banner]"]
+    return allowed - _descendant_ids(tree, chrome)
+
+
+def _enclosing_form(node: Node) -> Optional[int]:
+    parent = node.parent
+    while parent is not None:
+        if parent.tag == "form":
+            return parent.mem_id
+        parent = parent.parent
+    return None
+
+
+def extract_html(html: str, content: "ScrapedContent") -> None:
+    """
+    Fill `content` from an HTML document in a single walk over its elements.
+
+    Collects title, meta description, h1/h2 headings, CTAs (CTA-styled
+    elements containing a CTA keyword, or any button), forms with their field
+    counts, images with alt presence, links with anchor text, the first
+    paragraphs and the body word count. Each collected element's text is
+    extracted once. Script and style content is dropped up front so it
+    neither costs traversal time nor counts as words.
+
+    Images and links are scoped to the page content (see `_content_ids`), so
+    logos and menus don't skew the image alt-text check (score_technical_seo,
+    used for the rule-based scores when OpenAI is unavailable).
+    """
+    tree = HTMLParser(html)
+    if tree.root is None:
+        return
+    tree.strip_tags(_NON_CONTENT_TAGS)
+
+    # Class-based CTA containers, matched by lexbor rather than reading every node's attributes
+    cta_classed = {node.mem_id for node in tree.css(_CTA_CLASS_SELECTOR)}
+    content_ids = _content_ids(tree)
+
+    h1: list[str] = []
+    h2: list[str] = []
+    ctas: list[str] = []
+    seen_ctas: set[str] = set()
+    forms: dict[int, dict] = {}
+    images: list[dict] = []
+    links: list[dict] = []
+    paragraphs: list[str] = []
+
+    for node in tree.root.traverse():
+        tag = node.tag
+        is_cta = tag == "button" or node.mem_id in cta_classed
+        href = None
+
+        if tag == "a":
+            attributes = node.attributes
+            href = attributes.get("href")
+            is_cta = is_cta or attributes.get("role") == "button"
+        elif tag in ("h1", "h2"):
+            text = node.text().strip()
+            if text:
+                (h1 if tag == "h1" else h2).append(text)
+        elif tag == "p":
+            if len(paragraphs) < _MAX_PARAGRAPHS:
+                text = node.text().strip()
+                if text:
+                    paragraphs.append(text)
+        elif tag in _FORM_FIELD_TAGS:
+            form_id = _enclosing_form(node)
+            if form_id in forms:
+                forms[form_id]["inputs"] += 1
+            if tag == "input":
+                is_cta = is_cta or (node.attributes.get("type") or "").lower() == "submit"
+        elif tag == "form":
+            forms[node.mem_id] = {"inputs": 0}
+        elif tag == "img":
+            if node.mem_id not in content_ids:
+                continue
+            attributes = node.attributes
+            images.append({
+                "src": attributes.get("src"),
+                "has_alt": bool((attributes.get("alt") or "").strip()),
+            })
+        elif tag == "title":
+            if content.title is None:
+                content.title = node.text().strip()
+        elif tag == "meta":
+            attributes = node.attributes
+            if content.meta_description is None and attributes.get("name") == "description":
+                content.meta_description = (attributes.get("content") or "").strip()
+
+        if not is_cta and href is None:
+            continue
+
+        text = node.text().strip()
+        if href is not None and node.mem_id in content_ids:
+            links.append({"href": href, "text": text})
+        if is_cta and text and text not in seen_ctas:
+            if tag in ("button", "input") or is_cta_text(text):
+                seen_ctas.add(text)
+                ctas.append(text)
+
+    content.h1 = h1
+    content.h2 = h2
+    content.h3 = []  # Not needed - removed to reduce noise
+    content.ctas = ctas
+    content.forms = list(forms.values())
+    content.images = images
+    content.links = links
+    content.paragraphs = paragraphs
+
+    body = tree.body
+    content.word_count = len(body.text(separator=" ").split()) if body is not None else 0
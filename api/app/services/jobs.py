@@ -0,0 +1,558 @@
+"""In-process background jobs for long-running generation and analysis requests."""
+
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+from app.deps import Settings, get_settings
+from app.services.llm_scheduler import Priority, llm_priority
+from app.services.scrape_client import get_scrape_client
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+FINISHED_STATUSES = {"succeeded", "failed", "cancelled"}
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class CallbackURLError(ValueError):
+    """Raised when a callback URL points somewhere the server must not call."""
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address)
+    return ip.is_global and not ip.is_multicast
+
+
+def check_callback_url(url: str, allowed_hosts: list[str]) -> None:
+    """
+    Reject callback URLs that would make the server call into its own network.
+
+    With an allowlist, the host must be listed (or be a subdomain of an entry
+    starting with "."). Without one, any host is accepted except localhost and
+    non-public IP literals; hostnames are checked again when the callback is
+    sent, once they are resolved.
+
+    Raises:
+        CallbackURLError: If the URL is not allowed
+    """
+    parsed = httpx.URL(url)
+    host = (parsed.host or "").lower().rstrip(".")
+    if parsed.scheme not in ("http", "https") or not host:
+        raise CallbackURLError("Callback URL must be an absolute http(s) URL")
+
+    if allowed_hosts:
+        if not any(host == entry or (entry.startswith(".") and host.endswith(entry)) for entry in allowed_hosts):
+            raise CallbackURLError(f"Callback host '{host}' is not in JOBS_CALLBACK_ALLOWED_HOSTS")
+        return
+
+    if host == "localhost" or host.endswith(".localhost"):
+        raise CallbackURLError("Callback URL must not point at localhost")
+    try:
+        public = _is_public_address(host)
+    except ValueError:
+        return  # A hostname, checked once resolved
+    if not public:
+        raise CallbackURLError(f"Callback address {host} is not a public address")
+
+
+@dataclass
+class Job:
+    """A submitted job and, once finished, its result or error."""
+
+    id: str
+    kind: str
+    payload: dict[str, Any]
+    status: str = "queued"  # queued | running | succeeded | failed | cancelled
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    callback_url: Optional[str] = None
+    owner: Optional[str] = None  # JobManager.owner of the process that runs it
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+
+class JobStore:
+    """Persistence interface for jobs; subclasses decide where jobs live."""
+
+    async def save(self, job: Job) -> None:
+        raise NotImplementedError
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        raise NotImplementedError
+
+    async def finish(self, job: Job) -> bool:
+        """
+        Save a job that has just finished, unless it was cancelled meanwhile.
+
+        Returns False (leaving the stored job alone) if another process
+        sharing the store cancelled the job while it ran.
+        """
+        raise NotImplementedError
+
+    async def delete_finished_before(self, cutoff: float) -> int:
+        """Delete finished jobs older than `cutoff` (epoch seconds) and return the count."""
+        raise NotImplementedError
+
+    async def heartbeat(self, owner: str) -> None:
+        """Renew the lease on every unfinished job owned by `owner`."""
+        raise NotImplementedError
+
+    async def fail_unfinished(self, error: str, owner: str, stale_before: float) -> int:
+        """
+        Mark jobs abandoned by another process as failed.
+
+        Only unfinished jobs not owned by `owner` whose lease was last renewed
+        before `stale_before` (epoch seconds) are failed, so jobs held by other
+        live workers sharing the store are left alone.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryJobStore(JobStore):
+    """Keeps jobs in a dict; jobs are lost on restart."""
+
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def finish(self, job: Job) -> bool:
+        await self.save(job)
+        return True  # Only this process can cancel these jobs
+
+    async def delete_finished_before(self, cutoff: float) -> int:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and (job.finished_at or 0) < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    async def heartbeat(self, owner: str) -> None:
+        pass
+
+    async def fail_unfinished(self, error: str, owner: str, stale_before: float) -> int:
+        return 0  # Only this process can see these jobs
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Stores jobs in a SQLite file so results survive restarts and are visible to every worker process.
+
+    Each row records the process that owns it and when that process last
+    renewed its lease, so a restarting worker only fails jobs whose owner
+    stopped renewing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                finished_at REAL,
+                data TEXT NOT NULL,
+                owner TEXT,
+                heartbeat_at REAL
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self._conn.commit()
+        self._lock = asyncio.Lock()
+
+    async def _run(self, fn: Callable[[], Any]) -> Any:
+        async with self._lock:
+            return await asyncio.to_thread(fn)
+
+    async def save(self, job: Job) -> None:
+        def write() -> None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, kind, status, finished_at, data, owner, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.kind, job.status, job.finished_at, json.dumps(asdict(job)), job.owner, time.time()),
+            )
+            self._conn.commit()
+
+        await self._run(write)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        row = await self._run(
+            lambda: self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        )
+        return Job(**json.loads(row[0])) if row else None
+
+    async def finish(self, job: Job) -> bool:
+        def write() -> bool:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, data = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status != 'cancelled'",
+                (job.status, job.finished_at, json.dumps(asdict(job)), time.time(), job.id),
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+        return await self._run(write)
+
+    async def delete_finished_before(self, cutoff: float) -> int:
+        def delete() -> int:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+        return await self._run(delete)
+
+    async def heartbeat(self, owner: str) -> None:
+        def renew() -> None:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                (time.time(), owner),
+            )
+            self._conn.commit()
+
+        await self._run(renew)
+
+    async def fail_unfinished(self, error: str, owner: str, stale_before: float) -> int:
+        def fail() -> int:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE status IN ('queued', 'running') "
+                "AND (owner IS NULL OR owner != ?) AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (owner, stale_before),
+            ).fetchall()
+            for (data,) in rows:
+                job = Job(**json.loads(data))
+                job.status, job.error, job.finished_at = "failed", error, time.time()
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, data = ? WHERE id = ?",
+                    (job.status, job.finished_at, json.dumps(asdict(job)), job.id),
+                )
+            self._conn.commit()
+            return len(rows)
+
+        return await self._run(fail)
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+
+
+class JobManager:
+    """
+    Runs submitted jobs on a fixed pool of worker tasks.
+
+    Jobs wait in a bounded queue, so the server (not the number of open client
+    connections) decides how much generation/analysis runs at once. Finished
+    jobs are kept for `result_ttl_seconds` and then purged.
+
+    Jobs are owned by the manager that queued them, which renews their lease
+    every `lease_seconds / 3`. Unfinished jobs whose lease has run out belong
+    to a process that died and are marked failed by whichever manager notices.
+    A job cancelled through another process is stopped by its owner at the
+    next lease renewal, and its cancellation is never overwritten.
+    """
+
+    def __init__(self, store: JobStore, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        self.store = store
+        self.workers = settings.jobs_workers
+        self.result_ttl_seconds = settings.jobs_result_ttl_seconds
+        self.callback_timeout_seconds = settings.jobs_callback_timeout_seconds
+        self.callback_allowed_hosts = settings.jobs_callback_allowed_hosts_list
+        self.lease_seconds = settings.jobs_lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: dict[str, JobHandler] = {}
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=settings.jobs_max_queued)
+        self._reserved = 0  # Queue slots held by submits still saving their job
+        self._running: dict[str, asyncio.Task] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._callbacks: set[asyncio.Task] = set()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Register the coroutine that runs jobs of `kind`."""
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self) -> list[str]:
+        return sorted(self._handlers)
+
+    async def start(self) -> None:
+        await self._fail_abandoned()
+
+        self._tasks = [
+            asyncio.create_task(self._worker(idx), name=f"job-worker-{idx}")
+            for idx in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._purge_expired(), name="job-purge"))
+        self._tasks.append(asyncio.create_task(self._renew_leases(), name="job-lease"))
+        logger.info(f"Job manager {self.owner} started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._callbacks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        await self.store.close()
+        logger.info("Job manager stopped")
+
+    async def submit(self, kind: str, payload: dict[str, Any], callback_url: Optional[str] = None) -> Job:
+        """Queue a job and return it immediately."""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        if callback_url:
+            check_callback_url(callback_url, self.callback_allowed_hosts)
+        # Hold a slot while the job is saved so concurrent submits can't overfill the queue
+        if self._queue.maxsize > 0 and self._queue.qsize() + self._reserved >= self._queue.maxsize:
+            raise JobQueueFullError(f"Job queue is full ({self._queue.maxsize} jobs waiting)")
+
+        job = Job(id=uuid.uuid4().hex, kind=kind, payload=payload, callback_url=callback_url, owner=self.owner)
+        self._reserved += 1
+        try:
+            await self.store.save(job)
+        finally:
+            self._reserved -= 1
+        self._queue.put_nowait(job.id)
+        logger.info(f"Queued {kind} job {job.id} ({self._queue.qsize()} waiting)")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await self.store.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; finished jobs are returned unchanged."""
+        job = await self.store.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        task = self._running.get(job_id)
+        if task is not None:
+            # The worker records the cancellation when the task unwinds
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return await self.store.get(job_id)
+
+        job.status, job.finished_at = "cancelled", time.time()
+        await self.store.save(job)
+        return job
+
+    def stats(self) -> dict[str, int]:
+        return {"workers": self.workers, "queued": self._queue.qsize(), "running": len(self._running)}
+
+    async def _worker(self, idx: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self.store.get(job_id)
+                if job is None or job.status != "queued":
+                    continue  # Cancelled or purged while waiting
+
+                task = asyncio.create_task(self._run(job))
+                self._running[job_id] = task
+                try:
+                    await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    if not task.done():
+                        # Worker itself is shutting down; let the job record its cancellation
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                        raise
+                finally:
+                    self._running.pop(job_id, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {idx} failed handling job {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status, job.started_at = "running", time.time()
+        await self.store.save(job)
+        logger.info(f"Running {job.kind} job {job.id}")
+
+        try:
+            # Nobody is waiting on a socket for a job, so queue its LLM calls behind interactive ones
+            with llm_priority(Priority.BACKGROUND):
+                job.result = await self._handlers[job.kind](job.payload)
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.status, job.error = "failed", str(getattr(e, "detail", None) or e)
+
+        job.finished_at = time.time()
+        if not await self.store.finish(job):
+            logger.info(f"Job {job.id} was cancelled by another process; discarding its {job.status} result")
+            job = await self.store.get(job.id) or job
+        else:
+            logger.info(f"Job {job.id} {job.status} in {int((job.finished_at - job.started_at) * 1000)}ms")
+
+        if job.callback_url:
+            task = asyncio.create_task(self._send_callback(job))
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+
+    async def _callback_request(self, url: str) -> tuple[httpx.URL, dict[str, str], dict[str, Any]]:
+        """
+        Resolve and check a callback URL, returning the URL, headers and extensions to send with.
+
+        Unless the host is allowlisted, the request is pinned to the address
+        that was checked (with the original Host header and TLS server name),
+        so a DNS answer that changes after the check can't redirect it.
+        """
+        check_callback_url(url, self.callback_allowed_hosts)
+        parsed = httpx.URL(url)
+        if self.callback_allowed_hosts:
+            return parsed, {}, {}
+
+        try:
+            ipaddress.ip_address(parsed.host)
+            return parsed, {}, {}  # IP literal, already checked
+        except ValueError:
+            pass
+
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parsed.host, parsed.port or (443 if parsed.scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        blocked = [address for address in addresses if not _is_public_address(address)]
+        if not addresses or blocked:
+            raise CallbackURLError(f"Callback host '{parsed.host}' resolves to non-public address {blocked}")
+
+        return (
+            parsed.copy_with(host=addresses[0]),
+            {"Host": parsed.netloc.decode("ascii")},
+            {"sni_hostname": parsed.host},
+        )
+
+    async def _send_callback(self, job: Job) -> None:
+        """POST the finished job to its callback URL over the shared client (best effort)."""
+        body = {
+            "job_id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "result": job.result,
+            "error": job.error,
+        }
+        try:
+            url, headers, extensions = await self._callback_request(job.callback_url)
+            response = await get_scrape_client().client.post(
+                url,
+                json=body,
+                headers=headers,
+                extensions=extensions,
+                timeout=self.callback_timeout_seconds,
+                follow_redirects=False,
+            )
+            response.raise_for_status()
+            logger.info(f"Delivered callback for job {job.id}")
+        except Exception as e:
+            logger.warning(f"Callback for job {job.id} to {job.callback_url} failed: {e}")
+
+    async def _fail_abandoned(self) -> None:
+        """Fail unfinished jobs whose owning process stopped renewing their lease."""
+        failed = await self.store.fail_unfinished(
+            "Interrupted by server restart", self.owner, time.time() - self.lease_seconds
+        )
+        if failed:
+            logger.warning(f"Marked {failed} unfinished jobs abandoned by another process as failed")
+
+    async def _stop_cancelled(self) -> None:
+        """Cancel running jobs that another process marked cancelled in the shared store."""
+        for job_id, task in list(self._running.items()):
+            job = await self.store.get(job_id)
+            if job is not None and job.status == "cancelled" and not task.done():
+                logger.info(f"Job {job_id} was cancelled by another process; stopping it")
+                task.cancel()
+
+    async def _renew_leases(self) -> None:
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.store.heartbeat(self.owner)
+                await self._stop_cancelled()
+                await self._fail_abandoned()
+            except Exception as e:
+                logger.error(f"Error renewing job leases: {e}")
+
+    async def _purge_expired(self) -> None:
+        interval = max(1.0, min(60.0, self.result_ttl_seconds / 10))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                purged = await self.store.delete_finished_before(time.time() - self.result_ttl_seconds)
+                if purged:
+                    logger.info(f"Purged {purged} expired jobs")
+            except Exception as e:
+                logger.error(f"Error purging expired jobs: {e}")
+
+
+def create_job_store(settings: Optional[Settings] = None) -> JobStore:
+    """Create the job store selected by JOBS_STORE."""
+    settings = settings or get_settings()
+    if settings.jobs_store == "sqlite":
+        return SQLiteJobStore(settings.jobs_sqlite_path)
+    return MemoryJobStore()
+
+
+_manager: Optional[JobManager] = None
+
+
+async def start_job_manager(handlers: dict[str, JobHandler]) -> JobManager:
+    """Create and start the process-wide job manager (called from the app lifespan)."""
+    global _manager
+    settings = get_settings()
+    _manager = JobManager(create_job_store(settings), settings)
+    for kind, handler in handlers.items():
+        _manager.register(kind, handler)
+    await _manager.start()
+    return _manager
+
+
+def get_job_manager() -> Optional[JobManager]:
+    """Return the running job manager, if any."""
+    return _manager
+
+
+async def stop_job_manager() -> None:
+    """Stop the job manager on shutdown."""
+    global _manager
+    if _manager is not None:
+        await _manager.stop()
+        _manager = None
@@ -0,0 +1,40 @@
+"""Shared keyword lookups for the page heuristics."""
+
+from typing import Iterable
+
+
+class KeywordIndex:
+    """
+    Memoized keyword lookups over one (lower-cased) text.
+
+    Built once per page and shared by every heuristic, so a keyword checked by
+    several scorers is only searched for once. Each lookup is a C-level
+    substring search that stops at the first hit.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._first: dict[str, int] = {}
+
+    def first(self, keyword: str) -> int:
+        """Position of the first occurrence of `keyword`, or -1."""
+        position = self._first.get(keyword)
+        if position is None:
+            position = self._first[keyword] = self.text.find(keyword)
+        return position
+
+    def __contains__(self, keyword: str) -> bool:
+        return self.first(keyword) != -1
+
+    def any(self, keywords: Iterable[str]) -> bool:
+        """Whether any of `keywords` occurs."""
+        return any(keyword in self for keyword in keywords)
+
+    def distinct(self, keywords: Iterable[str]) -> int:
+        """How many of `keywords` occur at least once."""
+        return sum(1 for keyword in keywords if keyword in self)
+
+
+def contains_any(text: str, keywords: Iterable[str]) -> bool:
+    """Whether `text` contains any of `keywords` (for short, one-off texts like CTA labels)."""
+    return any(keyword in text for keyword in keywords)
@@ -1,15 +1,40 @@
 """Character limit resolution and validation utilities."""
 
+import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from typing import Optional, Union
 
 from app.config_loader import get_ad_limits_for_channel
+from app.deps import get_settings
 from app.models.domain import FieldLimit
-from app.models.io import GeneratedField, Warning
+from app.models.io import GeneratedField, GeneratedOption, ShortenRequest, Warning
+from app.services.llm import truncate_to_limit, try_shorten_texts_with_llm
+from app.services.llm_client import LLMClientManager
+from app.services.shorten import shorten_locally
 
 logger = logging.getLogger(__name__)
 
 
+def _over_limit_warning(
+    field: str,
+    lengths: list[int],
+    max_chars: int,
+    is_list: bool,
+    repair_failed: bool = False,
+) -> Warning:
+    """Build the warning for a field whose value (or one of its items) is over the limit."""
+    longest = max(lengths)
+    if is_list:
+        message = f"One or more {field} items exceed {max_chars} characters"
+    else:
+        message = f"{field} exceeds {max_chars} characters by {longest - max_chars}"
+    if repair_failed:
+        message += " and could not be repaired; `shortened` holds a truncated version"
+    return Warning(field=field, original_length=longest, max_length=max_chars, message=message)
+
+
 def validate_generated_fields(
     generated_data: dict[str, Union[str, list[str]]],
     field_limits: list[FieldLimit],
@@ -50,18 +75,9 @@ def validate_generated_fields(
             # Create shortened versions if needed
             shortened = None
             if is_over_limit:
-                # For now, mark as needing shortening (will implement later)
-                shortened = [
-                    item[:max_chars] + "..." if len(item) > max_chars else item
-                    for item in value
-                ]
-
-                warnings.append(Warning(
-                    field=field_limit.field,
-                    original_length=max_char_count,
-                    max_length=max_chars,
-                    message=f"One or more {field_limit.field} items exceed {max_chars} characters"
-                ))
+                shortened = [truncate_to_limit(item, max_chars) for item in value]
+
+                warnings.append(_over_limit_warning(field_limit.field, char_counts, max_chars, is_list=True))
 
             validated_fields.append(GeneratedField(
                 field=field_limit.field,
@@ -81,15 +97,9 @@ def validate_generated_fields(
 
             shortened = None
             if is_over_limit:
-                # Simple truncation for now
-                shortened = value[:max_chars] + "..."
+                shortened = truncate_to_limit(value, max_chars)
 
-                warnings.append(Warning(
-                    field=field_limit.field,
-                    original_length=char_count,
-                    max_length=max_chars,
-                    message=f"{field_limit.field} exceeds {max_chars} characters by {char_count - max_chars}"
-                ))
+                warnings.append(_over_limit_warning(field_limit.field, [char_count], max_chars, is_list=False))
 
             validated_fields.append(GeneratedField(
                 field=field_limit.field,
@@ -127,6 +137,141 @@ def validate_generated_fields(
     return validated_fields, warnings
 
 
+@dataclass
+class _RepairTarget:
+    """One over-limit value: a string field, or a single item of a list field."""
+
+    field: GeneratedField
+    item_index: Optional[int]
+    text: str
+    repaired: Optional[str] = None
+    method: Optional[str] = None
+
+
+async def repair_over_limit_fields(
+    options: list[GeneratedOption],
+    llm: Optional[LLMClientManager] = None,
+    budget_seconds: Optional[float] = None,
+) -> list[Warning]:
+    """
+    Shorten only the over-limit values of validated options, in place.
+
+    Each offending value goes through the local shortening rules first; the
+    rest are repaired together in one request to the mini model. If that
+    request fails, does not finish within the budget, or returns a value that
+    is still too long, the affected fields are left over-limit (with their
+    truncated `shortened` suggestion) and their warning says so.
+
+    Args:
+        options: Validated options from validate_generated_fields
+        llm: Shared LLM client manager (defaults to the process-wide one)
+        budget_seconds: Total time allowed for the repair (defaults to settings)
+
+    Returns:
+        Warnings for every field that was over the limit, describing the repair
+        or the remaining overrun
+    """
+    settings = get_settings()
+    if budget_seconds is None:
+        budget_seconds = settings.generation_repair_budget_seconds
+    deadline = time.monotonic() + budget_seconds
+
+    targets: list[_RepairTarget] = []
+    for option in options:
+        for field in option.fields:
+            if not field.is_over_limit or field.is_dropdown:
+                continue
+            if isinstance(field.value, list):
+                targets.extend(
+                    _RepairTarget(field=field, item_index=idx, text=item)
+                    for idx, item in enumerate(field.value)
+                    if len(item) > field.max_chars
+                )
+            else:
+                targets.append(_RepairTarget(field=field, item_index=None, text=field.value))
+
+    if not targets:
+        return []
+
+    # Local rules first; they usually fix small overruns without a model call
+    remaining: list[_RepairTarget] = []
+    for target in targets:
+        local = shorten_locally(target.text, target.field.max_chars)
+        if local is None:
+            remaining.append(target)
+        else:
+            target.repaired, target.method = local
+
+    if remaining:
+        timeout = deadline - time.monotonic()
+        try:
+            if timeout <= 0:
+                raise asyncio.TimeoutError
+            shortened_texts = await asyncio.wait_for(
+                try_shorten_texts_with_llm(
+                    [ShortenRequest(text=t.text, max_chars=t.field.max_chars) for t in remaining],
+                    llm=llm,
+                    model=settings.model_generation_mini,
+                ),
+                timeout=timeout,
+            )
+            for target, shortened in zip(remaining, shortened_texts):
+                # An omitted or still over-limit result is not a repair
+                if shortened is not None and len(shortened) <= target.field.max_chars:
+                    target.repaired, target.method = shortened, "llm"
+        except asyncio.TimeoutError:
+            logger.warning(f"Repair budget of {budget_seconds}s exceeded, leaving {len(remaining)} values over limit")
+        except Exception as e:
+            logger.warning(f"LLM repair failed, leaving {len(remaining)} values over limit: {e}")
+
+    logger.info(
+        f"Repaired {sum(t.repaired is not None for t in targets)}/{len(targets)} over-limit values "
+        f"({len(targets) - len(remaining)} locally)"
+    )
+    return _apply_repairs(targets)
+
+
+def _apply_repairs(targets: list[_RepairTarget]) -> list[Warning]:
+    """Write repaired values back to their fields and describe each field's outcome."""
+    by_field: dict[int, list[_RepairTarget]] = {}
+    for target in targets:
+        by_field.setdefault(id(target.field), []).append(target)
+
+    warnings = []
+    for field_targets in by_field.values():
+        field = field_targets[0].field
+        is_list = isinstance(field.value, list)
+        original_lengths = [len(t.text) for t in field_targets]
+
+        if any(t.repaired is None for t in field_targets):
+            warnings.append(
+                _over_limit_warning(field.field, original_lengths, field.max_chars, is_list, repair_failed=True)
+            )
+            continue
+
+        if is_list:
+            value = list(field.value)
+            for target in field_targets:
+                value[target.item_index] = target.repaired
+            field.value = value
+            field.char_count = max((len(item) for item in value), default=0)
+        else:
+            field.value = field_targets[0].repaired
+            field.char_count = len(field.value)
+        field.is_over_limit = False
+        field.shortened = None
+
+        methods = ", ".join(sorted({t.method for t in field_targets}))
+        warnings.append(Warning(
+            field=field.field,
+            original_length=max(original_lengths),
+            max_length=field.max_chars,
+            message=f"{field.field} was shortened from {max(original_lengths)} to {field.char_count} characters ({methods})",
+        ))
+
+    return warnings
+
+
 def get_limits_for_channel(channel: str, subtype: Optional[str] = None) -> list[FieldLimit]:
     """
     Get field limits for a channel and optional subtype.
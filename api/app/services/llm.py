@@ -1,17 +1,26 @@
 """OpenAI LLM service with structured outputs for ad copy generation."""
 
+import asyncio
 import json
 import logging
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Optional
 
-from openai import AsyncOpenAI
+import httpx
 from openai.types.chat import ChatCompletion
 
 from app.deps import get_settings
 from app.models.domain import FieldLimit
+from app.models.io import ShortenRequest
+from app.services.deadline import DeadlineExceeded, has_budget, within_deadline
+from app.services.llm_cache import cached_response, completion_cache_key, current_cache_mode, store_response
+from app.services.llm_client import LLMClientManager, get_llm_manager
+from app.services.llm_scheduler import backoff_delay
+from app.services.singleflight import SingleFlight, hash_key
 
 logger = logging.getLogger(__name__)
 
+_usps_flight: SingleFlight[list[str]] = SingleFlight("usps_extraction")
+
 
 def creativity_to_temperature(creativity: int) -> float:
     """
@@ -179,6 +188,119 @@ CRITICAL: Count characters for EACH field. If any field exceeds its limit, revis
     return prompt
 
 
+async def generate_single_option(
+    llm: LLMClientManager,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    schema_name: str,
+    json_schema: dict[str, Any],
+    temperature: float,
+    option_label: str = "1/1",
+    max_retries: int = 2,
+    on_delta: Optional[Callable[[str, int], None]] = None,
+) -> dict[str, Any]:
+    """
+    Generate one ad copy option with structured output, retrying on failure.
+
+    Retries are scoped to this option so one failing option does not affect
+    the others being generated alongside it. Rate limits and other transient
+    API errors are already retried by the client manager, so only bad or empty
+    responses are retried here (after a short backoff). When `on_delta` is given the
+    completion is streamed and each JSON text delta is passed to it together
+    with the attempt number (a new attempt starts the text over). No retry is
+    started with less than deadline_llm_min_seconds of the request deadline left.
+    """
+    settings = get_settings()
+    for attempt in range(max_retries):
+        try:
+            request = dict(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": schema_name,
+                        "strict": True,
+                        "schema": json_schema,
+                    },
+                },
+                temperature=temperature,
+            )
+
+            if on_delta is None:
+                response: ChatCompletion = await llm.chat_completion(**request)
+                content = response.choices[0].message.content
+            else:
+                chunks = []
+
+                async def consume() -> None:
+                    async for delta in llm.stream_chat_completion(**request):
+                        chunks.append(delta)
+                        on_delta(delta, attempt + 1)
+
+                await within_deadline(consume())
+                content = "".join(chunks)
+
+            if not content:
+                raise ValueError("Empty response from OpenAI")
+
+            parsed = json.loads(content)
+            logger.info(f"Generated option {option_label}")
+            return parsed
+
+        except (ValueError, httpx.TransportError) as e:
+            # Bad or empty JSON, or a stream cut off part-way. Anything else (an open
+            # circuit, the deadline, API errors the client already retried) fails now.
+            logger.error(f"Error generating option {option_label} on attempt {attempt + 1}: {e}")
+            if attempt == max_retries - 1:
+                raise
+
+        if not has_budget(settings.deadline_llm_min_seconds):
+            raise DeadlineExceeded(f"No time left to retry option {option_label}")
+        await asyncio.sleep(backoff_delay(attempt, settings.llm_backoff_base_seconds, settings.llm_backoff_max_seconds))
+
+    raise RuntimeError(f"Failed to generate option {option_label}")
+
+
+async def _generate_option_cached(
+    llm: LLMClientManager,
+    on_delta: Optional[Callable[[str, int], None]] = None,
+    **kwargs: Any,
+) -> tuple[dict[str, Any], bool]:
+    """
+    Generate one option through the LLM response cache.
+
+    Generation only reads the cache when the request asked for cache="prefer"
+    (a "regenerate" should normally give new copy), but every fresh option is
+    stored so a later preferring request can reuse it.
+
+    Returns:
+        Tuple of (option, whether it came from the cache)
+    """
+    key = completion_cache_key(
+        kwargs["model"], kwargs["temperature"], kwargs["system_prompt"], kwargs["user_prompt"], kwargs["json_schema"]
+    )
+    cached = await cached_response(key, default_mode="bypass")
+    if cached is not None:
+        logger.info(f"Option {kwargs['option_label']} served from the response cache")
+        return cached, True
+
+    option = await generate_single_option(llm=llm, on_delta=on_delta, **kwargs)
+    await store_response(key, option)
+    return option, False
+
+
+def generation_source(cached: int, total: int) -> str:
+    """Label where a set of options came from."""
+    if cached == 0:
+        return "openai"
+    return "cache" if cached == total else "openai+cache"
+
+
 async def generate_copy_with_openai(
     channel: str,
     subtype: str,
@@ -196,15 +318,93 @@ async def generate_copy_with_openai(
     num_options: int = 3,
     open_day_date: Optional[str] = None,
     course_name: Optional[str] = None,
-) -> tuple[list[dict[str, Any]], str]:
+    llm: Optional[LLMClientManager] = None,
+) -> tuple[list[dict[str, Any]], str, str]:
     """
     Generate ad copy using OpenAI with structured outputs.
 
+    Options are requested concurrently, so wall time is roughly that of a single
+    call. Options that still fail after their retries are dropped; an error is
+    only raised if every option fails. Options may come from the LLM response
+    cache (see _generate_option_cached).
+
     Returns:
-        Tuple of (list of generated options, model_used)
+        Tuple of (list of generated options, model_used, source), where source
+        is "openai", "cache" or "openai+cache"
     """
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    llm = llm or get_llm_manager()
+
+    option_kwargs = _build_option_requests(
+        channel=channel,
+        subtype=subtype,
+        university=university,
+        tone=tone,
+        audience=audience,
+        usps=usps,
+        fields=fields,
+        tone_hint=tone_hint,
+        audience_hint=audience_hint,
+        subtype_hint=subtype_hint,
+        emojis_allowed=emojis_allowed,
+        creativity=creativity,
+        scraped_context=scraped_context,
+        num_options=num_options,
+        open_day_date=open_day_date,
+        course_name=course_name,
+    )
+
+    logger.info(f"Generating {num_options} ad copy options for {channel} ({subtype})")
+
+    # Generate all options concurrently; each option retries independently
+    results = await asyncio.gather(
+        *(_generate_option_cached(llm=llm, **kwargs) for kwargs in option_kwargs),
+        return_exceptions=True,
+    )
+
+    all_options = []
+    errors = []
+    cached = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            errors.append(result)
+        else:
+            option, from_cache = result
+            all_options.append(option)
+            cached += from_cache
+
+    if not all_options and errors:
+        raise errors[0]
+    if errors:
+        logger.warning(f"{len(errors)} of {num_options} options failed, returning {len(all_options)}")
+
+    model_used = settings.model_generation
+    source = generation_source(cached, len(all_options))
+    logger.info(f"Successfully generated {len(all_options)} options using {model_used} (source: {source})")
+
+    return all_options, model_used, source
+
+
+def _build_option_requests(
+    channel: str,
+    subtype: str,
+    university: str,
+    tone: str,
+    audience: str,
+    usps: str,
+    fields: list[FieldLimit],
+    tone_hint: str,
+    audience_hint: str,
+    subtype_hint: str,
+    emojis_allowed: bool,
+    creativity: int,
+    scraped_context: Optional[str],
+    num_options: int,
+    open_day_date: Optional[str],
+    course_name: Optional[str],
+) -> list[dict[str, Any]]:
+    """Build the generate_single_option arguments for each requested option."""
+    settings = get_settings()
 
     # Build JSON schema for this channel's fields
     json_schema = build_json_schema_for_channel(channel, fields)
@@ -230,55 +430,124 @@ async def generate_copy_with_openai(
         course_name=course_name,
     )
 
-    logger.info(f"Generating {num_options} ad copy options for {channel} ({subtype})")
+    base_temp = creativity_to_temperature(creativity)
+    schema_name = f"{channel.lower().replace(' ', '_')}_ad_copy"
 
-    all_options = []
+    return [
+        dict(
+            model=settings.model_generation,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            schema_name=schema_name,
+            json_schema=json_schema,
+            temperature=base_temp + (option_num * 0.05),  # Vary temperature slightly for diversity
+            option_label=f"{option_num + 1}/{num_options}",
+        )
+        for option_num in range(num_options)
+    ]
 
-    # Generate multiple options with retries
-    for option_num in range(num_options):
-        max_retries = 2
-        for attempt in range(max_retries):
-            try:
-                response: ChatCompletion = await client.chat.completions.create(
-                    model=settings.model_generation,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    response_format={
-                        "type": "json_schema",
-                        "json_schema": {
-                            "name": f"{channel.lower().replace(' ', '_')}_ad_copy",
-                            "strict": True,
-                            "schema": json_schema,
-                        },
-                    },
-                    temperature=(base_temp := creativity_to_temperature(creativity)) + (option_num * 0.05),  # Vary temperature slightly for diversity
-                )
 
-                content = response.choices[0].message.content
-                if not content:
-                    raise ValueError("Empty response from OpenAI")
+async def stream_copy_with_openai(
+    channel: str,
+    subtype: str,
+    university: str,
+    tone: str,
+    audience: str,
+    usps: str,
+    fields: list[FieldLimit],
+    tone_hint: str,
+    audience_hint: str,
+    subtype_hint: str = "",
+    emojis_allowed: bool = False,
+    creativity: int = 5,
+    scraped_context: Optional[str] = None,
+    num_options: int = 3,
+    open_day_date: Optional[str] = None,
+    course_name: Optional[str] = None,
+    stream_tokens: bool = True,
+    llm: Optional[LLMClientManager] = None,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Generate ad copy options concurrently, yielding events as they happen.
 
-                parsed = json.loads(content)
-                all_options.append(parsed)
+    Yields (event, payload) tuples:
+        ("delta", {"option", "attempt", "text"}): JSON text as it streams (if stream_tokens)
+        ("option", {"option", "data", "cached"}): a completed option, as soon as its call finishes
+        ("option_error", {"option", "error"}): an option that failed after its retries
 
-                logger.info(f"Generated option {option_num + 1}/{num_options}")
-                break  # Success, move to next option
+    Options are numbered from 1 by request slot and arrive in completion order.
+    Closing the iterator cancels any option still being generated.
+    """
+    llm = llm or get_llm_manager()
 
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error on attempt {attempt + 1}: {e}")
-                if attempt == max_retries - 1:
-                    raise
-            except Exception as e:
-                logger.error(f"Error generating copy on attempt {attempt + 1}: {e}")
-                if attempt == max_retries - 1:
-                    raise
+    option_kwargs = _build_option_requests(
+        channel=channel,
+        subtype=subtype,
+        university=university,
+        tone=tone,
+        audience=audience,
+        usps=usps,
+        fields=fields,
+        tone_hint=tone_hint,
+        audience_hint=audience_hint,
+        subtype_hint=subtype_hint,
+        emojis_allowed=emojis_allowed,
+        creativity=creativity,
+        scraped_context=scraped_context,
+        num_options=num_options,
+        open_day_date=open_day_date,
+        course_name=course_name,
+    )
 
-    model_used = settings.model_generation
-    logger.info(f"Successfully generated {len(all_options)} options using {model_used}")
+    logger.info(f"Streaming {num_options} ad copy options for {channel} ({subtype})")
+
+    events: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue()
+
+    async def run_option(option: int, kwargs: dict[str, Any]) -> None:
+        on_delta = None
+        if stream_tokens:
+            def on_delta(text: str, attempt: int) -> None:
+                events.put_nowait(("delta", {"option": option, "attempt": attempt, "text": text}))
+        try:
+            data, cached = await _generate_option_cached(llm=llm, on_delta=on_delta, **kwargs)
+            events.put_nowait(("option", {"option": option, "data": data, "cached": cached}))
+        except Exception as e:
+            events.put_nowait(("option_error", {"option": option, "error": str(e)}))
+
+    tasks = [
+        asyncio.create_task(run_option(idx + 1, kwargs))
+        for idx, kwargs in enumerate(option_kwargs)
+    ]
+    try:
+        pending = len(tasks)
+        while pending:
+            event = await events.get()
+            if event[0] != "delta":
+                pending -= 1
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+SHORTEN_SYSTEM_PROMPT = """You are an expert copywriter specializing in concise, impactful advertising copy.
 
-    return all_options, model_used
+Your task is to shorten ad copy while:
+- Preserving the core message and value proposition
+- Maintaining the tone and voice
+- Keeping the most impactful words and phrases
+- Ensuring the copy still drives action
+
+Be ruthless with unnecessary words but preserve what matters most."""
+
+
+def truncate_to_limit(text: str, max_chars: int) -> str:
+    """Last-resort truncation at a word boundary, with an ellipsis, within max_chars."""
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 3:
+        return text[:max_chars]
+    return text[:max_chars - 3].rsplit(" ", 1)[0].rstrip(" ,;:-") + "..."
 
 
 async def shorten_text_with_llm(
@@ -286,6 +555,7 @@ async def shorten_text_with_llm(
     max_chars: int,
     keep_cta: bool = True,
     remove_emojis: bool = False,
+    llm: Optional[LLMClientManager] = None,
 ) -> str:
     """
     Shorten text to fit within character limit while preserving meaning and impact.
@@ -295,12 +565,13 @@ async def shorten_text_with_llm(
         max_chars: Maximum character count
         keep_cta: Whether to preserve call-to-action if present
         remove_emojis: Whether to remove emojis
+        llm: Shared LLM client manager (defaults to the process-wide one)
 
     Returns:
         Shortened text
     """
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    llm = llm or get_llm_manager()
 
     current_length = len(text)
     if current_length <= max_chars:
@@ -309,15 +580,7 @@ async def shorten_text_with_llm(
     reduction_needed = current_length - max_chars
     percentage_reduction = (reduction_needed / current_length) * 100
 
-    system_prompt = """You are an expert copywriter specializing in concise, impactful advertising copy.
-
-Your task is to shorten ad copy while:
-- Preserving the core message and value proposition
-- Maintaining the tone and voice
-- Keeping the most impactful words and phrases
-- Ensuring the copy still drives action
-
-Be ruthless with unnecessary words but preserve what matters most."""
+    system_prompt = SHORTEN_SYSTEM_PROMPT
 
     user_prompt = f"""Original copy ({current_length} characters):
 {text}
@@ -334,7 +597,7 @@ Requirements:
 Return ONLY the shortened copy, nothing else."""
 
     try:
-        response = await client.chat.completions.create(
+        response = await llm.chat_completion(
             model=settings.model_generation,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -356,26 +619,182 @@ Return ONLY the shortened copy, nothing else."""
         else:
             # Truncate if still too long (shouldn't happen but safety net)
             logger.warning(f"LLM output still too long ({len(shortened)}), truncating")
-            return shortened[:max_chars].rsplit(" ", 1)[0] + "..."
+            return truncate_to_limit(shortened, max_chars)
 
     except Exception as e:
         logger.error(f"Error shortening text with LLM: {e}")
         # Fallback: simple truncation
-        return text[:max_chars].rsplit(" ", 1)[0] + "..."
+        return truncate_to_limit(text, max_chars)
+
+
+async def shorten_texts_with_llm(
+    items: list[ShortenRequest],
+    llm: Optional[LLMClientManager] = None,
+    model: Optional[str] = None,
+) -> list[str]:
+    """
+    Shorten several texts in a single structured-output LLM request.
+
+    Args:
+        items: Texts to shorten, each with its own limit and CTA/emoji rules
+        llm: Shared LLM client manager (defaults to the process-wide one)
+        model: Model to use (defaults to the generation model)
+
+    Returns:
+        Shortened texts in the same order as `items`. Items the model omits or
+        returns over-limit, or all items if the request fails, fall back to
+        truncation.
+    """
+    if not items:
+        return []
+
+    try:
+        shortened_texts = await try_shorten_texts_with_llm(items, llm=llm, model=model)
+    except Exception as e:
+        logger.error(f"Error batch shortening {len(items)} texts with LLM: {e}")
+        shortened_texts = [None] * len(items)
+
+    results = []
+    for idx, (item, shortened) in enumerate(zip(items, shortened_texts)):
+        if shortened is None:
+            logger.warning(f"No LLM result for batch item {idx}, truncating")
+            results.append(truncate_to_limit(item.text, item.max_chars))
+        elif len(shortened) > item.max_chars:
+            logger.warning(f"LLM output for batch item {idx} still too long ({len(shortened)}), truncating")
+            results.append(truncate_to_limit(shortened, item.max_chars))
+        else:
+            results.append(shortened)
+
+    logger.info(f"Batch shortened {len(items)} texts with one LLM call")
+    return results
+
+
+async def try_shorten_texts_with_llm(
+    items: list[ShortenRequest],
+    llm: Optional[LLMClientManager] = None,
+    model: Optional[str] = None,
+) -> list[Optional[str]]:
+    """
+    Shorten several texts in one LLM request, without falling back to truncation.
+
+    Args:
+        items: Texts to shorten, each with its own limit and CTA/emoji rules
+        llm: Shared LLM client manager (defaults to the process-wide one)
+        model: Model to use (defaults to the generation model)
 
+    Returns:
+        The model's text for each item, in the same order as `items` (None for
+        items it omitted). Results may still be over their limit.
 
-async def extract_usps_from_content(content: str) -> list[str]:
+    Raises:
+        Whatever the LLM request raises (API errors, CircuitOpenError,
+        DeadlineExceeded, invalid responses)
+    """
+    settings = get_settings()
+    llm = llm or get_llm_manager()
+
+    if not items:
+        return []
+
+    item_descriptions = []
+    for idx, item in enumerate(items):
+        item_descriptions.append(
+            f"""[{idx}] Max {item.max_chars} characters (currently {len(item.text)}). """
+            f"""{"Keep any call-to-action intact" if item.keep_cta else "CTA can be modified if needed"}. """
+            f"""{"Remove all emojis" if item.remove_emojis else "Emojis can be kept if space allows"}.
+{item.text}"""
+        )
+    items_text = "\n\n".join(item_descriptions)
+
+    user_prompt = f"""Shorten each of the following {len(items)} pieces of ad copy to its character limit.
+
+{items_text}
+
+Requirements:
+- Each result must be within its own character limit
+- Preserve core message and impact
+- Maintain the same tone and voice
+
+Return one result per item, using the item's number as its id."""
+
+    json_schema = {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer", "description": "Item number"},
+                        "shortened": {"type": "string", "description": "Shortened copy"},
+                    },
+                    "required": ["id", "shortened"],
+                    "additionalProperties": False,
+                },
+            }
+        },
+        "required": ["results"],
+        "additionalProperties": False,
+    }
+
+    response = await llm.chat_completion(
+        model=model or settings.model_generation,
+        messages=[
+            {"role": "system", "content": SHORTEN_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "batch_shorten",
+                "strict": True,
+                "schema": json_schema,
+            },
+        },
+        temperature=0.3,  # Lower temperature for more focused output
+    )
+
+    content = response.choices[0].message.content
+    if not content:
+        raise ValueError("Empty response from OpenAI")
+
+    shortened_by_id: dict[int, str] = {}
+    for result in json.loads(content)["results"]:
+        shortened_by_id[result["id"]] = result["shortened"].strip().strip('"')
+
+    return [shortened_by_id.get(idx) for idx in range(len(items))]
+
+
+async def extract_usps_from_content(
+    content: str,
+    llm: Optional[LLMClientManager] = None,
+) -> list[str]:
     """
     Extract 3-5 key USPs from landing page content.
 
     Args:
         content: Scraped landing page content
+        llm: Shared LLM client manager (defaults to the process-wide one)
 
     Returns:
         List of 3-5 USP strings
+
+    Concurrent identical extractions share a single LLM call, and results are
+    served from the LLM response cache unless the request asked for
+    cache="bypass".
     """
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    key = hash_key(settings.model_generation_mini, content[:3000], current_cache_mode("prefer"))
+    return await _usps_flight.do(key, lambda: _extract_usps_from_content(content, llm))
+
+
+async def _extract_usps_from_content(
+    content: str,
+    llm: Optional[LLMClientManager] = None,
+) -> list[str]:
+    """Extract USPs with one LLM call (see extract_usps_from_content)."""
+    settings = get_settings()
+    llm = llm or get_llm_manager()
 
     system_prompt = """You are an expert at analyzing university landing pages and extracting key selling points.
 
@@ -402,8 +821,29 @@ Return ONLY the USPs, one per line, as a JSON array of strings."""
 
 Return a JSON array with 3-5 concise USP strings."""
 
+    json_schema = {
+        "type": "object",
+        "properties": {
+            "usps": {
+                "type": "array",
+                "description": "List of 3-5 key USPs",
+                "items": {"type": "string"},
+                "minItems": 3,
+                "maxItems": 5,
+            }
+        },
+        "required": ["usps"],
+        "additionalProperties": False,
+    }
+
+    cache_key = completion_cache_key(settings.model_generation_mini, 0.3, system_prompt, user_prompt, json_schema)
+    cached = await cached_response(cache_key, default_mode="prefer")
+    if cached is not None:
+        logger.info(f"Extracted {len(cached)} USPs from the response cache")
+        return cached
+
     try:
-        response = await client.chat.completions.create(
+        response = await llm.chat_completion(
             model=settings.model_generation_mini,  # Use mini for speed
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -414,20 +854,7 @@ Return a JSON array with 3-5 concise USP strings."""
                 "json_schema": {
                     "name": "usps_extraction",
                     "strict": True,
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "usps": {
-                                "type": "array",
-                                "description": "List of 3-5 key USPs",
-                                "items": {"type": "string"},
-                                "minItems": 3,
-                                "maxItems": 5,
-                            }
-                        },
-                        "required": ["usps"],
-                        "additionalProperties": False,
-                    },
+                    "schema": json_schema,
                 },
             },
             temperature=0.3,
@@ -441,6 +868,8 @@ Return a JSON array with 3-5 concise USP strings."""
         usps = parsed.get("usps", [])
 
         logger.info(f"Extracted {len(usps)} USPs from content")
+        if usps:
+            await store_response(cache_key, usps)
         return usps
 
     except Exception as e:
@@ -0,0 +1,243 @@
+"""Response cache for deterministic-enough LLM calls, keyed by the normalized request."""
+
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from app.deps import Settings, get_settings
+from app.models.io import CacheMode
+from app.services.singleflight import hash_key
+
+logger = logging.getLogger(__name__)
+
+_cache_mode: ContextVar[Optional[CacheMode]] = ContextVar("llm_cache_mode", default=None)
+
+
+@contextmanager
+def llm_cache_mode(mode: Optional[CacheMode]) -> Iterator[None]:
+    """
+    Use `mode` for cached LLM calls made inside the block (and tasks it starts).
+
+    None leaves each call site's default in place.
+    """
+    token = _cache_mode.set(mode)
+    try:
+        yield
+    finally:
+        _cache_mode.reset(token)
+
+
+def current_cache_mode(default: CacheMode) -> CacheMode:
+    """Cache mode requested for the current task, or the call site's default."""
+    return _cache_mode.get() or default
+
+
+def _normalize_prompt(text: Optional[str]) -> Optional[str]:
+    """Collapse whitespace so prompts differing only in formatting share an entry."""
+    return " ".join(text.split()) if text is not None else None
+
+
+def completion_cache_key(
+    model: str,
+    temperature: float,
+    system_prompt: Optional[str],
+    user_prompt: str,
+    json_schema: Optional[dict[str, Any]] = None,
+) -> str:
+    """Key a chat completion by everything that shapes its output."""
+    schema = json.dumps(json_schema, sort_keys=True) if json_schema is not None else None
+    return hash_key(
+        model,
+        round(temperature, 3),
+        _normalize_prompt(system_prompt),
+        _normalize_prompt(user_prompt),
+        schema,
+    )
+
+
+class LLMResponseCache:
+    """
+    Bounded LRU cache of parsed LLM responses with a TTL.
+
+    With a `path`, entries are also written to a SQLite file so they survive
+    restarts; entries missing from memory are looked up there (the file is
+    pruned to `disk_max_entries`). Only JSON-serialisable values are cached.
+    """
+
+    _PRUNE_EVERY = 100  # Writes between disk prunes
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        path: Optional[str] = None,
+        disk_max_entries: int = 10000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_max_entries = disk_max_entries
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._writes = 0
+        if path and max_entries > 0:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    stored_at REAL NOT NULL,
+                    value TEXT NOT NULL
+                )"""
+            )
+            self._conn.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def _remember(self, key: str, stored_at: float, value: Any) -> None:
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _run(self, fn: Any) -> Any:
+        async with self._lock:
+            return await asyncio.to_thread(fn)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None (counting a miss)."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None and self._conn is not None:
+            row = await self._run(
+                lambda: self._conn.execute(
+                    "SELECT stored_at, value FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+            )
+            if row is not None:
+                entry = (row[0], json.loads(row[1]))
+                self._remember(key, *entry)
+
+        if entry is not None and self._is_fresh(entry[0]):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])  # Callers may modify what they get back
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if not self.enabled:
+            return
+
+        stored_at = time.time()
+        self._remember(key, stored_at, copy.deepcopy(value))
+        if self._conn is None:
+            return
+
+        self._writes += 1
+        prune = self._writes % self._PRUNE_EVERY == 0
+
+        def write() -> None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, stored_at, value) VALUES (?, ?, ?)",
+                (key, stored_at, json.dumps(value)),
+            )
+            if prune:
+                self._conn.execute("DELETE FROM llm_cache WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key NOT IN "
+                    "(SELECT key FROM llm_cache ORDER BY stored_at DESC LIMIT ?)",
+                    (self.disk_max_entries,),
+                )
+            self._conn.commit()
+
+        try:
+            await self._run(write)
+        except Exception as e:
+            logger.warning(f"Failed to persist LLM cache entry: {e}")
+
+    async def clear(self) -> int:
+        """Remove all entries (memory and disk) and return how many were in memory."""
+        count = len(self._entries)
+        self._entries.clear()
+        if self._conn is not None:
+            def delete() -> None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+            await self._run(delete)
+        return count
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current size."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "persistent": self._conn is not None,
+        }
+
+
+async def cached_response(key: str, default_mode: CacheMode) -> Optional[Any]:
+    """Look up a cached response if the current cache mode prefers the cache."""
+    if current_cache_mode(default_mode) != "prefer":
+        return None
+    return await get_llm_cache().get(key)
+
+
+async def store_response(key: str, value: Any) -> None:
+    """Cache a successful response (in every mode, so a bypass refreshes the entry)."""
+    await get_llm_cache().put(key, value)
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache(settings: Optional[Settings] = None) -> LLMResponseCache:
+    """Get the process-wide LLM response cache."""
+    global _llm_cache
+    if _llm_cache is None:
+        settings = settings or get_settings()
+        _llm_cache = LLMResponseCache(
+            max_entries=settings.llm_cache_max_entries if settings.llm_cache_enabled else 0,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            path=settings.llm_cache_path or None,
+            disk_max_entries=settings.llm_cache_disk_max_entries,
+        )
+    return _llm_cache
+
+
+async def close_llm_cache() -> None:
+    """Close the cache's SQLite file on shutdown (memory entries are dropped)."""
+    global _llm_cache
+    if _llm_cache is not None:
+        await _llm_cache.close()
+        _llm_cache = None
@@ -0,0 +1,289 @@
+"""Process-wide OpenAI client with pooled connections, per-model concurrency and rate limits."""
+
+import asyncio
+import importlib.util
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import openai
+from openai import DEFAULT_TIMEOUT, AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from app.deps import Settings, get_settings
+from app.services.circuit_breaker import get_breaker
+from app.services.deadline import DeadlineExceeded, remaining, within_deadline
+from app.services.llm_scheduler import (
+    ModelRateLimiter,
+    Priority,
+    backoff_delay,
+    current_priority,
+    estimate_tokens,
+    is_retryable,
+    retry_after_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def http2_available() -> bool:
+    """Check whether the optional `h2` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class LLMClientManager:
+    """
+    Owns a single AsyncOpenAI client shared by every LLM call site.
+
+    Keeps TLS connections to the OpenAI API alive between requests and caps the
+    number of in-flight completions per model so bursts queue locally instead of
+    opening unbounded connections. Each call also waits for its model's
+    requests/tokens-per-minute budget (by priority) and transient failures are
+    retried here with jittered backoff, honouring Retry-After. While the
+    OpenAI circuit breaker is open, calls fail immediately with CircuitOpenError.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+
+        self.http2 = settings.llm_http2 and http2_available()
+        if settings.llm_http2 and not self.http2:
+            logger.info("HTTP/2 requested for OpenAI client but 'h2' is not installed, using HTTP/1.1")
+
+        self._http_client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+            ),
+            http2=self.http2,
+            follow_redirects=True,
+        )
+        # Retries are handled below so they share the rate limiter and backoff
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=self._http_client,
+            max_retries=0,
+        )
+
+        self.max_concurrency = settings.llm_max_concurrency_per_model
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._settings = settings
+        self._limiters: dict[str, Optional[ModelRateLimiter]] = {}
+        self._closed = False
+
+    def _limiter(self, model: str) -> Optional[ModelRateLimiter]:
+        """Rate limiter for `model`, created on first use (None when limits are disabled)."""
+        if model not in self._limiters:
+            settings = self._settings
+            if model == settings.model_generation_mini:
+                rpm, tpm = settings.llm_mini_requests_per_minute, settings.llm_mini_tokens_per_minute
+            else:
+                rpm, tpm = settings.llm_requests_per_minute, settings.llm_tokens_per_minute
+            self._limiters[model] = ModelRateLimiter(model, rpm, tpm) if rpm > 0 and tpm > 0 else None
+        return self._limiters[model]
+
+    async def _with_retries(
+        self,
+        model: str,
+        estimated_tokens: int,
+        priority: Optional[Priority],
+        call: Callable[[], Awaitable[T]],
+        record_success: bool = True,
+    ) -> T:
+        """
+        Run `call` once its model has budget, retrying transient errors with backoff.
+
+        Waiting for budget and the call itself are bounded by the request
+        deadline (DeadlineExceeded), and a retry is only attempted if its
+        backoff ends before the deadline. With `record_success=False` a
+        successful call is left for the caller to record on the breaker (used
+        by streams, which can still fail after they open).
+        """
+        settings = self._settings
+        limiter = self._limiter(model)
+        breaker = get_breaker("openai", settings)
+        if priority is None:
+            priority = current_priority()
+
+        for attempt in range(settings.llm_max_retries + 1):
+            if breaker is not None:
+                breaker.before_call()
+            start = time.monotonic()
+            try:
+                if limiter is not None:
+                    await within_deadline(limiter.acquire(estimated_tokens, priority))
+                start = time.monotonic()
+                result = await within_deadline(call())
+            except (asyncio.CancelledError, DeadlineExceeded):
+                if breaker is not None:
+                    breaker.release()
+                raise
+            except Exception as e:
+                if breaker is not None:
+                    # Rate limits are the scheduler's concern, not a sign OpenAI is down
+                    degraded = is_retryable(e) and not isinstance(e, openai.RateLimitError)
+                    breaker.record(success=not degraded, duration=time.monotonic() - start)
+                if not is_retryable(e) or attempt == settings.llm_max_retries:
+                    raise
+
+                retry_after = retry_after_seconds(e)
+                delay = backoff_delay(
+                    attempt,
+                    settings.llm_backoff_base_seconds,
+                    settings.llm_backoff_max_seconds,
+                    retry_after,
+                )
+                if isinstance(e, openai.RateLimitError) and limiter is not None:
+                    limiter.pause(delay)
+                left = remaining()
+                if left is not None and delay >= left:
+                    logger.warning(f"OpenAI {model} call failed ({type(e).__name__}), no time left to retry")
+                    raise
+                logger.warning(
+                    f"OpenAI {model} call failed ({type(e).__name__}), "
+                    f"retry {attempt + 1}/{settings.llm_max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if breaker is not None and record_success:
+                breaker.record(success=True, duration=time.monotonic() - start)
+            return result
+
+        raise RuntimeError("unreachable")
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(model, asyncio.Semaphore(self.max_concurrency))
+        return semaphore
+
+    @asynccontextmanager
+    async def limit(self, model: str) -> AsyncIterator[None]:
+        """Hold one of the concurrency slots for `model` for the duration of the block."""
+        async with self._semaphore(model):
+            yield
+
+    async def chat_completion(self, priority: Optional[Priority] = None, **kwargs: Any) -> ChatCompletion:
+        """
+        Create a chat completion within the model's rate and concurrency limits.
+
+        `priority` defaults to the caller's context (see llm_priority).
+        """
+        model = kwargs["model"]
+        estimated = estimate_tokens(kwargs, self._settings.llm_completion_token_estimate)
+
+        async def call() -> ChatCompletion:
+            async with self.limit(model):
+                return await self.client.chat.completions.create(**kwargs)
+
+        response = await self._with_retries(model, estimated, priority, call)
+
+        limiter = self._limiter(model)
+        if limiter is not None and response.usage is not None:
+            limiter.record_usage(estimated, response.usage.total_tokens)
+        return response
+
+    async def stream_chat_completion(self, priority: Optional[Priority] = None, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Stream a chat completion's content deltas, holding a concurrency slot until it finishes.
+
+        As for chat_completion, the slot is only taken once the rate limiter
+        has granted budget. The call is recorded on the circuit breaker when
+        the stream ends, so an error part-way through counts as a failure.
+        """
+        model = kwargs["model"]
+        estimated = estimate_tokens(kwargs, self._settings.llm_completion_token_estimate)
+        semaphore = self._semaphore(model)
+        breaker = get_breaker("openai", self._settings)
+        open_seconds = 0.0
+
+        async def open_stream() -> Any:
+            nonlocal open_seconds
+            await semaphore.acquire()
+            start = time.monotonic()
+            try:
+                stream = await self.client.chat.completions.create(stream=True, **kwargs)
+            except BaseException:
+                semaphore.release()
+                raise
+            open_seconds = time.monotonic() - start
+            return stream
+
+        stream = await self._with_retries(model, estimated, priority, open_stream, record_success=False)
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except (asyncio.CancelledError, GeneratorExit, DeadlineExceeded):
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception:
+            if breaker is not None:
+                breaker.record(success=False, duration=open_seconds)
+            raise
+        else:
+            if breaker is not None:
+                breaker.record(success=True, duration=open_seconds)
+        finally:
+            semaphore.release()
+            await stream.close()
+
+    def scheduler_stats(self) -> list[dict[str, Any]]:
+        """Queue depth and remaining budget for every model used so far."""
+        stats = []
+        for model, limiter in sorted(self._limiters.items()):
+            model_stats = limiter.stats() if limiter is not None else {"model": model, "queued": 0}
+            semaphore = self._semaphores.get(model)
+            model_stats["in_flight"] = self.max_concurrency - semaphore._value if semaphore else 0
+            stats.append(model_stats)
+        return stats
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def aclose(self) -> None:
+        """Close the client and release all pooled connections."""
+        if self._closed:
+            return
+        self._closed = True
+        await self.client.close()
+        await self._http_client.aclose()
+        logger.info("LLM client closed")
+
+
+_manager: Optional[LLMClientManager] = None
+
+
+def init_llm_manager(settings: Optional[Settings] = None) -> LLMClientManager:
+    """Create the process-wide LLM client manager (called from the app lifespan)."""
+    global _manager
+    _manager = LLMClientManager(settings)
+    logger.info(
+        f"LLM client ready (http2={_manager.http2}, "
+        f"max_concurrency_per_model={_manager.max_concurrency})"
+    )
+    return _manager
+
+
+def get_llm_manager() -> LLMClientManager:
+    """Return the process-wide LLM client manager, creating it lazily if needed."""
+    if _manager is None or _manager.closed:
+        return init_llm_manager()
+    return _manager
+
+
+async def close_llm_manager() -> None:
+    """Close the process-wide LLM client manager on shutdown."""
+    global _manager
+    if _manager is not None:
+        await _manager.aclose()
+        _manager = None
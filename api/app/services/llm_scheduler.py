@@ -0,0 +1,191 @@
+"""Per-model request/token budgets and retry backoff for OpenAI calls."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Iterator, Optional
+
+import httpx
+import openai
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling priority for LLM calls; lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    """Priority for LLM calls made from the current task."""
+    return _priority.get()
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Run LLM calls made inside the block (and tasks it starts) at `priority`."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(kwargs: dict[str, Any], completion_estimate: int) -> int:
+    """Rough token estimate for a chat request: ~4 characters per prompt token plus the expected completion."""
+    prompt_chars = sum(len(str(message.get("content") or "")) for message in kwargs.get("messages", []))
+    completion = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or completion_estimate
+    return prompt_chars // 4 + completion
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an OpenAI error is transient (rate limit, timeout, connection or 5xx)."""
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Read the server's Retry-After hint (seconds or milliseconds header) if present."""
+    response: Optional[httpx.Response] = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: float,
+    max_seconds: float,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Delay before retry number `attempt` (0-based).
+
+    Honours the server's Retry-After when given (plus a little jitter so waiting
+    callers don't retry in lockstep); otherwise full-jitter exponential backoff.
+    """
+    if retry_after is not None:
+        return min(retry_after, max_seconds) + random.uniform(0, base_seconds)
+    return random.uniform(0, min(max_seconds, base_seconds * (2 ** attempt)))
+
+
+class ModelRateLimiter:
+    """
+    Token buckets for one model's requests-per-minute and tokens-per-minute.
+
+    Callers queue by (priority, arrival order); only the head of the queue may
+    take budget, so interactive calls overtake queued background work but
+    nothing is starved by a stream of cheaper requests behind it. A 429 pauses
+    the whole model until its Retry-After has passed.
+    """
+
+    def __init__(self, model: str, requests_per_minute: int, tokens_per_minute: int):
+        self.model = model
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._available_requests = float(requests_per_minute)
+        self._available_tokens = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+        self.throttled = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._available_requests = min(
+            self.requests_per_minute, self._available_requests + elapsed * self.requests_per_minute / 60
+        )
+        self._available_tokens = min(
+            self.tokens_per_minute, self._available_tokens + elapsed * self.tokens_per_minute / 60
+        )
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until one request and `tokens` tokens are available (0 if now)."""
+        wait = max(0.0, self._paused_until - time.monotonic())
+        if self._available_requests < 1:
+            wait = max(wait, (1 - self._available_requests) * 60 / self.requests_per_minute)
+        if self._available_tokens < tokens:
+            wait = max(wait, (tokens - self._available_tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    async def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Wait for budget for one request of about `tokens` tokens."""
+        # A single request larger than the whole budget only has to wait for a full bucket
+        tokens = min(tokens, self.tokens_per_minute)
+        entry = (int(priority), next(self._sequence))
+
+        async with self._condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                throttled = False
+                while True:
+                    self._refill()
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = self._wait_time(tokens)
+                        if timeout <= 0:
+                            heapq.heappop(self._waiters)
+                            self._available_requests -= 1
+                            self._available_tokens -= tokens
+                            self._condition.notify_all()
+                            return
+                        if not throttled:
+                            throttled = True
+                            self.throttled += 1
+
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._condition.notify_all()
+                raise
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the real usage of a request is known."""
+        self._available_tokens -= actual_tokens - min(estimated_tokens, self.tokens_per_minute)
+
+    def pause(self, seconds: float) -> None:
+        """Stop granting budget for `seconds` (after a 429)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict[str, Any]:
+        self._refill()
+        return {
+            "model": self.model,
+            "queued": len(self._waiters),
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "available_requests": int(self._available_requests),
+            "available_tokens": int(self._available_tokens),
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "throttled": self.throttled,
+        }
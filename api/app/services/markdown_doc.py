@@ -0,0 +1,122 @@
+"""Single-pass structural parser for the markdown Firecrawl returns."""
+
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional
+
+_ATX_HEADING = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+_SETEXT_UNDERLINE = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+_LIST_ITEM = re.compile(r"^[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]+(.*)$")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_IMAGE = re.compile(r"!\[([^\]]*)\]\(\s*<?([^)\s>]*)>?(?:\s+[\"'][^)]*[\"'])?\s*\)")
+_LINK = re.compile(r"(?<!!)\[([^\[\]]*)\]\(\s*<?([^)\s>]*)>?(?:\s+[\"'][^)]*[\"'])?\s*\)")
+
+
+@dataclass
+class MarkdownHeading:
+    """An ATX or setext heading."""
+
+    level: int
+    text: str
+
+
+@dataclass
+class MarkdownDocument:
+    """
+    Structure of a markdown page, built by `parse_markdown`.
+
+    Scraping and the analysis heuristics read from this instead of re-scanning
+    the markdown string; `lower` is computed once on first use.
+    """
+
+    text: str
+    headings: list[MarkdownHeading] = field(default_factory=list)
+    paragraphs: list[str] = field(default_factory=list)
+    list_items: list[str] = field(default_factory=list)
+    links: list[dict] = field(default_factory=list)
+    images: list[dict] = field(default_factory=list)
+    word_count: int = 0
+
+    def heading_texts(self, level: int) -> list[str]:
+        """Text of every heading at `level`, in document order."""
+        return [heading.text for heading in self.headings if heading.level == level]
+
+    @cached_property
+    def lower(self) -> str:
+        """Lower-cased markdown, shared by every keyword check."""
+        return self.text.lower()
+
+
+def parse_markdown(text: Optional[str]) -> MarkdownDocument:
+    """
+    Parse markdown into a `MarkdownDocument` in one pass over its lines.
+
+    Recognises ATX (`# Heading`) and setext (`Heading` / `===`) headings,
+    paragraphs (blank-line separated blocks), list items, fenced code blocks
+    (skipped), links and images.
+    """
+    document = MarkdownDocument(text=text or "")
+    paragraph: list[str] = []
+    fence: Optional[str] = None
+
+    def flush_paragraph() -> None:
+        if paragraph:
+            document.paragraphs.append("\n".join(paragraph))
+            paragraph.clear()
+
+    for line in document.text.splitlines():
+        document.word_count += len(line.split())
+        stripped = line.strip()
+
+        # Fenced code: nothing inside is structure
+        fence_match = _FENCE.match(line) if stripped[:1] in ("`", "~") else None
+        if fence is not None:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                fence = None
+            continue
+        if fence_match:
+            flush_paragraph()
+            fence = fence_match.group(1)
+            continue
+
+        if not stripped:
+            flush_paragraph()
+            continue
+
+        if "[" in line:
+            for alt, src in _IMAGE.findall(line):
+                document.images.append({"src": src, "alt": alt.strip(), "has_alt": bool(alt.strip())})
+            for link_text, href in _LINK.findall(line):
+                document.links.append({"href": href, "text": link_text.strip()})
+
+        if stripped[0] == "#":
+            heading = _ATX_HEADING.match(line)
+            if heading:
+                flush_paragraph()
+                heading_text = (heading.group(2) or "").strip()
+                if heading_text:
+                    document.headings.append(MarkdownHeading(len(heading.group(1)), heading_text))
+                continue
+
+        if stripped[0] in "=-":
+            underline = _SETEXT_UNDERLINE.match(line)
+            if underline:
+                if paragraph:
+                    # The line above becomes the heading; anything before it stays a paragraph
+                    heading_text = paragraph.pop().strip()
+                    flush_paragraph()
+                    document.headings.append(MarkdownHeading(1 if underline.group(1)[0] == "=" else 2, heading_text))
+                continue  # Otherwise a thematic break
+
+        item = _LIST_ITEM.match(line)
+        if item:
+            flush_paragraph()
+            if item.group(1).strip():
+                document.list_items.append(item.group(1).strip())
+            continue
+
+        paragraph.append(stripped)
+
+    flush_paragraph()
+    return document
@@ -1,16 +1,28 @@
 """Landing page scraping using Firecrawl API."""
 
+import asyncio
+import codecs
 import logging
-import re
+import time
 from typing import Optional
 
 import httpx
-from selectolax.parser import HTMLParser
 
 from app.deps import get_settings
+from app.services.circuit_breaker import get_breaker
+from app.services.deadline import DeadlineExceeded, has_budget, skip_stage
+from app.services.html_extract import cta_texts, extract_html
+from app.services.keywords import KeywordIndex
+from app.services.llm_cache import current_cache_mode
+from app.services.markdown_doc import MarkdownDocument, parse_markdown
+from app.services.scrape_cache import get_scrape_cache, normalize_url
+from app.services.scrape_client import get_scrape_client
+from app.services.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+_scrape_flight: SingleFlight["ScrapedContent"] = SingleFlight("scrape")
+
 
 class ScrapedContent:
     """Container for scraped page content."""
@@ -28,8 +40,23 @@ class ScrapedContent:
         self.paragraphs: list[str] = []
         self.lists: list[str] = []
         self.markdown: Optional[str] = None
+        self.document: Optional[MarkdownDocument] = None  # Parsed markdown (Firecrawl only)
         self.word_count: int = 0
         self.error: Optional[str] = None
+        self.backend: Optional[str] = None  # Scraper that produced this content
+        # HTTP validators for conditional revalidation (selectolax only)
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.not_modified: bool = False
+        self.truncated: bool = False  # Body was cut off at scrape_max_bytes
+        self.keywords: Optional[KeywordIndex] = None  # Set by the analysis heuristics
+
+    @property
+    def markdown_lower(self) -> str:
+        """Lower-cased markdown for keyword checks, computed once per page when parsed."""
+        if self.document is not None:
+            return self.document.lower
+        return (self.markdown or "").lower()
 
 
 async def scrape_with_firecrawl(url: str) -> ScrapedContent:
@@ -40,7 +67,16 @@ async def scrape_with_firecrawl(url: str) -> ScrapedContent:
     """
     settings = get_settings()
     content = ScrapedContent()
+    content.backend = "firecrawl"
+
+    breaker = get_breaker("firecrawl")
+    if breaker is not None and not breaker.allow():
+        logger.info(f"Skipping Firecrawl for {url}: circuit open")
+        content.error = "Firecrawl unavailable (circuit open)"
+        return content
 
+    start = time.monotonic()
+    failed = cancelled = False
     try:
         firecrawl_url = "https://api.firecrawl.dev/v1/scrape"
         headers = {
@@ -53,8 +89,9 @@ async def scrape_with_firecrawl(url: str) -> ScrapedContent:
             "onlyMainContent": True
         }
 
-        async with httpx.AsyncClient(timeout=settings.scrape_timeout_seconds) as client:
-            response = await client.post(firecrawl_url, headers=headers, json=payload)
+        scraper = get_scrape_client()
+        async with scraper.host_slot(firecrawl_url):
+            response = await scraper.client.post(firecrawl_url, headers=headers, json=payload)
             response.raise_for_status()
 
             data = response.json()
@@ -66,27 +103,17 @@ async def scrape_with_firecrawl(url: str) -> ScrapedContent:
 
             # Parse markdown for structure
             if content.markdown:
-                content.word_count = len(content.markdown.split())
-
-                # Match both ATX-style (# Heading) and setext-style (Heading\n===)
-                # ATX H1: # Heading
-                atx_h1 = re.findall(r"^# (.+)$", content.markdown, re.MULTILINE)
-                # Setext H1: Heading\n===
-                setext_h1 = re.findall(r"^(.+)\n=+$", content.markdown, re.MULTILINE)
-                content.h1 = atx_h1 + setext_h1
-
-                # ATX H2: ## Heading
-                atx_h2 = re.findall(r"^## (.+)$", content.markdown, re.MULTILINE)
-                # Setext H2: Heading\n---
-                setext_h2 = re.findall(r"^(.+)\n-+$", content.markdown, re.MULTILINE)
-                content.h2 = atx_h2 + setext_h2
-
+                document = parse_markdown(content.markdown)
+                content.document = document
+                content.word_count = document.word_count
+                content.h1 = document.heading_texts(1)
+                content.h2 = document.heading_texts(2)
                 content.h3 = []  # Not needed - removed to reduce noise
-                content.paragraphs = [
-                    p.strip()
-                    for p in content.markdown.split("\n\n")
-                    if p.strip() and not p.startswith("#") and not p.strip().startswith("=") and not p.strip().startswith("-")
-                ][:5]  # First 5 paragraphs only
+                content.paragraphs = document.paragraphs[:5]  # First 5 paragraphs only
+                content.lists = document.list_items
+                content.images = document.images
+                content.links = document.links
+                content.ctas = cta_texts(link["text"] for link in document.links)
 
             logger.info(f"Scraped {url} via Firecrawl: {content.word_count} words")
             return content
@@ -94,102 +121,127 @@ async def scrape_with_firecrawl(url: str) -> ScrapedContent:
     except httpx.TimeoutException:
         logger.warning(f"Timeout scraping {url} with Firecrawl")
         content.error = "Timeout: Site took too long to respond"
+        failed = True
     except httpx.HTTPStatusError as e:
         logger.warning(f"HTTP error scraping {url}: {e.response.status_code}")
         content.error = f"Access denied: HTTP {e.response.status_code}"
+        # Firecrawl itself failing or throttling us, rather than the target page refusing
+        failed = e.response.status_code >= 500 or e.response.status_code == 429
+    except asyncio.CancelledError:
+        # Lost a hedged race; says nothing about Firecrawl's health
+        cancelled = True
+        if breaker is not None:
+            breaker.release()
+        raise
     except Exception as e:
         logger.error(f"Error scraping {url} with Firecrawl: {e}")
         content.error = str(e)
+        failed = True
+    finally:
+        if breaker is not None and not cancelled:
+            breaker.record(success=not failed, duration=time.monotonic() - start)
 
     return content
 
 
-async def scrape_with_selectolax(url: str) -> ScrapedContent:
+_MAIN_END_MARKERS = ("</main>", "</body>")
+
+
+async def _read_html(response: httpx.Response, max_bytes: int, stop_after_main: bool) -> tuple[str, bool]:
+    """
+    Read and decode an HTML body incrementally.
+
+    Stops after `max_bytes` of (decompressed) body, or - with `stop_after_main` -
+    once the main content or body has closed, so the footer and any trailing
+    scripts aren't downloaded. Raw bytes are decoded chunk by chunk and not
+    kept. When the read stops early, a character cut in half at the stopping
+    point is dropped rather than decoded as U+FFFD.
+
+    Returns:
+        Tuple of (decoded HTML, whether the body was cut off at `max_bytes`)
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    parts: list[str] = []
+    received = 0
+    truncated = False
+    tail = ""  # End of the previous chunk, so a marker split across chunks is still found
+    overlap = max(len(marker) for marker in _MAIN_END_MARKERS) - 1
+
+    async for chunk in response.aiter_bytes():
+        if received + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - received]
+            truncated = True
+        received += len(chunk)
+
+        text = decoder.decode(chunk)
+        parts.append(text)
+        if truncated:
+            break
+
+        if stop_after_main:
+            window = (tail + text).lower()
+            if any(marker in window for marker in _MAIN_END_MARKERS):
+                break
+            tail = window[-overlap:]
+    else:
+        # The whole body arrived; only now is a dangling partial character an error
+        parts.append(decoder.decode(b"", final=True))
+
+    return "".join(parts), truncated
+
+
+async def scrape_with_selectolax(
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> ScrapedContent:
     """
     Fallback scraper using direct HTML parsing with selectolax.
 
     Used if Jina.AI fails or for detailed HTML structure analysis.
+
+    If `etag` / `last_modified` are given the request is conditional; a 304
+    response returns an empty ScrapedContent with `not_modified` set.
     """
     settings = get_settings()
     content = ScrapedContent()
+    content.backend = "selectolax"
 
     try:
         headers = {"User-Agent": settings.user_agent}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        scraper = get_scrape_client()
+        async with scraper.stream_get(url, headers=headers) as response:
+            if response.status_code == 304:
+                logger.info(f"{url} not modified since last scrape")
+                content.not_modified = True
+                return content
 
-        async with httpx.AsyncClient(timeout=settings.scrape_timeout_seconds) as client:
-            response = await client.get(url, headers=headers, follow_redirects=True)
             response.raise_for_status()
 
-            html = response.text
-            tree = HTMLParser(html)
-
-            # Basic metadata
-            title_tag = tree.css_first("title")
-            content.title = title_tag.text().strip() if title_tag else None
-
-            meta_desc = tree.css_first('meta[name="description"]')
-            if meta_desc:
-                content.meta_description = meta_desc.attributes.get("content", "").strip()
-
-            # Headings
-            content.h1 = [h.text().strip() for h in tree.css("h1") if h.text().strip()]
-            content.h2 = [h.text().strip() for h in tree.css("h2") if h.text().strip()]
-            content.h3 = []  # Not needed - removed to reduce noise
-
-            # CTAs (buttons and links with CTA keywords)
-            # Expanded keywords and selectors to catch more CTAs
-            cta_keywords = [
-                "register",
-                "apply",
-                "book",
-                "enquire",
-                "download",
-                "sign up",
-                "get started",
-                "learn more",
-                "find out",
-                "discover",
-                "explore",
-                "join",
-                "visit",
-                "open day",
-                "prospectus",
-                "contact",
-                "get in touch",
-            ]
-            # Check buttons, links with button classes, and common CTA containers
-            for btn in tree.css("button, a.btn, a.button, .cta, .btn, .button, a[role='button'], input[type='submit']"):
-                text = btn.text().strip()
-                if text:  # Any button/CTA element with text
-                    text_lower = text.lower()
-                    # Add if it contains CTA keywords OR if it's a button element (likely a CTA)
-                    if any(keyword in text_lower for keyword in cta_keywords) or btn.tag in ["button", "input"]:
-                        if text not in content.ctas:  # Avoid duplicates
-                            content.ctas.append(text)
-
-            # Forms
-            for form in tree.css("form"):
-                inputs = len(form.css("input, textarea, select"))
-                content.forms.append({"inputs": inputs})
-
-            # Images - not needed, removed to reduce noise
-            content.images = []
-
-            # Links - not needed, removed to reduce noise
-            content.links = []
-
-            # Paragraphs - limit to first 5 only
-            content.paragraphs = [
-                p.text().strip() for p in tree.css("p") if p.text().strip()
-            ][:5]
-
-            # Word count
-            body = tree.css_first("body")
-            if body:
-                content.word_count = len(body.text().split())
-
-            logger.info(f"Scraped {url} with selectolax: {content.word_count} words")
-            return content
+            content.etag = response.headers.get("etag")
+            content.last_modified = response.headers.get("last-modified")
+
+            html, content.truncated = await _read_html(
+                response, settings.scrape_max_bytes, settings.scrape_stop_after_main
+            )
+
+        if content.truncated:
+            logger.warning(f"{url} exceeds {settings.scrape_max_bytes} bytes, parsing the first part only")
+
+        # Parse after releasing the connection and host slot
+        extract_html(html, content)
+
+        logger.info(f"Scraped {url} with selectolax: {content.word_count} words")
+        return content
 
     except httpx.TimeoutException:
         logger.warning(f"Timeout scraping {url} with selectolax")
@@ -210,18 +262,129 @@ async def scrape_landing_page(url: str, use_firecrawl: bool = True) -> ScrapedCo
 
     Args:
         url: Page URL to scrape
-        use_firecrawl: Whether to try Firecrawl first (default True)
+        use_firecrawl: Whether to try Firecrawl first (default True). With
+            scrape_hedge_enabled, selectolax is raced against Firecrawl after
+            scrape_hedge_delay_seconds instead of waiting for it to fail.
 
     Returns:
         ScrapedContent with extracted page data
+
+    Successful scrapes are cached per (normalized URL, backend). Expired
+    selectolax entries are revalidated with a conditional GET. A request
+    with cache="bypass" always scrapes afresh (and refreshes the cache).
+    Concurrent scrapes of the same page share a single underlying scrape.
+
+    Under a request deadline the caller stops waiting when the budget runs
+    out (the shared scrape carries on and still fills the cache) and gets
+    back content with an error, recorded as a skipped "scrape" stage.
     """
+    settings = get_settings()
+    content = ScrapedContent()
+    if not has_budget(settings.deadline_scrape_min_seconds):
+        skip_stage("scrape")
+        content.error = "Not enough of the request deadline left to scrape"
+        return content
+
+    key = (normalize_url(url), use_firecrawl, current_cache_mode("prefer"))
+    try:
+        return await _scrape_flight.do(key, lambda: _scrape_landing_page(url, use_firecrawl))
+    except DeadlineExceeded:
+        logger.warning(f"Request deadline reached while scraping {url}")
+        skip_stage("scrape")
+        content.error = "Request deadline reached before the scrape finished"
+        return content
+
+
+async def _scrape_landing_page(url: str, use_firecrawl: bool) -> ScrapedContent:
+    """Scrape a landing page through the cache (see scrape_landing_page)."""
+    settings = get_settings()
+    cache = get_scrape_cache()
+
+    if current_cache_mode("prefer") == "prefer":
+        # A cached selectolax scrape also serves Firecrawl requests (Firecrawl
+        # failed last time), avoiding another wait on a failing Firecrawl.
+        backends = ("firecrawl", "selectolax") if use_firecrawl else ("selectolax",)
+        cached = cache.get(url, *backends)
+        if cached is not None:
+            return cached
+
+    if use_firecrawl and settings.scrape_hedge_enabled:
+        return await _scrape_hedged(url, settings.scrape_hedge_delay_seconds)
+
     if use_firecrawl:
         content = await scrape_with_firecrawl(url)
-        if not content.error:
+        if _is_usable(content):
+            cache.put(url, "firecrawl", content)
             return content
-        logger.info(f"Firecrawl failed, falling back to selectolax for {url}")
+        logger.info(f"Firecrawl returned no usable content, falling back to selectolax for {url}")
 
-    return await scrape_with_selectolax(url)
+    return await _scrape_with_selectolax_cached(url)
+
+
+def _is_usable(content: ScrapedContent) -> bool:
+    """Check whether a scrape produced content worth using (the rule for both the hedged and sequential paths)."""
+    return not content.error and content.word_count > 0
+
+
+async def _scrape_hedged(url: str, hedge_delay: float) -> ScrapedContent:
+    """
+    Race Firecrawl against a direct selectolax fetch.
+
+    Firecrawl starts first; if it has not returned usable content within
+    `hedge_delay` seconds (0 = immediately) the selectolax fetch starts too.
+    The first usable result wins and the other scrape is cancelled. If neither
+    is usable, the selectolax result (with its error) is returned, matching
+    the non-hedged fallback.
+    """
+    cache = get_scrape_cache()
+    firecrawl_task = asyncio.create_task(scrape_with_firecrawl(url))
+    selectolax_task: Optional[asyncio.Task] = None
+
+    try:
+        if hedge_delay > 0:
+            await asyncio.wait({firecrawl_task}, timeout=hedge_delay)
+            if firecrawl_task.done() and _is_usable(firecrawl_task.result()):
+                content = firecrawl_task.result()
+                cache.put(url, "firecrawl", content)
+                logger.info(f"Hedged scrape of {url} won by firecrawl before hedge delay")
+                return content
+
+        selectolax_task = asyncio.create_task(_scrape_with_selectolax_cached(url))
+        pending = {task for task in (firecrawl_task, selectolax_task) if not task.done()}
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                content = task.result()
+                if _is_usable(content):
+                    if task is firecrawl_task:
+                        cache.put(url, "firecrawl", content)
+                    logger.info(f"Hedged scrape of {url} won by {content.backend}")
+                    return content
+    finally:
+        # Cancel the losing (or abandoned) scrape
+        for task in (firecrawl_task, selectolax_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    logger.info(f"Hedged scrape of {url}: no backend returned usable content")
+    return selectolax_task.result()
+
+
+async def _scrape_with_selectolax_cached(url: str) -> ScrapedContent:
+    """Scrape with selectolax, revalidating an expired cache entry if possible (unless bypassing the cache)."""
+    cache = get_scrape_cache()
+    stale = cache.get_stale(url, "selectolax") if current_cache_mode("prefer") == "prefer" else None
+
+    if stale is not None:
+        content = await scrape_with_selectolax(url, etag=stale.etag, last_modified=stale.last_modified)
+        if content.not_modified:
+            return cache.mark_revalidated(stale)
+    else:
+        content = await scrape_with_selectolax(url)
+
+    cache.put(url, "selectolax", content, etag=content.etag, last_modified=content.last_modified)
+    return content
 
 
 def format_scraped_summary(content: ScrapedContent) -> str:
@@ -0,0 +1,162 @@
+"""In-memory LRU cache for scraped landing pages."""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.deps import get_settings
+
+if TYPE_CHECKING:
+    from app.services.scrape import ScrapedContent
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change page content and only fragment the cache
+_TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ttclid", "_ga", "mc_cid", "mc_eid"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent page addresses share a cache entry.
+
+    Lower-cases scheme and host, drops default ports, fragments, tracking
+    parameters (utm_*, gclid, ...) and trailing slashes, and sorts the query.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+@dataclass
+class ScrapeCacheEntry:
+    """A cached scrape result and the validators needed to revalidate it."""
+
+    content: "ScrapedContent"
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ScrapeCache:
+    """
+    Bounded LRU cache of successful scrapes keyed by (normalized URL, backend).
+
+    Entries are fresh for `ttl_seconds`. Stale entries are kept (until evicted)
+    so the selectolax path can revalidate them with a conditional GET.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple[str, str], ScrapeCacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def _is_fresh(self, entry: ScrapeCacheEntry) -> bool:
+        return time.monotonic() - entry.stored_at < self.ttl_seconds
+
+    def get(self, url: str, *backends: str) -> Optional["ScrapedContent"]:
+        """Return the first fresh cached scrape from `backends`, or None (counting a miss)."""
+        normalized = normalize_url(url)
+        for backend in backends:
+            key = (normalized, backend)
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logger.debug(f"Scrape cache hit for {key}")
+                return entry.content
+
+        self.misses += 1
+        return None
+
+    def get_stale(self, url: str, backend: str) -> Optional[ScrapeCacheEntry]:
+        """Return an expired entry that can be revalidated with a conditional request."""
+        entry = self._entries.get((normalize_url(url), backend))
+        if entry is not None and not self._is_fresh(entry) and entry.can_revalidate:
+            return entry
+        return None
+
+    def put(
+        self,
+        url: str,
+        backend: str,
+        content: "ScrapedContent",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a successful scrape, evicting the least recently used entries if full."""
+        if content.error or self.max_entries <= 0:
+            return
+
+        key = (normalize_url(url), backend)
+        self._entries[key] = ScrapeCacheEntry(
+            content=content,
+            stored_at=time.monotonic(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def mark_revalidated(self, entry: ScrapeCacheEntry) -> "ScrapedContent":
+        """Refresh an entry after the origin answered 304 Not Modified."""
+        entry.stored_at = time.monotonic()
+        self.revalidations += 1
+        return entry.content
+
+    def clear(self) -> int:
+        """Remove all entries and return how many were cleared."""
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
+
+
+_scrape_cache: Optional[ScrapeCache] = None
+
+
+def get_scrape_cache() -> ScrapeCache:
+    """Get the process-wide scrape cache."""
+    global _scrape_cache
+    if _scrape_cache is None:
+        settings = get_settings()
+        _scrape_cache = ScrapeCache(
+            max_entries=settings.scrape_cache_max_entries if settings.scrape_cache_enabled else 0,
+            ttl_seconds=settings.scrape_cache_ttl_seconds,
+        )
+    return _scrape_cache
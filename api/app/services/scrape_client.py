@@ -0,0 +1,308 @@
+"""Process-wide HTTP client for scraping, with pooled connections, DNS caching and per-host limits."""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional
+
+import httpcore
+import httpx
+
+from app.deps import Settings, get_settings
+from app.services.llm_client import http2_available
+
+logger = logging.getLogger(__name__)
+
+FIRECRAWL_HOST = "api.firecrawl.dev"
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that caches DNS lookups for `ttl_seconds`.
+
+    New connections to a recently resolved host skip the lookup; addresses are
+    tried in order and a host whose cached addresses all fail is resolved
+    again next time. TLS still verifies against the original hostname.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, ttl_seconds: float):
+        self._backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._cache: dict[tuple[str, int], tuple[float, list[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _resolve(self, host: str, port: int) -> list[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[key] = (time.monotonic() + self.ttl_seconds, addresses)
+        return addresses
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+
+        self._cache.pop((host, port), None)
+        raise error or httpcore.ConnectError(f"No addresses found for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# httpcore errors and the httpx errors callers catch, most specific first
+_HTTPCORE_ERRORS: tuple[tuple[type[Exception], type[httpx.HTTPError]], ...] = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _httpx_errors() -> Iterator[None]:
+    """Re-raise httpcore errors as their httpx equivalents."""
+    try:
+        yield
+    except Exception as e:
+        for core_error, httpx_error in _HTTPCORE_ERRORS:
+            if isinstance(e, core_error):
+                raise httpx_error(str(e)) from e
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: Any):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _httpx_errors():
+            async for part in self._stream:
+                yield part
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class ConnectionPoolTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an httpcore connection pool that we build ourselves.
+
+    httpx.AsyncHTTPTransport has no option for the pool's network backend, so
+    this small adapter (public httpx and httpcore APIs only) lets the scrape
+    client use `CachingDNSBackend`.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _httpx_errors():
+            response = await self._pool.handle_async_request(core_request)
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+class ScrapeClientManager:
+    """
+    Owns the httpx client shared by Firecrawl and direct page fetches.
+
+    Connections (and TLS sessions) to Firecrawl and to recently scraped sites
+    are kept alive between requests, DNS answers are cached in-process, and
+    each host gets a concurrency cap so a burst of scrapes queues locally
+    instead of hammering one university's CMS. Firecrawl has its own cap.
+    Page fetches follow redirects hop by hop (`stream_get`) so every hop
+    counts against the cap of the host it actually goes to.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+
+        self.http2 = settings.scrape_http2 and http2_available()
+        if settings.scrape_http2 and not self.http2:
+            logger.info("HTTP/2 requested for scraping but 'h2' is not installed, using HTTP/1.1")
+
+        self.dns: Optional[CachingDNSBackend] = None
+        transport: httpx.AsyncBaseTransport
+        if settings.scrape_dns_cache_ttl_seconds > 0:
+            self.dns = CachingDNSBackend(httpcore.AnyIOBackend(), settings.scrape_dns_cache_ttl_seconds)
+            transport = ConnectionPoolTransport(httpcore.AsyncConnectionPool(
+                ssl_context=httpx.create_ssl_context(),
+                max_connections=settings.scrape_max_connections,
+                max_keepalive_connections=settings.scrape_max_keepalive_connections,
+                keepalive_expiry=settings.scrape_keepalive_expiry_seconds,
+                http2=self.http2,
+                network_backend=self.dns,
+            ))
+        else:
+            transport = httpx.AsyncHTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=settings.scrape_max_connections,
+                    max_keepalive_connections=settings.scrape_max_keepalive_connections,
+                    keepalive_expiry=settings.scrape_keepalive_expiry_seconds,
+                ),
+            )
+
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            timeout=settings.scrape_timeout_seconds,
+            headers={"User-Agent": settings.user_agent},
+        )
+        self.max_concurrency_per_host = settings.scrape_max_concurrency_per_host
+        self.firecrawl_max_concurrency = settings.scrape_firecrawl_max_concurrency
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._closed = False
+
+    def _host_limit(self, host: str) -> int:
+        return self.firecrawl_max_concurrency if host == FIRECRAWL_HOST else self.max_concurrency_per_host
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the concurrency slots for `url`'s host for the duration of the block."""
+        host = (httpx.URL(url).host or "").lower()
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self._host_limit(host)))
+
+        async with semaphore:
+            yield
+
+    @asynccontextmanager
+    async def stream_get(self, url: str, headers: Optional[dict[str, str]] = None) -> AsyncIterator[httpx.Response]:
+        """
+        Stream a GET of `url`, following redirects one hop at a time.
+
+        Each hop holds a concurrency slot for its own host, and the final
+        response's slot is held until the block exits (so reading the body
+        counts against that host).
+
+        Raises:
+            httpx.TooManyRedirects: After `client.max_redirects` hops
+        """
+        request = self.client.build_request("GET", url, headers=headers)
+        for _ in range(self.client.max_redirects + 1):
+            async with self.host_slot(str(request.url)):
+                response = await self.client.send(request, stream=True, follow_redirects=False)
+                if response.next_request is None:
+                    try:
+                        yield response
+                    finally:
+                        await response.aclose()
+                    return
+                await response.aclose()
+            request = response.next_request
+
+        raise httpx.TooManyRedirects("Exceeded maximum allowed redirects", request=request)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def aclose(self) -> None:
+        """Close the client and release all pooled connections."""
+        if self._closed:
+            return
+        self._closed = True
+        await self.client.aclose()
+        logger.info("Scrape client closed")
+
+
+_manager: Optional[ScrapeClientManager] = None
+
+
+def init_scrape_client(settings: Optional[Settings] = None) -> ScrapeClientManager:
+    """Create the process-wide scrape client (called from the app lifespan)."""
+    global _manager
+    _manager = ScrapeClientManager(settings)
+    logger.info(
+        f"Scrape client ready (http2={_manager.http2}, "
+        f"max_concurrency_per_host={_manager.max_concurrency_per_host})"
+    )
+    return _manager
+
+
+def get_scrape_client() -> ScrapeClientManager:
+    """Return the process-wide scrape client, creating it lazily if needed."""
+    if _manager is None or _manager.closed:
+        return init_scrape_client()
+    return _manager
+
+
+async def close_scrape_client() -> None:
+    """Close the process-wide scrape client on shutdown."""
+    global _manager
+    if _manager is not None:
+        await _manager.aclose()
+        _manager = None
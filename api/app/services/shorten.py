@@ -1,43 +1,286 @@
 """Text shortening service for over-limit ad copy."""
 
 import logging
+import re
+import time
+from typing import Optional
 
-from app.services.llm import shorten_text_with_llm
+from app.models.io import ShortenBatchItem, ShortenRequest
+from app.services.llm import shorten_text_with_llm, shorten_texts_with_llm
+from app.services.llm_client import LLMClientManager
 
 logger = logging.getLogger(__name__)
 
+# Emoji and pictograph ranges (plus variation selectors / zero-width joiners)
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F1E6-\U0001F1FF"  # flags
+    "\U0001F300-\U0001FAFF"  # symbols, pictographs, emoticons, transport, supplemental
+    "\u2600-\u27BF"  # misc symbols and dingbats
+    "\u2B00-\u2BFF"  # arrows, stars
+    "\uFE0F\u200D"  # variation selector, zero-width joiner
+    "]+"
+)
+
+# UK English ad abbreviations, applied in order until the text fits
+_ABBREVIATION_RULES = [
+    (r"\band\b", "&"),
+    (r"\bUniversity\b", "Uni"),
+    (r"\buniversity\b", "uni"),
+    (r"\bUniversities\b", "Unis"),
+    (r"\buniversities\b", "unis"),
+    (r"\b([Ii])nformation\b", r"\1nfo"),
+    (r"\b([Uu])ndergraduate\b", r"\1ndergrad"),
+    (r"\b([Pp])ostgraduate\b", r"\1ostgrad"),
+    (r"\b([Aa])ccommodation\b", r"\1ccom"),
+    (r"\b([Aa])pproximately\b", r"\1pprox"),
+    (r"\b([Dd])epartment\b", r"\1ept"),
+    (r"\b([Pp])rofessor\b", r"\1rof"),
+    (r"\bminutes\b", "mins"),
+    (r"\s?\bper ?cent\b", "%"),
+    (r"\bSeptember\b", "Sept"),
+    (r"\bJanuary\b", "Jan"),
+    (r"\bFebruary\b", "Feb"),
+    (r"\bOctober\b", "Oct"),
+    (r"\bNovember\b", "Nov"),
+    (r"\bDecember\b", "Dec"),
+]
+ABBREVIATIONS = [(re.compile(pattern), replacement) for pattern, replacement in _ABBREVIATION_RULES]
+
+# Wordy phrases with shorter equivalents, then filler words that can go entirely
+_FILLER_PHRASE_RULES = [
+    (r"\bin order to\b", "to"),
+    (r"\ba (?:wide )?(?:range|variety) of\b", "many"),
+    (r"\ba number of\b", "several"),
+    (r"\bat the moment\b", "now"),
+    (r"\bas well as\b", "&"),
+    (r"\bright now\b", "now"),
+]
+FILLER_PHRASES = [
+    (re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in _FILLER_PHRASE_RULES
+]
+FILLER_WORDS = re.compile(
+    r"\s+\b(?:very|really|truly|just|actually|simply|extremely|highly|incredibly|absolutely)\b",
+    re.IGNORECASE,
+)
+
+# Phrases marking a clause as the call-to-action
+CTA_KEYWORDS = [
+    "apply", "book", "register", "enquire", "sign up", "download", "find out",
+    "learn more", "discover", "explore", "join", "visit", "get started",
+    "open day", "contact", "get in touch",
+]
+
+# Captures the separator so clauses can be re-joined with their own punctuation
+CLAUSE_SPLIT = re.compile(r"((?<=[.!?;])\s+|\s+[-–—]\s+|,\s+)")
+
+
+WHITESPACE = re.compile(r"\s+")
+SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([,.!?;:])")
+REPEATED_PUNCTUATION = re.compile(r"([!?.])\1+")
+
+
+def _compact(text: str) -> str:
+    """Collapse whitespace and redundant punctuation."""
+    text = WHITESPACE.sub(" ", text).strip()
+    text = SPACE_BEFORE_PUNCTUATION.sub(r"\1", text)
+    return REPEATED_PUNCTUATION.sub(r"\1", text)
+
+
+def _is_cta(clause: str) -> bool:
+    clause_lower = clause.lower()
+    return any(keyword in clause_lower for keyword in CTA_KEYWORDS)
+
+
+def _drop_clauses(text: str, max_chars: int, keep_cta: bool) -> Optional[str]:
+    """Drop trailing non-CTA clauses until the text fits, keeping the first clause."""
+    parts = CLAUSE_SPLIT.split(text)
+    clauses, separators = parts[0::2], parts[1::2]
+    if len(clauses) < 2 or not all(clauses):
+        return None
+
+    kept = list(range(len(clauses)))
+    # Drop from the end, skipping the opening clause and (optionally) CTA clauses
+    for idx in reversed(range(1, len(clauses))):
+        if keep_cta and _is_cta(clauses[idx]):
+            continue
+        kept.remove(idx)
+        candidate = _join_clauses(clauses, separators, kept)
+        if len(candidate) <= max_chars:
+            return candidate
+
+    return None
+
+
+def _join_clauses(clauses: list[str], separators: list[str], kept: list[int]) -> str:
+    """
+    Re-join the kept clauses, reusing the original punctuation between them.
+
+    Neighbours keep the separator they had. Across a gap, a clause that
+    originally started a sentence still does (the clause before it gets a
+    full stop if it has no end punctuation); otherwise the earlier clause's
+    own separator is reused. A clause placed after a full stop is capitalised.
+    """
+    text = clauses[kept[0]]
+    for previous, current in zip(kept, kept[1:]):
+        clause = clauses[current]
+        if current == previous + 1:
+            text += separators[previous] + clause
+            continue
+
+        if not separators[current - 1].strip():
+            # Originally the start of a sentence
+            joiner = (" " if text[-1] in ".!?;" else ". ")
+        else:
+            joiner = separators[previous]
+        if (text + joiner).rstrip()[-1] in ".!?":
+            clause = clause[0].upper() + clause[1:]
+        text += joiner + clause
+    return text
+
+
+def shorten_locally(
+    text: str,
+    max_chars: int,
+    keep_cta: bool = True,
+    remove_emojis: bool = False,
+) -> Optional[tuple[str, str]]:
+    """
+    Try cheap deterministic transforms to bring text within the limit.
+
+    Tiers are applied cumulatively, cheapest first: whitespace/punctuation
+    compaction, UK-English ad abbreviations, filler removal, then dropping
+    trailing clauses (keeping any CTA clause when keep_cta is set).
+
+    Returns:
+        Tuple of (shortened text, tier name), or None if no tier fits
+    """
+    candidate = EMOJI_PATTERN.sub("", text) if remove_emojis else text
+
+    candidate = _compact(candidate)
+    if len(candidate) <= max_chars:
+        return candidate, "compact"
+
+    for pattern, replacement in ABBREVIATIONS:
+        candidate = pattern.sub(replacement, candidate)
+        if len(candidate) <= max_chars:
+            return candidate, "abbreviate"
+
+    for pattern, replacement in FILLER_PHRASES:
+        candidate = pattern.sub(replacement, candidate)
+    candidate = _compact(FILLER_WORDS.sub("", candidate))
+    if len(candidate) <= max_chars:
+        return candidate, "filler"
+
+    dropped = _drop_clauses(candidate, max_chars, keep_cta)
+    if dropped is not None:
+        return dropped, "clause"
+
+    return None
+
 
 async def shorten_copy(
     text: str,
     max_chars: int,
     keep_cta: bool = True,
     remove_emojis: bool = False,
-) -> str:
+    llm: Optional[LLMClientManager] = None,
+) -> tuple[str, str]:
     """
     Shorten ad copy to fit within character limit.
 
-    Uses LLM-based shortening to preserve meaning and impact.
+    Tries the local deterministic tiers first (see shorten_locally) and only
+    falls back to LLM-based shortening when none of them fit.
 
     Args:
         text: Text to shorten
         max_chars: Maximum character count
         keep_cta: Whether to preserve CTA phrases
         remove_emojis: Whether to strip emojis
+        llm: Shared LLM client manager (defaults to the process-wide one)
 
     Returns:
-        Shortened text within character limit
+        Tuple of (shortened text within character limit, method used)
     """
     if len(text) <= max_chars:
         logger.info(f"Text already within limit ({len(text)}/{max_chars} chars)")
-        return text
+        return text, "none"
+
+    local = shorten_locally(text, max_chars, keep_cta=keep_cta, remove_emojis=remove_emojis)
+    if local is not None:
+        shortened, method = local
+        logger.info(f"Shortened text locally ({method}) from {len(text)} to {len(shortened)} chars")
+        return shortened, method
 
-    logger.info(f"Shortening text from {len(text)} to {max_chars} chars")
+    logger.info(f"Shortening text from {len(text)} to {max_chars} chars with LLM")
 
     shortened = await shorten_text_with_llm(
         text=text,
         max_chars=max_chars,
         keep_cta=keep_cta,
         remove_emojis=remove_emojis,
+        llm=llm,
     )
 
-    return shortened
+    return shortened, "llm"
+
+
+async def shorten_copy_batch(
+    items: list[ShortenRequest],
+    llm: Optional[LLMClientManager] = None,
+) -> list[ShortenBatchItem]:
+    """
+    Shorten many texts, using at most one LLM call for the whole batch.
+
+    Each item goes through the local tiers first; whatever is left is sent to
+    the model together in a single structured-output request.
+
+    Args:
+        items: Texts to shorten with their limits and preferences
+        llm: Shared LLM client manager (defaults to the process-wide one)
+
+    Returns:
+        One ShortenBatchItem per input item, in the same order
+    """
+    results: list[Optional[ShortenBatchItem]] = [None] * len(items)
+    needs_llm: list[int] = []
+
+    for idx, item in enumerate(items):
+        item_start = time.perf_counter()
+        if len(item.text) <= item.max_chars:
+            shortened, method = item.text, "none"
+        else:
+            local = shorten_locally(
+                item.text, item.max_chars, keep_cta=item.keep_cta, remove_emojis=item.remove_emojis
+            )
+            if local is None:
+                needs_llm.append(idx)
+                continue
+            shortened, method = local
+
+        results[idx] = ShortenBatchItem(
+            original=item.text,
+            shortened=shortened,
+            original_length=len(item.text),
+            shortened_length=len(shortened),
+            method=method,
+            time_ms=round((time.perf_counter() - item_start) * 1000, 3),
+        )
+
+    if needs_llm:
+        logger.info(f"Batch shortening: {len(items) - len(needs_llm)} local, {len(needs_llm)} via LLM")
+        llm_start = time.perf_counter()
+        shortened_texts = await shorten_texts_with_llm([items[idx] for idx in needs_llm], llm=llm)
+        llm_ms = round((time.perf_counter() - llm_start) * 1000, 3)
+
+        for idx, shortened in zip(needs_llm, shortened_texts):
+            results[idx] = ShortenBatchItem(
+                original=items[idx].text,
+                shortened=shortened,
+                original_length=len(items[idx].text),
+                shortened_length=len(shortened),
+                method="llm",
+                time_ms=llm_ms,
+            )
+
+    return results
@@ -0,0 +1,66 @@
+"""In-flight request coalescing ("single-flight") for expensive upstream calls."""
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from app.services.deadline import detached_context, within_deadline
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def hash_key(*parts: Any) -> str:
+    """Build a compact, stable key from prompt text and parameters."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SingleFlight(Generic[T]):
+    """
+    Share one underlying call between concurrent callers with the same key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task. Each caller awaits through
+    `asyncio.shield`, so a caller being cancelled (e.g. a disconnecting client)
+    does not cancel the shared work for everyone else.
+
+    The work runs under its own deadline (see `detached_context`), and each
+    caller waits for it only within its own request deadline, so a caller
+    with a short deadline gives up alone. Any other context the work reads
+    (such as the LLM cache mode) must be part of the key.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` for `key`, or join the call already in flight for it."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fn(), context=detached_context())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.shared += 1
+            logger.debug(f"Joining in-flight {self.name} call")
+
+        return await within_deadline(asyncio.shield(task))
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark exceptions as retrieved when every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
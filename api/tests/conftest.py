@@ -0,0 +1,37 @@
+"""Shared fixtures for the API tests."""
+
+import os
+from typing import Any
+
+# Settings are read at import time by some modules; keep tests offline and in-memory
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("JOBS_STORE", "memory")
+os.environ.setdefault("LOG_SQLITE_URL", "")
+
+import pytest
+
+from app.deps import get_settings
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """Set environment overrides for Settings and rebuild the cached instance."""
+
+    def apply(**values: Any):
+        for key, value in values.items():
+            monkeypatch.setenv(key.upper(), str(value))
+        get_settings.cache_clear()
+        return get_settings()
+
+    yield apply
+    get_settings.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_cache(monkeypatch):
+    """Give every test an empty in-memory LLM response cache."""
+    from app.services import llm_cache
+
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
+    yield
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
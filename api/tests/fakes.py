@@ -0,0 +1,48 @@
+"""Test doubles shared across the API tests."""
+
+import asyncio
+from typing import Any, Callable, Union
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content: str):
+        self.message = _Message(content)
+
+
+class FakeCompletion:
+    """Minimal stand-in for an OpenAI ChatCompletion."""
+
+    def __init__(self, content: str):
+        self.choices = [_Choice(content)]
+        self.usage = None
+
+
+class FakeLLM:
+    """
+    LLMClientManager stand-in whose completions come from `responder`.
+
+    `responder` receives the chat_completion kwargs and returns the message
+    content, or raises to simulate an API failure. `delay` is a fixed latency
+    or a function of the kwargs (for per-prompt latency).
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[dict[str, Any]], str],
+        delay: Union[float, Callable[[dict[str, Any]], float]] = 0.0,
+    ):
+        self.responder = responder
+        self.delay = delay
+        self.calls: list[dict[str, Any]] = []
+
+    async def chat_completion(self, **kwargs: Any) -> FakeCompletion:
+        self.calls.append(kwargs)
+        delay = self.delay(kwargs) if callable(self.delay) else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+        return FakeCompletion(self.responder(kwargs))
@@ -0,0 +1,150 @@
+"""Tests for landing page analysis: combined LLM engine and keyword heuristics."""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services.analyse import (
+    COMBINED_ANALYSIS_CATEGORIES,
+    analyze_all_categories_with_llm,
+    calculate_overall_score,
+    create_page_summary,
+    score_education_specific,
+)
+from app.services.llm_cache import llm_cache_mode
+from app.services.markdown_doc import parse_markdown
+from app.services.scrape import ScrapedContent
+from tests.fakes import FakeLLM
+
+
+def _content(markdown: str = "# Study Law\n\nApply now for 2026 entry.") -> ScrapedContent:
+    content = ScrapedContent()
+    content.markdown = markdown
+    content.document = parse_markdown(markdown)
+    content.h1 = content.document.heading_texts(1)
+    content.paragraphs = content.document.paragraphs[:5]
+    content.word_count = content.document.word_count
+    return content
+
+
+def _combined_response(kwargs) -> str:
+    issue = {"title": "t", "description": "d", "suggestion": "s"}
+    return json.dumps({category: {"score": 8, "issues": [issue]} for category in COMBINED_ANALYSIS_CATEGORIES})
+
+
+async def test_combined_analysis_is_cached():
+    llm = FakeLLM(_combined_response)
+
+    first = await analyze_all_categories_with_llm(_content(), "Drive Applications", llm=llm)
+    second = await analyze_all_categories_with_llm(_content(), "Drive Applications", llm=llm)
+
+    assert first == second
+    assert len(llm.calls) == 1
+
+
+async def test_combined_analysis_bypass_skips_cache():
+    llm = FakeLLM(_combined_response)
+
+    await analyze_all_categories_with_llm(_content(), "Drive Applications", llm=llm)
+    with llm_cache_mode("bypass"):
+        await analyze_all_categories_with_llm(_content(), "Drive Applications", llm=llm)
+
+    assert len(llm.calls) == 2
+
+
+async def test_concurrent_combined_analyses_share_one_call():
+    llm = FakeLLM(_combined_response, delay=0.05)
+
+    results = await asyncio.gather(*(
+        analyze_all_categories_with_llm(_content(), "Drive Applications", llm=llm) for _ in range(5)
+    ))
+
+    assert len(llm.calls) == 1
+    assert all(result == results[0] for result in results)
+
+
+async def test_combined_fallback_is_not_cached():
+    def fail(kwargs):
+        raise RuntimeError("OpenAI 500")
+
+    failing = FakeLLM(fail)
+    fallback = await analyze_all_categories_with_llm(_content(), "Drive Applications", llm=failing)
+    assert fallback["content_clarity"]["issues"][0]["title"] == "Analysis unavailable"
+
+    llm = FakeLLM(_combined_response)
+    await analyze_all_categories_with_llm(_content(), "Drive Applications", llm=llm)
+    assert len(llm.calls) == 1
+
+
+async def test_combined_engine_makes_one_llm_call(settings_env):
+    settings_env(analysis_engine="combined", analysis_category_timeout_seconds=2)
+    llm = FakeLLM(_combined_response)
+
+    response = await calculate_overall_score(_content(), "Drive Applications", datetime.now(), llm=llm)
+
+    assert len(llm.calls) == 1
+    assert response.analysis_mode == "llm"
+    assert response.scores["content_clarity"].score == 20  # 8/10 scaled to 25
+
+
+def _prompt(kwargs) -> str:
+    return kwargs["messages"][-1]["content"]
+
+
+def _category_response(kwargs) -> str:
+    """Per-category responder: clarity fails, the others score 8 with a category-specific issue."""
+    prompt = _prompt(kwargs)
+    if "jargon-free" in prompt:
+        raise RuntimeError("OpenAI 500")
+    title = "Layout issue" if "not cluttered" in prompt else "Conversion issue"
+    return json.dumps({"score": 8, "issues": [{"title": title, "description": "d", "suggestion": "s"}]})
+
+
+async def test_slow_or_failing_category_falls_back_alone(settings_env):
+    settings_env(analysis_engine="per_category", analysis_category_timeout_seconds=0.2)
+    llm = FakeLLM(_category_response, delay=lambda kwargs: 5 if "not cluttered" in _prompt(kwargs) else 0)
+
+    start = asyncio.get_running_loop().time()
+    response = await calculate_overall_score(_content(), "Drive Applications", datetime.now(), llm=llm)
+
+    assert asyncio.get_running_loop().time() - start < 1
+    assert len(llm.calls) == 3
+    assert response.scores["content_clarity"].score == 12  # Failed: analyze_with_llm fallback
+    assert response.scores["page_usability"].score == 12  # Timed out: neutral score
+    assert response.scores["conversion_elements"].score >= 20  # LLM result kept
+    assert [(issue.category, issue.title) for issue in response.issues][:3] == [
+        ("Content Clarity", "Analysis unavailable"),
+        ("Page Usability", "Analysis unavailable"),
+        ("Conversion Elements", "Conversion issue"),
+    ]
+
+
+async def test_combined_engine_applies_the_category_timeout(settings_env):
+    settings_env(analysis_engine="combined", analysis_category_timeout_seconds=0.2)
+    llm = FakeLLM(_combined_response, delay=5)
+
+    start = asyncio.get_running_loop().time()
+    response = await calculate_overall_score(_content(), "Drive Applications", datetime.now(), llm=llm)
+
+    assert asyncio.get_running_loop().time() - start < 1
+    assert len(llm.calls) == 1
+    assert all(score.score == 12 for score in response.scores.values())
+
+
+@pytest.mark.parametrize("markdown, expects_issue", [
+    ("Our degree course has modules in every year", False),
+    ("A degree course", False),
+    ("Nothing relevant", True),
+])
+def test_education_course_mentions(markdown, expects_issue):
+    _, issues = score_education_specific(_content(markdown), "Course Information")
+    assert any(issue.title == "Insufficient course information" for issue in issues) == expects_issue
+
+
+def test_page_summary_keyword_flags():
+    summary = create_page_summary(_content("Read a student testimonial. Ranked top 10 for teaching."))
+    assert summary.has_testimonials
+    assert summary.has_rankings
+    assert not create_page_summary(_content("Plain page")).has_rankings
@@ -0,0 +1,99 @@
+"""Tests for the rolling-window circuit breaker."""
+
+import time
+
+import pytest
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def _breaker(**overrides) -> CircuitBreaker:
+    options = dict(
+        window_seconds=60,
+        min_calls=4,
+        failure_rate_threshold=0.5,
+        slow_call_seconds=10,
+        slow_call_rate_threshold=0.8,
+        open_seconds=30,
+        half_open_probes=1,
+    )
+    options.update(overrides)
+    return CircuitBreaker("upstream", **options)
+
+
+def _calls(breaker: CircuitBreaker, outcomes: list[bool], duration: float = 0.1) -> None:
+    for success in outcomes:
+        breaker.before_call()
+        breaker.record(success=success, duration=duration)
+
+
+def test_opens_once_failure_rate_crosses_threshold(clock):
+    breaker = _breaker()
+    _calls(breaker, [False, False, True])
+    assert breaker.state == "closed"  # Below min_calls
+
+    _calls(breaker, [True])
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.rejected == 1
+
+
+def test_opens_on_slow_calls(clock):
+    breaker = _breaker()
+    _calls(breaker, [True] * 4, duration=12)
+    assert breaker.state == "open"
+
+
+def test_old_calls_leave_the_window(clock):
+    breaker = _breaker()
+    _calls(breaker, [False, False, False])
+    clock.now += 61
+    _calls(breaker, [True, True, True, False])
+    assert breaker.state == "closed"
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    breaker = _breaker()
+    _calls(breaker, [False] * 4)
+    assert breaker.is_open
+
+    clock.now += 31
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # Only one probe at a time
+    breaker.record(success=False, duration=0.1)
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+
+    clock.now += 31
+    _calls(breaker, [True])
+    assert breaker.state == "closed"
+    assert breaker.stats()["calls"] == 0
+
+
+def test_released_probe_frees_its_slot(clock):
+    breaker = _breaker()
+    _calls(breaker, [False] * 4)
+    clock.now += 31
+
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    assert breaker.state == "half_open"
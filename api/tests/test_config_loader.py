@@ -0,0 +1,157 @@
+"""Tests for config snapshot loading, the compiled artifact and the watcher."""
+
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app import config_loader
+from app.config_loader import (
+    ARTIFACT_FILE,
+    CONFIG_FILES,
+    build_snapshot,
+    compile_config_artifact,
+    get_ad_limits_for_channel,
+    get_asset_specs_for_channel,
+    load_snapshot,
+)
+
+_REPO_DATA = Path(__file__).resolve().parents[2] / "data"
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A private copy of the YAML config, used as the data directory."""
+    for file_name in CONFIG_FILES:
+        shutil.copy(_REPO_DATA / file_name, tmp_path / file_name)
+    monkeypatch.setattr(config_loader, "_data_path", tmp_path)
+    monkeypatch.setattr(config_loader, "_snapshot", None)
+    return tmp_path
+
+
+def _limit(channel: str, subtype: str | None, field: str) -> dict:
+    return {"channel": channel, "subtype": subtype, "fields": [{"field": field, "max_chars": 30, "emojis_allowed": False}]}
+
+
+@pytest.fixture
+def indexed_snapshot(monkeypatch):
+    """Publish a small hand-written snapshot for the lookup helpers."""
+    snapshot = build_snapshot(
+        [
+            _limit("SEARCH", "Open Day", "open_day_headline"),
+            _limit("SEARCH", None, "generic_headline"),
+            _limit("SEARCH", "Open Day", "duplicate_headline"),
+        ],
+        [
+            {"channel": "TikTok", "placement_or_format": "In-feed"},
+            {"channel": "TIKTOK", "placement_or_format": "TopView"},
+        ],
+        {
+            "social_channels": ["TIKTOK"],
+            "non_emoji_channels": ["SEARCH"],
+            "all_channels": ["SEARCH", "TIKTOK"],
+            "tones": [],
+            "audiences": [],
+            "subtypes": [],
+        },
+    )
+    monkeypatch.setattr(config_loader, "_snapshot", snapshot)
+    return snapshot
+
+
+def test_ad_limits_exact_match_wins_and_first_duplicate_is_kept(indexed_snapshot):
+    limit = get_ad_limits_for_channel("SEARCH", "Open Day")
+    assert [field.field for field in limit.fields] == ["open_day_headline"]
+
+
+def test_ad_limits_fall_back_to_channel_without_subtype(indexed_snapshot):
+    assert get_ad_limits_for_channel("SEARCH", "Clearing").fields[0].field == "generic_headline"
+    assert get_ad_limits_for_channel("SEARCH").fields[0].field == "generic_headline"
+    assert get_ad_limits_for_channel("DISPLAY", "Open Day") is None
+
+
+def test_asset_specs_lookup_is_case_insensitive(indexed_snapshot):
+    formats = ["In-feed", "TopView"]
+    for channel in ("TIKTOK", "TikTok", "tiktok"):
+        assert [spec.placement_or_format for spec in get_asset_specs_for_channel(channel)] == formats
+    assert get_asset_specs_for_channel("SNAPCHAT") == []
+
+
+def test_stale_artifact_is_not_rewritten_on_load(data_dir):
+    snapshot = load_snapshot(use_artifact=True)
+
+    assert snapshot.ad_limits
+    assert not (data_dir / ARTIFACT_FILE).exists()
+
+
+def test_artifact_written_at_startup_and_reused(data_dir):
+    load_snapshot(use_artifact=True, write_artifact=True)
+    assert (data_dir / ARTIFACT_FILE).exists()
+
+    reloaded = load_snapshot(use_artifact=True)
+    assert len(reloaded.ad_limits) == len(load_snapshot(use_artifact=False).ad_limits)
+
+
+def test_model_shape_change_invalidates_artifact(data_dir, monkeypatch):
+    load_snapshot(use_artifact=True, write_artifact=True)
+    sources = {name: (data_dir / name).read_bytes() for name in CONFIG_FILES}
+    fingerprint = config_loader._artifact_fingerprint(sources)
+    assert config_loader._load_artifact(fingerprint) is not None
+
+    schema = config_loader.AdLimit.model_json_schema()
+    schema["properties"]["new_field"] = {"type": "string"}
+    monkeypatch.setattr(config_loader.AdLimit, "model_json_schema", classmethod(lambda cls: schema))
+    config_loader._models_signature.cache_clear()
+    try:
+        changed = config_loader._artifact_fingerprint(sources)
+        assert changed != fingerprint
+        assert config_loader._load_artifact(changed) is None
+    finally:
+        config_loader._models_signature.cache_clear()
+
+
+def test_artifact_write_failure_does_not_break_loading(data_dir, monkeypatch):
+    def broken_dump(*args, **kwargs):
+        raise pickle.PicklingError("cannot pickle")
+
+    monkeypatch.setattr(config_loader.pickle, "dump", broken_dump)
+
+    assert compile_config_artifact() is None
+    assert load_snapshot(use_artifact=True, write_artifact=True).ad_limits
+    assert not list(data_dir.glob("*.tmp"))
+
+
+def _break_config(data_dir: Path) -> None:
+    (data_dir / "ad_limits.yaml").write_text("channels: [unterminated\n")
+
+
+async def test_watcher_starts_when_initial_config_is_broken(data_dir):
+    _break_config(data_dir)
+    watcher = config_loader.ConfigWatcher(interval_seconds=3600)
+
+    await watcher.start()
+    try:
+        assert watcher.running
+        assert watcher.failures == 1
+
+        # Fixing the file is picked up by the next poll
+        shutil.copy(_REPO_DATA / "ad_limits.yaml", data_dir / "ad_limits.yaml")
+        assert await watcher.check()
+        assert config_loader._snapshot is not None
+    finally:
+        await watcher.stop()
+
+
+async def test_failed_reload_is_retried_on_next_poll(data_dir):
+    watcher = config_loader.ConfigWatcher(interval_seconds=3600)
+    await watcher.start()
+    try:
+        good = config_loader._snapshot
+        _break_config(data_dir)
+        assert not await watcher.check()
+        assert not await watcher.check()
+        assert watcher.failures == 2
+        assert config_loader._snapshot is good
+    finally:
+        await watcher.stop()
@@ -0,0 +1,69 @@
+"""Tests for per-request deadlines."""
+
+import asyncio
+
+import pytest
+
+from app.services.deadline import (
+    DeadlineExceeded,
+    deadline_scope,
+    has_budget,
+    remaining,
+    resolve_budget,
+    skip_stage,
+    stage_timeout,
+    within_deadline,
+)
+
+
+def test_resolve_budget(settings_env):
+    settings_env(request_deadline_seconds=45, request_deadline_max_seconds=120)
+
+    assert resolve_budget(None, None) == 45
+    assert resolve_budget(None, 10_000) == 10
+    assert resolve_budget(5_000, 10_000) == 5
+    assert resolve_budget(600_000) == 120
+
+
+def test_no_deadline_by_default():
+    assert remaining() is None
+    assert has_budget(1000)
+    assert stage_timeout(20) == 20
+
+
+def test_nested_scope_only_shortens():
+    with deadline_scope(1) as skipped:
+        with deadline_scope(60):
+            assert remaining() <= 1
+            assert stage_timeout(20) <= 1
+            skip_stage("repair")
+            skip_stage("repair")
+        assert not has_budget(5)
+    assert skipped == ["repair"]
+    assert remaining() is None
+
+
+async def test_within_deadline():
+    with deadline_scope(0.02):
+        with pytest.raises(DeadlineExceeded):
+            await within_deadline(asyncio.sleep(1))
+
+    with deadline_scope(5):
+        # The stage's own, shorter timeout is a plain timeout, not the deadline
+        with pytest.raises(asyncio.TimeoutError) as excinfo:
+            await within_deadline(asyncio.sleep(1), default_timeout=0.01)
+        assert not isinstance(excinfo.value, DeadlineExceeded)
+        assert await within_deadline(asyncio.sleep(0, result="done")) == "done"
+
+
+async def test_expired_deadline_does_not_start_work():
+    started = False
+
+    async def work():
+        nonlocal started
+        started = True
+
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded):
+            await within_deadline(work())
+    assert not started
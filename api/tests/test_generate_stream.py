@@ -0,0 +1,162 @@
+"""Tests for the streaming copy generation and campaign endpoints."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.io import CampaignTarget, GenerateCampaignRequest, GenerateRequest
+from app.routes import generate
+from app.services.scrape import ScrapedContent
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+    return events
+
+
+async def test_slow_repair_does_not_hold_up_later_options(monkeypatch):
+    async def fake_stream(**kwargs):
+        for option in (1, 2):
+            yield "option", {"option": option, "data": {}, "cached": False}
+
+    async def fake_repair(options, warnings, llm, timings):
+        if options[0].option == 1:
+            await asyncio.sleep(0.05)
+        return warnings
+
+    monkeypatch.setattr(generate, "stream_copy_with_openai", fake_stream)
+    monkeypatch.setattr(generate, "_repair_options", fake_repair)
+    request = GenerateRequest(
+        channel="SEARCH",
+        subtype="Brand level recruitment",
+        university="Example University",
+        tone="Friendly",
+        audience="Undergraduates",
+        usps="Top rated",
+    )
+
+    response = await generate.generate_copy_stream(request, tokens=False, llm=None, x_request_deadline_ms=None)
+    body = "".join([chunk async for chunk in response.body_iterator])
+    events = _events(body)
+
+    assert [payload["option"] for event, payload in events if event == "option"] == [2, 1]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["options"] == 2
+
+
+def _campaign(*targets: tuple[str, str], **brief) -> GenerateCampaignRequest:
+    return GenerateCampaignRequest(
+        university="Example University",
+        tone="Friendly",
+        audience="Undergraduates",
+        usps="Top rated",
+        targets=[CampaignTarget(channel=channel, subtype=subtype) for channel, subtype in targets],
+        **brief,
+    )
+
+
+class FakeCampaignBackend:
+    """Stands in for the scrape and per-target generation, recording calls and concurrency."""
+
+    def __init__(self, monkeypatch, fail_subtypes: tuple[str, ...] = (), delay: float = 0.01):
+        self.fail_subtypes = fail_subtypes
+        self.delay = delay
+        self.scrapes: list[str] = []
+        self.contexts: list[str] = []
+        self.running = 0
+        self.max_running = 0
+        monkeypatch.setattr(generate, "_scrape_context", self.scrape)
+        monkeypatch.setattr(generate, "_generate_validated_options", self.generate)
+
+    async def scrape(self, landing_url: str):
+        self.scrapes.append(landing_url)
+        content = ScrapedContent()
+        content.word_count = 120
+        return "Landing page summary", content
+
+    async def generate(self, *, subtype, scraped_context, **kwargs):
+        self.contexts.append(scraped_context)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if subtype in self.fail_subtypes:
+                raise RuntimeError("model unavailable")
+            return [], [], "test-model", "openai", {"generation_ms": 1}
+        finally:
+            self.running -= 1
+
+
+async def _campaign_events(request: GenerateCampaignRequest) -> list[tuple[str, dict]]:
+    response = await generate.generate_campaign(request, llm=None, x_request_deadline_ms=None)
+    return _events("".join([chunk async for chunk in response.body_iterator]))
+
+
+async def test_campaign_scrapes_once_for_all_targets(monkeypatch):
+    backend = FakeCampaignBackend(monkeypatch)
+    request = _campaign(
+        ("SEARCH", "Brand level recruitment"),
+        ("SEARCH", "Open Day"),
+        ("DISPLAY", "Clearing"),
+        landing_url="https://example.ac.uk/study",
+    )
+
+    events = await _campaign_events(request)
+
+    assert backend.scrapes == ["https://example.ac.uk/study"]
+    assert backend.contexts == ["Landing page summary"] * 3
+    assert [event for event, _ in events][:2] == ["targets", "scrape"]
+    assert events[1][1]["word_count"] == 120
+    assert sorted(payload["target"] for event, payload in events if event == "target") == [0, 1, 2]
+
+
+async def test_campaign_reports_invalid_and_failed_targets(monkeypatch):
+    FakeCampaignBackend(monkeypatch, fail_subtypes=("Clearing",))
+    request = _campaign(
+        ("SEARCH", "Brand level recruitment"),
+        ("NOT A CHANNEL", "Brand level recruitment"),
+        ("DISPLAY", "Clearing"),
+    )
+
+    events = await _campaign_events(request)
+
+    targets = events[0][1]
+    assert [target["target"] for target in targets["targets"]] == [0, 2]
+    assert [invalid["target"] for invalid in targets["invalid"]] == [1]
+
+    errors = {payload["target"]: payload["error"] for event, payload in events if event == "target_error"}
+    assert set(errors) == {1, 2}
+    assert "No field limits found" in errors[1]
+    assert "model unavailable" in errors[2]
+    assert [payload["target"] for event, payload in events if event == "target"] == [0]
+
+    assert events[-1] == ("done", {**events[-1][1], "targets": 3, "succeeded": 1, "failed": 2})
+
+
+async def test_campaign_caps_concurrent_targets(monkeypatch, settings_env):
+    settings_env(campaign_max_concurrent_targets=2)
+    backend = FakeCampaignBackend(monkeypatch, delay=0.02)
+    request = _campaign(*[("SEARCH", "Brand level recruitment")] * 5, ("DISPLAY", "Open Day"))
+
+    events = await _campaign_events(request)
+
+    assert backend.max_running == 2
+    assert len(backend.contexts) == 6
+    assert events[-1][1]["succeeded"] == 6
+    assert events[-1][1]["failed"] == 0
+
+
+async def test_campaign_without_valid_targets_is_rejected(monkeypatch):
+    FakeCampaignBackend(monkeypatch)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await generate.generate_campaign(
+            _campaign(("NOT A CHANNEL", "Nothing")), llm=None, x_request_deadline_ms=None
+        )
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,69 @@
+"""Tests for single-pass HTML extraction."""
+
+from app.services.html_extract import cta_texts, extract_html
+from app.services.scrape import ScrapedContent
+
+PAGE = """
+<html><head>
+  <title> Study Nursing </title>
+  <meta name="description" content="Nursing degrees">
+  <script>var words = "not page copy";</script>
+</head><body>
+  <header><img src="logo.png"><a href="/">Home</a></header>
+  <nav><a href="/courses">Courses</a></nav>
+  <main>
+    <h1>Nursing BSc</h1>
+    <h2>Why study with us</h2>
+    <p>Placements from year one.</p>
+    <img src="ward.jpg" alt="Students on a ward">
+    <img src="campus.jpg">
+    <a href="/apply" class="btn">Apply now</a>
+    <a href="/more">read more</a>
+    <form><input type="email"><textarea></textarea><input type="submit" value="Send"></form>
+    <button>Book an open day</button>
+  </main>
+  <footer><a href="/privacy">Privacy</a><img src="badge.png"></footer>
+</body></html>
+"""
+
+
+def _extract(html: str) -> ScrapedContent:
+    content = ScrapedContent()
+    extract_html(html, content)
+    return content
+
+
+def test_page_structure():
+    content = _extract(PAGE)
+
+    assert content.title == "Study Nursing"
+    assert content.meta_description == "Nursing degrees"
+    assert content.h1 == ["Nursing BSc"]
+    assert content.h2 == ["Why study with us"]
+    assert content.paragraphs == ["Placements from year one."]
+    assert content.ctas == ["Apply now", "Book an open day"]
+    assert content.forms == [{"inputs": 3}]
+
+
+def test_images_and_links_exclude_site_chrome():
+    content = _extract(PAGE)
+
+    assert [image["src"] for image in content.images] == ["ward.jpg", "campus.jpg"]
+    assert [image["has_alt"] for image in content.images] == [True, False]
+    assert [link["href"] for link in content.links] == ["/apply", "/more"]
+
+
+def test_without_main_only_header_nav_and_footer_are_excluded():
+    content = _extract(PAGE.replace("<main>", "<div>").replace("</main>", "</div>"))
+
+    assert [image["src"] for image in content.images] == ["ward.jpg", "campus.jpg"]
+    assert [link["href"] for link in content.links] == ["/apply", "/more"]
+
+
+def test_script_text_is_not_counted():
+    with_script = _extract("<body><p>two words</p><script>lots of other words here</script></body>")
+    assert with_script.word_count == 2
+
+
+def test_cta_texts_dedupes_in_order():
+    assert cta_texts(["Apply now", "About us", "Apply now", "Book a visit"]) == ["Apply now", "Book a visit"]
@@ -0,0 +1,203 @@
+"""Tests for the background job manager and its stores."""
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from app.deps import get_settings
+from app.services import jobs
+from app.services.jobs import (
+    CallbackURLError,
+    Job,
+    JobManager,
+    JobQueueFullError,
+    MemoryJobStore,
+    SQLiteJobStore,
+    check_callback_url,
+)
+
+
+async def _echo(payload):
+    return {"echo": payload}
+
+
+def _manager(store, **overrides) -> JobManager:
+    settings = get_settings().model_copy(update=overrides)
+    manager = JobManager(store, settings)
+    manager.register("echo", _echo)
+    return manager
+
+
+@pytest.mark.parametrize("url", [
+    "http://localhost/hook",
+    "http://127.0.0.1/hook",
+    "http://10.1.2.3/hook",
+    "http://169.254.169.254/latest/meta-data",
+    "http://[::1]/hook",
+    "ftp://example.com/hook",
+])
+def test_private_callback_urls_rejected(url):
+    with pytest.raises(CallbackURLError):
+        check_callback_url(url, [])
+
+
+def test_callback_allowlist():
+    check_callback_url("https://hooks.example.com/x", ["hooks.example.com"])
+    check_callback_url("https://a.example.com/x", [".example.com"])
+    check_callback_url("http://10.0.0.5/x", ["10.0.0.5"])  # Explicitly trusted
+    with pytest.raises(CallbackURLError):
+        check_callback_url("https://evil.com/x", [".example.com"])
+
+
+async def test_callback_resolving_to_private_address_is_not_sent(monkeypatch):
+    async def getaddrinfo(host, port, **kwargs):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 0, "", ("10.0.0.7", port))]
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+    manager = _manager(MemoryJobStore())
+
+    with pytest.raises(CallbackURLError):
+        await manager._callback_request("https://rebind.example.com/hook")
+
+
+async def test_callback_is_pinned_to_checked_address(monkeypatch):
+    async def getaddrinfo(host, port, **kwargs):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 0, "", ("93.184.216.34", port))]
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+    manager = _manager(MemoryJobStore())
+
+    url, headers, extensions = await manager._callback_request("https://hooks.example.com:8443/done")
+
+    assert str(url) == "https://93.184.216.34:8443/done"
+    assert headers == {"Host": "hooks.example.com:8443"}
+    assert extensions == {"sni_hostname": "hooks.example.com"}
+
+
+async def test_concurrent_submits_never_overfill_queue(monkeypatch):
+    store = MemoryJobStore()
+    original_save = store.save
+
+    async def slow_save(job):
+        await asyncio.sleep(0.01)
+        await original_save(job)
+
+    monkeypatch.setattr(store, "save", slow_save)
+    manager = _manager(store, jobs_max_queued=2)
+
+    results = await asyncio.gather(*(manager.submit("echo", {}) for _ in range(5)), return_exceptions=True)
+
+    submitted = [r for r in results if isinstance(r, Job)]
+    assert len(submitted) == 2
+    assert all(isinstance(r, JobQueueFullError) for r in results if not isinstance(r, Job))
+    assert len(store._jobs) == 2  # No orphaned "queued" rows
+
+
+async def test_restart_only_fails_abandoned_jobs(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    live_store, restarted_store = SQLiteJobStore(path), SQLiteJobStore(path)
+    live = _manager(live_store)
+    restarted = _manager(restarted_store)
+
+    live_job = Job(id="live", kind="echo", payload={}, owner=live.owner)
+    dead_job = Job(id="dead", kind="echo", payload={}, owner="crashed-host:1:abc")
+    await live_store.save(live_job)
+    await live_store.save(dead_job)
+    # The crashed process stopped renewing an hour ago
+    live_store._conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = 'dead'", (time.time() - 3600,))
+    live_store._conn.commit()
+
+    await restarted._fail_abandoned()
+
+    assert (await restarted_store.get("live")).status == "queued"
+    dead = await restarted_store.get("dead")
+    assert dead.status == "failed"
+    assert dead.error == "Interrupted by server restart"
+
+    await live_store.close()
+    await restarted_store.close()
+
+
+class GatedHandler:
+    """Job handler that blocks until released, so a test can act while the job runs."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self, payload):
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"done": True}
+
+
+async def _shared_store_managers(tmp_path, handler):
+    path = str(tmp_path / "jobs.sqlite3")
+    owner, other = _manager(SQLiteJobStore(path)), _manager(SQLiteJobStore(path))
+    owner.register("gated", handler)
+    await owner.start()
+    job = await owner.submit("gated", {})
+    await asyncio.wait_for(handler.started.wait(), 1)
+    return owner, other, job
+
+
+async def test_cancel_from_another_process_is_not_overwritten(tmp_path):
+    handler = GatedHandler()
+    owner, other, job = await _shared_store_managers(tmp_path, handler)
+
+    cancelled = await other.cancel(job.id)
+    assert cancelled.status == "cancelled"
+
+    # The owner finishes the handler before it notices the cancellation
+    handler.release.set()
+    await owner._queue.join()
+
+    stored = await owner.get(job.id)
+    assert stored.status == "cancelled"
+    assert stored.result is None
+
+    await owner.stop()
+    await other.store.close()
+
+
+async def test_owner_stops_job_cancelled_by_another_process(tmp_path):
+    handler = GatedHandler()
+    owner, other, job = await _shared_store_managers(tmp_path, handler)
+
+    await other.cancel(job.id)
+    await owner._stop_cancelled()
+    await owner._queue.join()
+
+    assert handler.cancelled
+    assert (await owner.get(job.id)).status == "cancelled"
+
+    await owner.stop()
+    await other.store.close()
+
+
+async def test_callback_tasks_are_tracked(monkeypatch):
+    sent = asyncio.Event()
+
+    async def send_callback(job):
+        sent.set()
+        await asyncio.sleep(3600)
+
+    manager = _manager(MemoryJobStore())
+    monkeypatch.setattr(manager, "_send_callback", send_callback)
+    await manager.start()
+
+    job = await manager.submit("echo", {"a": 1}, callback_url="https://hooks.example.com/done")
+    await asyncio.wait_for(sent.wait(), 1)
+
+    assert (await manager.get(job.id)).result == {"echo": {"a": 1}}
+    assert len(manager._callbacks) == 1
+
+    await manager.stop()
+    assert not manager._callbacks
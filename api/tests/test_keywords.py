@@ -0,0 +1,28 @@
+"""Tests for the shared keyword lookups."""
+
+from app.services.keywords import KeywordIndex, contains_any
+
+
+def test_lookups():
+    index = KeywordIndex("award-winning campus with great graduate careers")
+
+    assert "campus" in index
+    assert "library" not in index
+    assert index.first("campus") == 14
+    assert index.any(("library", "careers"))
+    assert not index.any(("library", "sport"))
+    assert index.distinct(("campus", "careers", "library", "campus")) == 3
+
+
+def test_lookups_are_memoized():
+    index = KeywordIndex("open day")
+    assert "open day" in index
+
+    index.text = ""  # Only the first lookup searches the text
+    assert "open day" in index
+    assert "book" not in index
+
+
+def test_contains_any():
+    assert contains_any("book your place", ("apply", "book"))
+    assert not contains_any("read more", ("apply", "book"))
@@ -0,0 +1,65 @@
+"""Tests for over-limit field repair."""
+
+import json
+
+import pytest
+
+from app.models.io import GeneratedField, GeneratedOption
+from app.services.limits import repair_over_limit_fields
+from tests.fakes import FakeLLM
+
+
+def _option(value: str, max_chars: int) -> GeneratedOption:
+    field = GeneratedField(
+        field="Headline",
+        value=value,
+        char_count=len(value),
+        max_chars=max_chars,
+        is_over_limit=len(value) > max_chars,
+        shortened=value[:max_chars],
+    )
+    return GeneratedOption(option=1, fields=[field])
+
+
+# Long enough that the local rules can't fix it, so it goes to the LLM
+_LONG = "Discover world leading research opportunities across our brilliant campus community"
+
+
+async def test_llm_repair_marks_field_fixed():
+    llm = FakeLLM(lambda kwargs: json.dumps({"results": [{"id": 0, "shortened": "Research at our campus"}]}))
+    option = _option(_LONG, 30)
+
+    warnings = await repair_over_limit_fields([option], llm=llm, budget_seconds=5)
+
+    field = option.fields[0]
+    assert field.value == "Research at our campus"
+    assert not field.is_over_limit
+    assert field.shortened is None
+    assert "(llm)" in warnings[0].message
+
+
+@pytest.mark.parametrize("responder", [
+    pytest.param(lambda kwargs: (_ for _ in ()).throw(RuntimeError("OpenAI 500")), id="api-error"),
+    pytest.param(lambda kwargs: json.dumps({"results": []}), id="omitted"),
+    pytest.param(lambda kwargs: json.dumps({"results": [{"id": 0, "shortened": _LONG}]}), id="still-too-long"),
+])
+async def test_failed_llm_repair_leaves_field_over_limit(responder):
+    option = _option(_LONG, 30)
+
+    warnings = await repair_over_limit_fields([option], llm=FakeLLM(responder), budget_seconds=5)
+
+    field = option.fields[0]
+    assert field.value == _LONG
+    assert field.is_over_limit
+    assert field.shortened == _LONG[:30]
+    assert "could not be repaired" in warnings[0].message
+
+
+async def test_repair_budget_exceeded_leaves_field_over_limit():
+    llm = FakeLLM(lambda kwargs: json.dumps({"results": [{"id": 0, "shortened": "Short"}]}), delay=1)
+    option = _option(_LONG, 30)
+
+    warnings = await repair_over_limit_fields([option], llm=llm, budget_seconds=0.05)
+
+    assert option.fields[0].is_over_limit
+    assert "could not be repaired" in warnings[0].message
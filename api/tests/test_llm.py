@@ -0,0 +1,105 @@
+"""Tests for per-option generation retries and concurrent option generation."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.models.domain import FieldLimit
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.deadline import DeadlineExceeded
+from app.services.llm import creativity_to_temperature, generate_copy_with_openai, generate_single_option
+from tests.fakes import FakeLLM
+
+
+async def _generate(llm: FakeLLM):
+    return await generate_single_option(
+        llm,
+        model="gpt-test",
+        system_prompt="system",
+        user_prompt="user",
+        schema_name="ad",
+        json_schema={"type": "object"},
+        temperature=0.7,
+        max_retries=3,
+    )
+
+
+async def test_bad_json_is_retried(settings_env):
+    settings_env(llm_backoff_base_seconds=0, llm_backoff_max_seconds=0)
+    responses = iter(["{not json", "", '{"headline": "Study here"}'])
+    llm = FakeLLM(lambda kwargs: next(responses))
+
+    assert await _generate(llm) == {"headline": "Study here"}
+    assert len(llm.calls) == 3
+
+
+@pytest.mark.parametrize("error", [
+    CircuitOpenError("openai", 30),
+    DeadlineExceeded("out of time"),
+    RuntimeError("400 Bad Request"),
+])
+async def test_other_errors_fail_without_retrying(error):
+    def fail(kwargs):
+        raise error
+
+    llm = FakeLLM(fail)
+
+    with pytest.raises(type(error)):
+        await _generate(llm)
+    assert len(llm.calls) == 1
+
+
+def _option_number(kwargs) -> int:
+    """Options differ only in temperature (base + 0.05 per option)."""
+    return round((kwargs["temperature"] - creativity_to_temperature(5)) / 0.05) + 1
+
+
+async def _generate_copy(llm: FakeLLM, num_options: int = 3):
+    return await generate_copy_with_openai(
+        channel="SEARCH",
+        subtype="Brand level recruitment",
+        university="Example University",
+        tone="Friendly",
+        audience="Undergraduates",
+        usps="Top rated",
+        fields=[FieldLimit(field="headline", max_chars=30, emojis_allowed=False)],
+        tone_hint="",
+        audience_hint="",
+        num_options=num_options,
+        llm=llm,
+    )
+
+
+async def test_options_are_generated_concurrently():
+    llm = FakeLLM(lambda kwargs: json.dumps({"headline": f"Option {_option_number(kwargs)}"}), delay=0.1)
+
+    start = asyncio.get_running_loop().time()
+    options, _, source = await _generate_copy(llm)
+
+    assert asyncio.get_running_loop().time() - start < 0.25  # Not 3 x 0.1s back to back
+    assert len(llm.calls) == 3
+    assert [option["headline"] for option in options] == ["Option 1", "Option 2", "Option 3"]
+    assert source == "openai"
+
+
+async def test_failed_options_are_dropped():
+    def respond(kwargs):
+        if _option_number(kwargs) == 2:
+            raise RuntimeError("400 Bad Request")
+        return json.dumps({"headline": f"Option {_option_number(kwargs)}"})
+
+    options, _, _ = await _generate_copy(FakeLLM(respond))
+
+    assert [option["headline"] for option in options] == ["Option 1", "Option 3"]
+
+
+async def test_all_options_failing_raises():
+    def fail(kwargs):
+        raise RuntimeError("400 Bad Request")
+
+    llm = FakeLLM(fail)
+
+    with pytest.raises(RuntimeError, match="400 Bad Request"):
+        await _generate_copy(llm)
+    assert len(llm.calls) == 3
@@ -0,0 +1,66 @@
+"""Tests for the LLM response cache."""
+
+import time
+
+from app.services.llm_cache import (
+    LLMResponseCache,
+    cached_response,
+    completion_cache_key,
+    llm_cache_mode,
+    store_response,
+)
+
+
+def test_key_ignores_whitespace_but_not_parameters():
+    key = completion_cache_key("gpt-4o-mini", 0.3, "You are  helpful.", "Score\nthis page", {"b": 1, "a": 2})
+
+    assert key == completion_cache_key("gpt-4o-mini", 0.3, "You are helpful.", "Score this page", {"a": 2, "b": 1})
+    assert key != completion_cache_key("gpt-4o-mini", 0.7, "You are helpful.", "Score this page", {"a": 2, "b": 1})
+    assert key != completion_cache_key("gpt-4o", 0.3, "You are helpful.", "Score this page", {"a": 2, "b": 1})
+
+
+async def test_values_are_copied_in_and_out():
+    cache = LLMResponseCache(max_entries=4, ttl_seconds=60)
+    value = {"usps": ["Top 10"]}
+    await cache.put("k", value)
+    value["usps"].append("changed")
+
+    cached = await cache.get("k")
+    cached["usps"].clear()
+    assert await cache.get("k") == {"usps": ["Top 10"]}
+
+
+async def test_expiry_and_eviction(monkeypatch):
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        await cache.put(key, key)
+    assert await cache.get("a") is None
+    assert cache.evictions == 1
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert await cache.get("c") is None
+
+
+async def test_entries_survive_restart_on_disk(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    cache = LLMResponseCache(max_entries=4, ttl_seconds=60, path=path)
+    await cache.put("k", {"score": 7})
+    await cache.close()
+
+    reopened = LLMResponseCache(max_entries=4, ttl_seconds=60, path=path)
+    assert await reopened.get("k") == {"score": 7}
+    assert reopened.stats()["persistent"]
+    await reopened.close()
+
+
+async def test_cache_mode_controls_reads_not_writes():
+    await store_response("k", "cached")
+
+    assert await cached_response("k", default_mode="prefer") == "cached"
+    assert await cached_response("k", default_mode="bypass") is None
+    with llm_cache_mode("bypass"):
+        assert await cached_response("k", default_mode="prefer") is None
+        await store_response("k", "refreshed")
+    with llm_cache_mode("prefer"):
+        assert await cached_response("k", default_mode="bypass") == "refreshed"
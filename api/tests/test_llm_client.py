@@ -0,0 +1,114 @@
+"""Tests for the shared LLM client's limits and circuit breaker handling of streams."""
+
+import asyncio
+
+import pytest
+
+from app.deps import get_settings
+from app.services import circuit_breaker
+from app.services.llm_client import LLMClientManager
+
+MODEL = "gpt-test"
+
+
+class _Delta:
+    def __init__(self, content):
+        self.content = content
+
+
+class _Chunk:
+    def __init__(self, content):
+        self.choices = [type("Choice", (), {"delta": _Delta(content)})()]
+
+
+class _FakeStream:
+    def __init__(self, parts, error=None):
+        self.parts = parts
+        self.error = error
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for part in self.parts:
+            yield _Chunk(part)
+        if self.error is not None:
+            raise self.error
+
+    async def close(self):
+        self.closed = True
+
+
+class _Completions:
+    def __init__(self, stream):
+        self.stream = stream
+
+    async def create(self, **kwargs):
+        return self.stream
+
+
+class _BlockingLimiter:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def acquire(self, tokens, priority):
+        await self.release.wait()
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+
+
+def _manager(stream) -> LLMClientManager:
+    manager = LLMClientManager(get_settings().model_copy(update={"llm_max_concurrency_per_model": 1}))
+    manager.client = type("Client", (), {"chat": type("Chat", (), {"completions": _Completions(stream)})()})()
+    return manager
+
+
+async def _collect(manager) -> list[str]:
+    return [part async for part in manager.stream_chat_completion(model=MODEL, messages=[])]
+
+
+async def test_stream_waits_for_budget_before_taking_a_slot():
+    stream = _FakeStream(["a", "b"])
+    manager = _manager(stream)
+    limiter = manager._limiters[MODEL] = _BlockingLimiter()
+
+    consumer = asyncio.create_task(_collect(manager))
+    await asyncio.sleep(0.01)
+    # Still waiting on the rate limiter: the concurrency slot is free for others
+    assert manager._semaphore(MODEL)._value == 1
+
+    limiter.release.set()
+    assert await consumer == ["a", "b"]
+    assert manager._semaphore(MODEL)._value == 1
+    assert stream.closed
+    await manager._http_client.aclose()
+
+
+async def test_mid_stream_error_is_recorded_on_breaker():
+    manager = _manager(_FakeStream(["a"], error=ConnectionResetError("reset")))
+    manager._limiters[MODEL] = None
+
+    with pytest.raises(ConnectionResetError):
+        await _collect(manager)
+
+    stats = circuit_breaker.get_breaker("openai").stats()
+    assert stats["calls"] == 1
+    assert stats["failure_rate"] == 1.0
+    assert manager._semaphore(MODEL)._value == 1
+    await manager._http_client.aclose()
+
+
+async def test_completed_stream_is_recorded_once_as_success():
+    manager = _manager(_FakeStream(["a"]))
+    manager._limiters[MODEL] = None
+
+    assert await _collect(manager) == ["a"]
+
+    stats = circuit_breaker.get_breaker("openai").stats()
+    assert stats["calls"] == 1
+    assert stats["failure_rate"] == 0.0
+    await manager._http_client.aclose()
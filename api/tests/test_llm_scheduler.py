@@ -0,0 +1,104 @@
+"""Tests for LLM rate budgets, priorities and retry helpers."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.services.llm_scheduler import (
+    ModelRateLimiter,
+    Priority,
+    backoff_delay,
+    current_priority,
+    estimate_tokens,
+    is_retryable,
+    llm_priority,
+    retry_after_seconds,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(status: int, headers: dict[str, str] | None = None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers, request=_REQUEST)
+    error_class = openai.RateLimitError if status == 429 else openai.APIStatusError
+    return error_class("error", response=response, body=None)
+
+
+def test_estimate_tokens():
+    kwargs = {"messages": [{"content": "x" * 400}, {"content": None}], "max_tokens": 50}
+    assert estimate_tokens(kwargs, completion_estimate=800) == 150
+    assert estimate_tokens({"messages": []}, completion_estimate=800) == 800
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (_status_error(429), True),
+    (_status_error(503), True),
+    (_status_error(400), False),
+    (openai.APIConnectionError(request=_REQUEST), True),
+    (ValueError("bad json"), False),
+])
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds(_status_error(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(_status_error(429, {"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(_status_error(429, {"retry-after": "Wed, 21 Oct 2026"})) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_backoff_delay_bounds():
+    for attempt in range(6):
+        assert 0 <= backoff_delay(attempt, 0.5, 4) <= min(4, 0.5 * 2 ** attempt)
+    assert 3 <= backoff_delay(0, 0.5, 30, retry_after=3) <= 3.5
+    assert 30 <= backoff_delay(0, 0.5, 30, retry_after=120) <= 30.5
+
+
+def test_priority_context():
+    assert current_priority() is Priority.INTERACTIVE
+    with llm_priority(Priority.BACKGROUND):
+        assert current_priority() is Priority.BACKGROUND
+    assert current_priority() is Priority.INTERACTIVE
+
+
+async def test_interactive_calls_overtake_queued_background_work():
+    limiter = ModelRateLimiter("gpt-test", requests_per_minute=6000, tokens_per_minute=1_000_000)
+    limiter.pause(0.05)
+    order = []
+
+    async def call(name: str, priority: Priority):
+        await limiter.acquire(100, priority)
+        order.append(name)
+
+    background = asyncio.create_task(call("background", Priority.BACKGROUND))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(call("interactive", Priority.INTERACTIVE))
+    await asyncio.gather(background, interactive)
+
+    assert order == ["interactive", "background"]
+    assert limiter.throttled == 2
+
+
+async def test_token_budget_and_usage_correction():
+    limiter = ModelRateLimiter("gpt-test", requests_per_minute=100, tokens_per_minute=1000)
+
+    await limiter.acquire(600)
+    limiter.record_usage(estimated_tokens=600, actual_tokens=200)
+
+    assert 790 <= limiter.stats()["available_tokens"] <= 800
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = ModelRateLimiter("gpt-test", requests_per_minute=100, tokens_per_minute=1000)
+    limiter.pause(60)
+
+    waiter = asyncio.create_task(limiter.acquire(10))
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queued"] == 1
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert limiter.stats()["queued"] == 0
@@ -0,0 +1,57 @@
+"""Tests for the single-pass markdown parser."""
+
+from app.services.markdown_doc import parse_markdown
+
+PAGE = """# Study Nursing
+
+Placements from
+year one.
+
+Why choose us
+-------------
+
+- Top 10 for nursing
+1. Award-winning labs
+
+[Apply now](https://uni.example/apply "Apply") and ![Ward](ward.jpg) ![](logo.png)
+
+```
+# not a heading
+[not a link](https://x.example)
+```
+
+Watch: https://www.youtube.com/watch?v=abc123
+
+---
+## Entry requirements ##
+"""
+
+
+def test_structure():
+    document = parse_markdown(PAGE)
+
+    assert [(h.level, h.text) for h in document.headings] == [
+        (1, "Study Nursing"),
+        (2, "Why choose us"),
+        (2, "Entry requirements"),
+    ]
+    assert document.heading_texts(2) == ["Why choose us", "Entry requirements"]
+    assert document.paragraphs[0] == "Placements from\nyear one."
+    assert document.list_items == ["Top 10 for nursing", "Award-winning labs"]
+
+
+def test_links_and_images_skip_code_blocks():
+    document = parse_markdown(PAGE)
+
+    assert document.links == [{"href": "https://uni.example/apply", "text": "Apply now"}]
+    assert document.images == [
+        {"src": "ward.jpg", "alt": "Ward", "has_alt": True},
+        {"src": "logo.png", "alt": "", "has_alt": False},
+    ]
+
+
+def test_empty_and_lowercase():
+    assert parse_markdown(None).word_count == 0
+    document = parse_markdown("Open DAY")
+    assert document.lower == "open day"
+    assert document.word_count == 2
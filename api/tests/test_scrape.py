@@ -0,0 +1,202 @@
+"""Tests for landing page scraping: the hedged backend race and incremental HTML reads."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import circuit_breaker, scrape, scrape_cache
+from app.services.llm_cache import llm_cache_mode
+from app.services.scrape import ScrapedContent, scrape_landing_page
+from app.services.scrape_client import ScrapeClientManager
+
+URL = "https://uni.example/nursing"
+FIRECRAWL_PAGE = {"data": {"markdown": "# Nursing\n\nPlacements from year one.", "metadata": {"title": "Nursing"}}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(scrape_cache, "_scrape_cache", None)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+
+
+class Backends:
+    """Stub Firecrawl (over a mock transport) and selectolax with configurable timing and results."""
+
+    def __init__(self, monkeypatch):
+        self.firecrawl_delay = 0.0
+        self.firecrawl_response = httpx.Response(200, json=FIRECRAWL_PAGE)
+        self.firecrawl_cancelled = False
+        self.selectolax_delay = 0.0
+        self.selectolax_error = None
+        self.selectolax_calls = 0
+
+        manager = ScrapeClientManager()
+        manager.client = httpx.AsyncClient(transport=httpx.MockTransport(self._firecrawl))
+        monkeypatch.setattr(scrape, "get_scrape_client", lambda: manager)
+        monkeypatch.setattr(scrape, "scrape_with_selectolax", self._selectolax)
+
+    async def _firecrawl(self, request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(self.firecrawl_delay)
+        except asyncio.CancelledError:
+            self.firecrawl_cancelled = True
+            raise
+        return self.firecrawl_response
+
+    async def _selectolax(self, url, etag=None, last_modified=None) -> ScrapedContent:
+        self.selectolax_calls += 1
+        await asyncio.sleep(self.selectolax_delay)
+        content = ScrapedContent()
+        content.backend = "selectolax"
+        if self.selectolax_error:
+            content.error = self.selectolax_error
+        else:
+            content.word_count = 120
+        return content
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    return Backends(monkeypatch)
+
+
+@pytest.fixture
+def hedged(settings_env):
+    return lambda delay: settings_env(scrape_hedge_enabled=True, scrape_hedge_delay_seconds=delay)
+
+
+def _firecrawl_breaker():
+    return circuit_breaker.get_breaker("firecrawl")
+
+
+async def test_firecrawl_wins_before_hedge_delay(backends, hedged):
+    hedged(5)
+
+    content = await scrape_landing_page(URL)
+
+    assert content.backend == "firecrawl"
+    assert content.word_count > 0
+    assert backends.selectolax_calls == 0
+
+
+@pytest.mark.parametrize("firecrawl", ["circuit_open", "empty"])
+async def test_unusable_firecrawl_falls_through_immediately(backends, hedged, firecrawl):
+    hedged(5)
+    if firecrawl == "circuit_open":
+        breaker = _firecrawl_breaker()
+        for _ in range(breaker.min_calls):
+            breaker.before_call()
+            breaker.record(success=False, duration=0.1)
+        assert breaker.is_open
+    else:
+        backends.firecrawl_response = httpx.Response(200, json={"data": {"markdown": ""}})
+
+    start = time.monotonic()
+    content = await scrape_landing_page(URL)
+
+    assert content.backend == "selectolax"
+    assert time.monotonic() - start < 1  # Didn't wait out the hedge delay
+
+
+async def test_selectolax_win_cancels_firecrawl_without_a_breaker_failure(backends, hedged):
+    hedged(0.01)
+    backends.firecrawl_delay = 10
+
+    content = await scrape_landing_page(URL)
+    await asyncio.sleep(0)
+
+    assert content.backend == "selectolax"
+    assert backends.firecrawl_cancelled
+    stats = _firecrawl_breaker().stats()
+    assert stats["calls"] == 0
+    assert stats["state"] == "closed"
+
+
+async def test_both_failing_returns_the_selectolax_error(backends, hedged):
+    hedged(0)
+    backends.firecrawl_response = httpx.Response(500)
+    backends.selectolax_error = "Timeout: Site took too long to respond"
+
+    content = await scrape_landing_page(URL)
+
+    assert content.backend == "selectolax"
+    assert content.error == "Timeout: Site took too long to respond"
+
+
+async def test_sequential_path_uses_the_same_usability_rule(backends, settings_env):
+    settings_env(scrape_hedge_enabled=False)
+    backends.firecrawl_response = httpx.Response(200, json={"data": {"markdown": ""}})
+
+    content = await scrape_landing_page(URL)
+
+    assert content.backend == "selectolax"
+    assert backends.selectolax_calls == 1
+
+
+async def test_cache_bypass_scrapes_afresh_and_refreshes_the_cache(backends):
+    first = await scrape_landing_page(URL, use_firecrawl=False)
+    assert await scrape_landing_page(URL, use_firecrawl=False) is first
+    assert backends.selectolax_calls == 1
+
+    with llm_cache_mode("bypass"):
+        fresh = await scrape_landing_page(URL, use_firecrawl=False)
+
+    assert fresh is not first
+    assert backends.selectolax_calls == 2
+    assert await scrape_landing_page(URL, use_firecrawl=False) is fresh
+
+
+class FakeBody:
+    """Response stand-in whose body arrives in the given chunks."""
+
+    def __init__(self, chunks: list[bytes], encoding: str = "utf-8"):
+        self.chunks = chunks
+        self.encoding = encoding
+        self.chunks_read = 0
+
+    async def aiter_bytes(self):
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+
+async def test_read_stops_at_exactly_max_bytes():
+    html, truncated = await scrape._read_html(FakeBody([b"a" * 6, b"b" * 6, b"c" * 6]), 10, False)
+
+    assert html == "aaaaaabbbb"
+    assert truncated
+
+
+async def test_body_under_the_cap_is_not_truncated():
+    html, truncated = await scrape._read_html(FakeBody([b"<p>hi</p>"]), 9, False)
+    assert (html, truncated) == ("<p>hi</p>", False)
+
+
+async def test_main_end_split_across_chunks_stops_the_read():
+    body = FakeBody([b"<main>copy</ma", b"IN><footer>", b"never read"])
+
+    html, truncated = await scrape._read_html(body, 1000, True)
+
+    assert html == "<main>copy</maIN><footer>"
+    assert not truncated
+    assert body.chunks_read == 2
+
+
+async def test_body_end_stops_the_read():
+    body = FakeBody([b"<body>copy</body>", b"<script>tracking()</script>"])
+
+    html, _ = await scrape._read_html(body, 1000, True)
+
+    assert html == "<body>copy</body>"
+    assert body.chunks_read == 1
+
+
+async def test_character_split_at_the_cap_is_dropped():
+    # "café" is 5 bytes in UTF-8; a 4-byte cap cuts the "é" in half
+    html, truncated = await scrape._read_html(FakeBody(["café".encode()]), 4, False)
+
+    assert html == "caf"
+    assert "�" not in html
+    assert truncated
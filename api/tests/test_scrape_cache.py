@@ -0,0 +1,68 @@
+"""Tests for the scraped page cache."""
+
+import time
+
+import pytest
+
+from app.services.scrape import ScrapedContent
+from app.services.scrape_cache import ScrapeCache, normalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Uni.Example:443/Courses/", "https://uni.example/Courses"),
+    ("http://uni.example:8080/a#section", "http://uni.example:8080/a"),
+    ("https://uni.example/?utm_source=x&b=2&gclid=1&a=1", "https://uni.example/?a=1&b=2"),
+    ("https://uni.example", "https://uni.example/"),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def _content(title: str = "Page", error: str | None = None) -> ScrapedContent:
+    content = ScrapedContent()
+    content.title = title
+    content.error = error
+    return content
+
+
+def test_hits_across_equivalent_urls_and_backends():
+    cache = ScrapeCache(max_entries=4, ttl_seconds=60)
+    cache.put("https://uni.example/page/", "selectolax", _content())
+
+    assert cache.get("https://UNI.example/page?utm_campaign=x", "firecrawl", "selectolax").title == "Page"
+    assert cache.get("https://uni.example/other", "selectolax") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_failed_scrapes_are_not_cached():
+    cache = ScrapeCache(max_entries=4, ttl_seconds=60)
+    cache.put("https://uni.example/", "firecrawl", _content(error="Timeout"))
+    assert cache.get("https://uni.example/", "firecrawl") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ScrapeCache(max_entries=2, ttl_seconds=60)
+    cache.put("https://uni.example/a", "selectolax", _content("a"))
+    cache.put("https://uni.example/b", "selectolax", _content("b"))
+    cache.get("https://uni.example/a", "selectolax")
+    cache.put("https://uni.example/c", "selectolax", _content("c"))
+
+    assert cache.get("https://uni.example/b", "selectolax") is None
+    assert cache.get("https://uni.example/a", "selectolax").title == "a"
+    assert cache.evictions == 1
+
+
+def test_stale_entries_can_be_revalidated(monkeypatch):
+    cache = ScrapeCache(max_entries=4, ttl_seconds=60)
+    cache.put("https://uni.example/", "selectolax", _content(), etag='"v1"')
+    cache.put("https://uni.example/plain", "selectolax", _content())
+    later = time.monotonic() + 61
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+
+    assert cache.get("https://uni.example/", "selectolax") is None
+    assert cache.get_stale("https://uni.example/plain", "selectolax") is None  # No validators
+    entry = cache.get_stale("https://uni.example/", "selectolax")
+    assert entry.etag == '"v1"'
+
+    assert cache.mark_revalidated(entry).title == "Page"
+    assert cache.get("https://uni.example/", "selectolax") is not None
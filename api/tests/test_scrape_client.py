@@ -0,0 +1,97 @@
+"""Tests for the shared scraping client: DNS cache, transport and per-host redirects."""
+
+import asyncio
+import socket
+
+import httpcore
+import httpx
+import pytest
+
+from app.deps import get_settings
+from app.services.scrape_client import CachingDNSBackend, ConnectionPoolTransport, ScrapeClientManager
+
+_OK = [b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"]
+
+
+@pytest.fixture
+async def resolver(monkeypatch):
+    """Count getaddrinfo calls and answer every lookup with a fixed address."""
+    lookups = []
+
+    async def getaddrinfo(host, port, **kwargs):
+        lookups.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 0, "", ("192.0.2.10", port))]
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+    return lookups
+
+
+def _client(backend: httpcore.AsyncNetworkBackend) -> httpx.AsyncClient:
+    # No keep-alive, so every request opens (and resolves) a new connection
+    pool = httpcore.AsyncConnectionPool(max_keepalive_connections=0, network_backend=backend)
+    return httpx.AsyncClient(transport=ConnectionPoolTransport(pool))
+
+
+async def test_dns_answers_are_cached(resolver):
+    dns = CachingDNSBackend(httpcore.AsyncMockBackend(_OK), ttl_seconds=60)
+
+    async with _client(dns) as client:
+        for _ in range(3):
+            response = await client.get("http://uni.example/")
+            assert response.text == "ok"
+
+    assert resolver == ["uni.example"]
+    assert (dns.hits, dns.misses) == (2, 1)
+
+
+async def test_connection_errors_are_httpx_errors(monkeypatch):
+    async def getaddrinfo(host, port, **kwargs):
+        raise socket.gaierror("Name or service not known")
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+    dns = CachingDNSBackend(httpcore.AsyncMockBackend(_OK), ttl_seconds=60)
+
+    async with _client(dns) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://missing.example/")
+
+
+async def test_redirect_hops_take_their_own_host_slot():
+    slots_held = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "old.example":
+            return httpx.Response(301, headers={"Location": "https://new.example/page"})
+        return httpx.Response(200, text="moved here")
+
+    manager = ScrapeClientManager(get_settings().model_copy(update={"scrape_dns_cache_ttl_seconds": 0}))
+    await manager.client.aclose()
+    manager.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    host_slot = manager.host_slot
+
+    def tracking_slot(url):
+        slots_held.append(httpx.URL(url).host)
+        return host_slot(url)
+
+    manager.host_slot = tracking_slot
+
+    async with manager.stream_get("http://old.example/page") as response:
+        assert (await response.aread()) == b"moved here"
+        assert str(response.url) == "https://new.example/page"
+
+    assert slots_held == ["old.example", "new.example"]
+    await manager.aclose()
+
+
+async def test_redirect_loop_is_bounded():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(302, headers={"Location": "/again"})
+
+    manager = ScrapeClientManager()
+    await manager.client.aclose()
+    manager.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), max_redirects=3)
+
+    with pytest.raises(httpx.TooManyRedirects):
+        async with manager.stream_get("http://loop.example/"):
+            pass
+    await manager.aclose()
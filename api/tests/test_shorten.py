@@ -0,0 +1,115 @@
+"""Tests for the local (rule-based) shortening tiers and the batch path."""
+
+import json
+
+import pytest
+
+from app.models.io import ShortenBatchRequest, ShortenRequest
+from app.routes.shorten import shorten_text_batch
+from app.services.shorten import shorten_copy_batch, shorten_locally
+from tests.fakes import FakeLLM
+
+
+def test_compact_collapses_whitespace_and_punctuation():
+    assert shorten_locally("Apply  now !!", 10) == ("Apply now!", "compact")
+
+
+def test_abbreviations_applied_until_text_fits():
+    text, tier = shorten_locally("University information", 16)
+    assert tier == "abbreviate"
+    assert text == "Uni information"
+
+
+def test_filler_words_removed():
+    text, tier = shorten_locally("A really very good course in order to grow", 30)
+    assert tier == "filler"
+    assert text == "A good course to grow"
+
+
+@pytest.mark.parametrize("text, max_chars, expected", [
+    # Comma-separated clauses keep their commas when a middle clause is dropped
+    ("Top-ranked courses, great campus life, apply now!", 35, "Top-ranked courses, apply now!"),
+    # A dropped clause that ended a sentence leaves a full stop and a capital
+    ("Great courses, low fees. Apply now!", 26, "Great courses. Apply now!"),
+    # A clause moved after a full stop is capitalised
+    ("Top courses. Great campus, apply now!", 28, "Top courses. Apply now!"),
+    ("Study law. Great teaching; small classes. Apply today!", 30, "Study law. Apply today!"),
+])
+def test_clause_dropping_keeps_cta_and_punctuation(text, max_chars, expected):
+    assert shorten_locally(text, max_chars) == (expected, "clause")
+
+
+def test_cta_clause_dropped_when_keep_cta_is_off():
+    result = shorten_locally("Top-ranked courses, great campus life, apply now!", 20, keep_cta=False)
+    assert result == ("Top-ranked courses", "clause")
+
+
+def test_returns_none_when_no_tier_fits():
+    assert shorten_locally("Extraordinary", 5) is None
+
+
+def test_remove_emojis():
+    assert shorten_locally("Apply now 🎓", 9, remove_emojis=True) == ("Apply now", "compact")
+
+
+_BATCH = [
+    ShortenRequest(text="Apply now", max_chars=20),
+    ShortenRequest(text="Extraordinary opportunities", max_chars=12),
+    ShortenRequest(text="University information", max_chars=16),
+    ShortenRequest(text="Magnificent scholarships available", max_chars=15),
+]
+
+
+def _batch_llm() -> FakeLLM:
+    """Shortens the first LLM item and omits the second."""
+    return FakeLLM(lambda kwargs: json.dumps({"results": [{"id": 0, "shortened": "Great chance"}]}))
+
+
+async def test_batch_mixes_local_and_llm_items_in_request_order():
+    llm = _batch_llm()
+
+    results = await shorten_copy_batch(_BATCH, llm=llm)
+
+    assert len(llm.calls) == 1
+    prompt = llm.calls[0]["messages"][1]["content"]
+    assert "Extraordinary opportunities" in prompt and "Magnificent scholarships" in prompt
+    assert "University information" not in prompt
+
+    assert [r.original for r in results] == [item.text for item in _BATCH]
+    assert [r.method for r in results] == ["none", "llm", "abbreviate", "llm"]
+    assert [r.shortened for r in results] == [
+        "Apply now", "Great chance", "Uni information", "Magnificent...",
+    ]
+    for result, item in zip(results, _BATCH):
+        assert result.shortened_length == len(result.shortened) <= item.max_chars
+        assert result.time_ms >= 0
+
+
+async def test_batch_skips_llm_when_every_item_fits_locally():
+    llm = _batch_llm()
+
+    results = await shorten_copy_batch([_BATCH[0], _BATCH[2]], llm=llm)
+
+    assert llm.calls == []
+    assert [r.method for r in results] == ["none", "abbreviate"]
+
+
+async def test_batch_falls_back_to_truncation_when_llm_fails():
+    def fail(kwargs):
+        raise RuntimeError("boom")
+
+    results = await shorten_copy_batch(_BATCH, llm=FakeLLM(fail))
+
+    assert [r.shortened for r in results] == [
+        "Apply now", "Extraordi...", "Uni information", "Magnificent...",
+    ]
+
+
+async def test_batch_route_returns_results_and_timings():
+    llm = _batch_llm()
+
+    response = await shorten_text_batch(ShortenBatchRequest(items=_BATCH), llm=llm)
+
+    assert len(llm.calls) == 1
+    assert [r.method for r in response.results] == ["none", "llm", "abbreviate", "llm"]
+    assert "total_ms" in response.timings
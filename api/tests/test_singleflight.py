@@ -0,0 +1,84 @@
+"""Tests for in-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from app.services.deadline import DeadlineExceeded, deadline_scope, remaining
+from app.services.singleflight import SingleFlight, hash_key
+
+
+def test_hash_key_is_stable_and_order_sensitive():
+    assert hash_key("model", "prompt", 10) == hash_key("model", "prompt", 10)
+    assert hash_key("a", "b") != hash_key("b", "a")
+    assert hash_key("ab", "") != hash_key("a", "b")
+
+
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flight.shared == 4
+    assert flight.in_flight == 0
+
+
+async def test_errors_reach_every_caller():
+    flight = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
+
+
+async def test_short_deadline_leader_gives_up_alone():
+    flight = SingleFlight("test")
+    seen_budget = []
+
+    async def work():
+        seen_budget.append(remaining())
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def call(budget: float):
+        with deadline_scope(budget):
+            return await flight.do("key", work)
+
+    leader = asyncio.create_task(call(0.01))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(call(5))
+
+    with pytest.raises(DeadlineExceeded):
+        await leader
+    assert await follower == "done"
+    # The shared work ran under its own deadline, not the leader's 10ms
+    assert seen_budget[0] > 1
@@ -82,6 +82,8 @@ export async function generateAdCopy(formData: FormData) {
     creativity: creativity,
     open_day_date: openDayDate || null,
     course_name: courseName || null,
+    // Each option is a separate OpenAI call (run concurrently), so this sets the cost per click
+    num_options: 3,
   };
 
   try {